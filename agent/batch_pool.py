@@ -0,0 +1,97 @@
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from fallacy_detector import FallacyDetector
+from result_records import Detection
+
+# Detector owned by each worker process, built once by the pool initializer
+_worker_detector = None
+
+
+def _init_worker():
+    global _worker_detector
+    _worker_detector = FallacyDetector()
+
+
+def _score_chunk(claims: List[str]):
+    """Score one shard of claims inside a worker."""
+    _worker_detector.reload_if_changed()
+    return _worker_detector.config_version, _worker_detector.score_many(claims)
+
+
+class DetectionPool:
+    """
+    Runs fallacy detection for large batches across worker processes.
+    Each worker loads the compiled fallacy database once at startup.
+    Workers send back only (fallacy_id, score) pairs; the full detection
+    records are rebuilt in the calling process.
+    """
+
+    def __init__(self, processes: Optional[int] = None, chunk_size: int = 2000):
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(max_workers=processes, initializer=_init_worker)
+
+    def detect_many(self, detector: FallacyDetector, claims: List[str]) -> List[List[Detection]]:
+        """
+        Detect fallacies for many claims in parallel.
+
+        Args:
+            detector: The caller's detector, used to rebuild detection records
+            claims: List of analytical claims
+
+        Returns:
+            One detection list per claim, in input order
+        """
+        chunks = [claims[i:i + self.chunk_size] for i in range(0, len(claims), self.chunk_size)]
+        detections = []
+
+        for chunk, (version, scored) in zip(chunks, self._executor.map(_score_chunk, chunks)):
+            if version == detector.config_version:
+                detections.extend(detector.expand(s) for s in scored)
+            else:
+                # fallacies.json changed under the worker; redo this shard locally
+                detections.extend(detector.detect_many(chunk))
+
+        return detections
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def audit_file(claims_path: str, processes: Optional[int] = None, block_size: int = 50000):
+    """
+    Re-audit a claim archive (one claim per line), writing one JSON result per line to stdout.
+    Claims are read and written in blocks so memory stays flat however large the archive.
+    """
+    from challenge_generator import ChallengeGenerator
+
+    generator = ChallengeGenerator(cache_size=0)
+    with DetectionPool(processes) as pool, open(claims_path, 'r', encoding='utf-8') as f:
+        block = []
+        for line in f:
+            block.append(line.rstrip('\n'))
+            if len(block) >= block_size:
+                _write_block(generator, pool, block)
+                block = []
+        if block:
+            _write_block(generator, pool, block)
+
+
+def _write_block(generator, pool: DetectionPool, claims: List[str]):
+    for response in generator.generate_challenges_batch(claims, pool=pool):
+        sys.stdout.write(json.dumps(response.to_dict()) + '\n')
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python agent/batch_pool.py <claims.txt> [processes]")
+        sys.exit(1)
+    audit_file(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None)
@@ -0,0 +1,176 @@
+import zlib
+from typing import Dict, Optional
+
+import polars as pl
+
+# NumPy draws the resamples; without it intervals are unavailable and
+# validation falls back to fixed tolerances
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+
+# Each group's sorted values are cut into at most this many bins, so the cost
+# of a resample no longer depends on the row count. Drawing the bin counts
+# dominates the cost; past 64 bins intervals get no closer to a row-by-row
+# bootstrap.
+BINS = 64
+
+# Groups with no more rows than this (or than BINS) are resampled row by row,
+# drawing row indices: up to about this size that is cheaper than drawing
+# multinomial bin counts
+ROW_RESAMPLE_ROWS = 512
+
+# The most extreme rows at each end stay bins of their own: on heavy-tailed
+# data they decide the interval, and a bin spanning them would blur the skew
+# the within-bin spread term (see _group_intervals) cannot model
+TAIL_ROWS = 16
+
+# Resample matrices are drawn in chunks of at most this many cells
+CHUNK_CELLS = 1 << 20
+
+# Fixed, so intervals for the same data are the same on every worker
+# (each group's draws are seeded from this, its key and its bin sizes)
+SEED = 20240601
+
+
+def available() -> bool:
+    return np is not None
+
+
+def mean_intervals(df: pl.DataFrame, group_col: str, metrics: Dict[str, str],
+                   resamples: int = DEFAULT_RESAMPLES, confidence: float = DEFAULT_CONFIDENCE,
+                   bins: int = BINS) -> Optional[Dict]:
+    """
+    Percentile bootstrap confidence intervals for each metric's mean, per group
+    and overall.
+
+    Resampling rows of a group is a multinomial draw of how many times each
+    row is picked. With sorted rows cut into bins (see _bins), one matrix of
+    bin counts (resamples x bins) per group serves every metric. A bin drawn
+    k times adds k times its mean plus the spread of k rows drawn within it,
+    which is approximated as normal with k times the bin's variance; so each
+    metric's resampled means are two matrix products and a normal draw.
+    Small groups (see ROW_RESAMPLE_ROWS) are resampled row by row from
+    drawn row indices instead, which is cheaper than a multinomial draw.
+
+    Each group's draws depend only on the group and its bin sizes, so a
+    metric's intervals are the same whether it is computed alone or with
+    others.
+
+    Args:
+        df: Data to resample
+        group_col: Column whose values get separate intervals (e.g. platform)
+        metrics: metric name -> column
+        resamples: Bootstrap resamples per group
+        confidence: Interval coverage, e.g. 0.95
+
+    Returns:
+        {'resamples', 'confidence', 'by_platform': {group: {metric: (low, high)}},
+        'overall': {metric: (low, high)}}, or None without NumPy
+    """
+    if np is None:
+        return None
+    if not 0 < confidence < 1:
+        raise ValueError('confidence must be between 0 and 1')
+    if not 100 <= resamples <= 100000:
+        raise ValueError('resamples must be between 100 and 100000')
+
+    # Groups in a fixed order, so results always list them the same way
+    sorted_values = df.group_by(group_col).agg(
+        [pl.col(col).drop_nulls().cast(pl.Float64).sort().alias(name) for name, col in metrics.items()]
+    ).sort(group_col)
+    by_group = {}
+    for i, key in enumerate(sorted_values[group_col]):
+        group_bins = {
+            name: _bins(sorted_values[name][i].to_numpy(), bins) for name in metrics
+        }
+        by_group[str(key)] = _group_intervals(str(key), group_bins, resamples, confidence)
+
+    overall_bins = {
+        name: _bins(df[col].drop_nulls().cast(pl.Float64).sort().to_numpy(), bins)
+        for name, col in metrics.items()
+    }
+
+    return {
+        'resamples': resamples,
+        'confidence': confidence,
+        'by_platform': by_group,
+        'overall': _group_intervals(None, overall_bins, resamples, confidence)
+    }
+
+
+def _bins(values, bins: int):
+    """
+    (row count, mean, variance) per bin of sorted values: TAIL_ROWS single rows
+    at each end and equal-count slices in between, or one bin per row for
+    small groups. Slice sizes depend only on the number of values, never on
+    the values.
+    """
+    n = len(values)
+    if n <= max(bins, ROW_RESAMPLE_ROWS):
+        edges = np.arange(n + 1)
+    else:
+        inner = TAIL_ROWS + np.arange(bins - 2 * TAIL_ROWS + 1) * (n - 2 * TAIL_ROWS) // (bins - 2 * TAIL_ROWS)
+        edges = np.unique(np.concatenate([np.arange(TAIL_ROWS), inner, np.arange(n - TAIL_ROWS + 1, n + 1)]))
+    counts = np.diff(edges)
+    if not len(counts):
+        empty = counts.astype(np.float64)
+        return counts, empty, empty
+    means = np.add.reduceat(values, edges[:-1]) / counts
+    # Centred before squaring, so large values with a small spread keep their precision
+    variances = np.add.reduceat((values - np.repeat(means, counts)) ** 2, edges[:-1]) / counts
+    return counts, means, variances
+
+
+def _group_intervals(group: Optional[str], group_bins: Dict, resamples: int, confidence: float) -> Dict:
+    """
+    Intervals for one group's metrics (group None for the whole frame), sharing
+    draws between metrics with the same bins.
+    """
+    # Metrics without nulls have identical bin sizes, so they share one draw
+    shared = {}
+    for metric_name, (counts, means, variances) in group_bins.items():
+        if not len(counts):
+            continue
+        shared.setdefault(counts.tobytes(), (counts, []))[1].append((metric_name, means, variances))
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for counts, members in shared.values():
+        n = int(counts.sum())
+        chunk = max(1, CHUNK_CELLS // len(counts))
+        rng = _stream(group, counts)
+
+        # One bin per row: a resample is n drawn row indices, so no counts are drawn
+        by_row = n == len(counts)
+        means = np.empty((resamples, len(members)))
+        for start in range(0, resamples, chunk):
+            size = min(chunk, resamples - start)
+            if by_row:
+                picks = rng.integers(0, n, size=(size, n))
+                for i, (_, row_values, _) in enumerate(members):
+                    means[start:start + size, i] = np.take(row_values, picks).mean(axis=1)
+                continue
+            draws = rng.multinomial(n, counts / n, size=size)
+            # One normal per resample for every metric, and a product per metric, so
+            # each metric's result does not depend on which others share the draw
+            normal = rng.standard_normal(size)
+            for i, (_, bin_means, bin_variances) in enumerate(members):
+                means[start:start + size, i] = (draws @ bin_means + np.sqrt(draws @ bin_variances) * normal) / n
+
+        low, high = np.quantile(means, [alpha, 1 - alpha], axis=0)
+        for i, (metric_name, _, _) in enumerate(members):
+            intervals[metric_name] = (float(low[i]), float(high[i]))
+    return intervals
+
+
+def _stream(group: Optional[str], counts):
+    """Random stream for one group's draws over bins of the given sizes."""
+    entropy = [SEED, zlib.crc32(counts.tobytes())]
+    if group is not None:
+        entropy.append(zlib.crc32(group.encode()))
+    return np.random.default_rng(entropy)
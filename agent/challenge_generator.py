@@ -1,5 +1,8 @@
 from typing import List, Dict
 from fallacy_detector import FallacyDetector
+from metrics import timed
+from result_cache import ResultCache
+from result_records import ChallengeResponse, Detection
 
 class ChallengeGenerator:
     """
@@ -7,51 +10,86 @@ class ChallengeGenerator:
     Provides both constructive and direct feedback.
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024, cache_ttl: float = 3600):
         self.detector = FallacyDetector()
+        self.cache = ResultCache(max_entries=cache_size, ttl_seconds=cache_ttl)
     
-    def generate_challenges(self, claim_text: str, max_fallacies: int = 3) -> Dict:
+    def generate_challenges(self, claim_text: str, max_fallacies: int = 3) -> ChallengeResponse:
         """
         Generate formatted challenges for a claim.
+        Results are cached by normalized claim text.
         
         Args:
             claim_text: The user's analytical claim
             max_fallacies: Maximum number of fallacies to include (default 3)
             
         Returns:
-            Formatted challenge response
+            Challenge response (to_dict() gives the JSON shape)
         """
-        detected = self.detector.detect(claim_text)
+        self._sync_config()
+        key = self._cache_key(claim_text, max_fallacies)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.for_claim(claim_text)
         
-        if not detected:
-            return {
-                'status': 'no_issues',
-                'message': 'No obvious fallacies detected. However, always validate with data!'
-            }
+        detected = self.detector.detect(claim_text)
+        with timed('formatting'):
+            response = self._format_challenges(claim_text, detected, max_fallacies)
+        self.cache.put(key, response)
+        return response
+    
+    def _sync_config(self):
+        """Pick up fallacies.json edits, dropping results computed from the old version."""
+        if self.detector.reload_if_changed():
+            self.cache.clear()
+    
+    def _cache_key(self, claim_text: str, max_fallacies: int) -> tuple:
+        """
+        Cache key for a claim. Detection is case-insensitive and ignores
+        surrounding whitespace, so claims differing only in those share a key.
+        """
+        return (claim_text.strip().lower(), max_fallacies, self.detector.config_version)
+    
+    def generate_challenges_batch(self, claims: List[str], max_fallacies: int = 3,
+                                  pool=None) -> List[ChallengeResponse]:
+        """
+        Generate formatted challenges for many claims at once.
         
-        # Take only top N fallacies
-        top_fallacies = detected[:max_fallacies]
+        Args:
+            claims: List of analytical claims
+            max_fallacies: Maximum number of fallacies to include per claim
+            pool: Optional DetectionPool to spread detection across processes
+            
+        Returns:
+            One formatted challenge response per claim, in input order
+        """
+        self._sync_config()
+        responses = [None] * len(claims)
+        misses = []
         
-        response = {
-            'status': 'challenges_found',
-            'claim': claim_text,
-            'fallacies_detected': len(detected),
-            'challenges': []
-        }
+        for i, claim_text in enumerate(claims):
+            cached = self.cache.get(self._cache_key(claim_text, max_fallacies))
+            if cached is not None:
+                responses[i] = cached.for_claim(claim_text)
+            else:
+                misses.append(i)
         
-        for fallacy in top_fallacies:
-            challenge_section = {
-                'fallacy_name': fallacy['fallacy_name'],
-                'confidence': fallacy['confidence'],
-                'description': fallacy['description'],
-                'constructive_questions': fallacy['challenges']['constructive'][:3],
-                'direct_challenges': fallacy['challenges']['direct'][:3],
-                'missing_data': fallacy['challenges']['missing_data'],
-                'alternative_explanations': fallacy['challenges']['alternatives'][:2]
-            }
-            response['challenges'].append(challenge_section)
+        miss_claims = [claims[i] for i in misses]
+        if pool is not None:
+            detections = pool.detect_many(self.detector, miss_claims)
+        else:
+            detections = self.detector.detect_many(miss_claims)
+        for i, detected in zip(misses, detections):
+            with timed('formatting'):
+                responses[i] = self._format_challenges(claims[i], detected, max_fallacies)
+            self.cache.put(self._cache_key(claims[i], max_fallacies), responses[i])
         
-        return response
+        return responses
+    
+    def _format_challenges(self, claim_text: str, detected: List[Detection],
+                           max_fallacies: int) -> ChallengeResponse:
+        """Format detected fallacies into a challenge response (the top N, sharing the config's text)."""
+        return ChallengeResponse(claim_text, len(detected), tuple(detected[:max_fallacies]))
     
     def compare_claims(self, claim_a: str, claim_b: str) -> Dict:
         """
@@ -62,12 +100,24 @@ class ChallengeGenerator:
             claim_b: Second analytical claim
             
         Returns:
-            Comparison results with recommendation
+            Comparison results with recommendation, analyses in their JSON shape
         """
         # Analyze both claims
         response_a = self.generate_challenges(claim_a, max_fallacies=3)
         response_b = self.generate_challenges(claim_b, max_fallacies=3)
         
+        comparison = self.build_comparison(claim_a, claim_b, response_a, response_b)
+        comparison['claim_a']['analysis'] = response_a.to_dict()
+        comparison['claim_b']['analysis'] = response_b.to_dict()
+        return comparison
+    
+    def build_comparison(self, claim_a: str, claim_b: str, response_a: ChallengeResponse,
+                         response_b: ChallengeResponse) -> Dict:
+        """
+        Build comparison results from two already generated challenge responses.
+        Lets callers analyze the two claims concurrently. The 'analysis'
+        entries are the responses themselves, serialized by the caller.
+        """
         # Calculate risk scores
         risk_a = self._calculate_risk_score(response_a)
         risk_b = self._calculate_risk_score(response_b)
@@ -89,9 +139,9 @@ class ChallengeGenerator:
             'recommendation': recommendation
         }
     
-    def _calculate_risk_score(self, analysis: Dict) -> Dict:
+    def _calculate_risk_score(self, analysis: ChallengeResponse) -> Dict:
         """Calculate risk score from analysis results."""
-        if analysis['status'] == 'no_issues':
+        if analysis.status == 'no_issues':
             return {
                 'total': 0,
                 'high': 0,
@@ -104,8 +154,8 @@ class ChallengeGenerator:
         medium_count = 0
         low_count = 0
         
-        for challenge in analysis.get('challenges', []):
-            conf = challenge['confidence']
+        for challenge in analysis.top:
+            conf = challenge.confidence
             if conf == 'HIGH':
                 high_count += 1
             elif conf == 'MEDIUM':
@@ -186,10 +236,11 @@ class ChallengeGenerator:
             'reasoning': reasoning
         }
     
-    def format_for_terminal(self, response: Dict) -> str:
+    def format_for_terminal(self, response: ChallengeResponse) -> str:
         """
         Format the response for nice terminal output.
         """
+        response = response.to_dict()
         if response['status'] == 'no_issues':
             return f"\n✅ {response['message']}\n"
         
@@ -1,24 +1,198 @@
 import polars as pl
-from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+import copy
+import datetime
 import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+import bootstrap
+import quantile_sketch
+from incremental_summary import IncrementalSummary
+from metrics import timed
+from trigger_matcher import AhoCorasick
+
+# Calendar periods for period-over-period comparisons (Polars duration strings)
+PERIODS = {'week': '1w', 'month': '1mo', 'quarter': '1q', 'year': '1y'}
+
+# Trend wording checked against period-over-period changes
+TREND_DIRECTIONS = {
+    'up': re.compile(r'\b(rose|risen|increased|grew|grown|went up|improved|climbed|jumped)\b'),
+    'down': re.compile(r'\b(fell|fallen|dropped|declined|decreased|went down|worsened|slipped)\b')
+}
+TREND_PERIOD_PATTERN = re.compile(r'\b(last|past|previous|this)\s+(week|month|quarter|year)\b')
+
+# Categorical columns (besides the platform) the confounder scan stratifies by
+DIMENSION_KEYWORDS = [
+    'campaign', 'campaign_type', 'region', 'country', 'market', 'device',
+    'audience', 'segment', 'objective', 'ad_type', 'format', 'placement'
+]
+
+# Confounder scan thresholds: correlations weaker than MIN_CORR have no trend
+# direction; a stratifier is a confounder when holding it fixed moves the
+# correlation by MIN_SHIFT and it explains MIN_ETA of both metrics' variance
+CONFOUNDER_MIN_CORR = 0.1
+CONFOUNDER_MIN_SHIFT = 0.2
+CONFOUNDER_MIN_ETA = 0.1
+
+# Appends add a chunk each (and a part file when saved); consolidate once there are this many
+MAX_CHUNKS = 64
+
+# Claimed values within this distance of a platform's mean or max count as a match
+# (means are checked against bootstrap confidence intervals instead when NumPy is available)
+MATCH_TOLERANCE = 0.5
+
+
+class ValidationIndex:
+    """
+    Lookup structures for validate_claim, built once per loaded dataset.
+    Holds compiled metric patterns, a platform-name matcher and, per metric,
+    platform means and maxima sorted so tolerance checks are a bisect.
+    """
+    
+    def __init__(self, summary_stats: Dict, metric_cols: Dict[str, str]):
+        self.platforms = list(summary_stats['by_platform'].keys())
+        self.platform_matcher = AhoCorasick(platform.lower() for platform in self.platforms)
+        
+        self.metric_patterns = {
+            metric_name: [
+                re.compile(rf'{metric_name}\s*(?:is|:|=)\s*(\d+\.?\d*)'),
+                re.compile(rf'{metric_name}\s*(?:of|at)\s*(\d+\.?\d*)')
+            ]
+            for metric_name in metric_cols
+        }
+        
+        # metric -> stat -> (sorted values, platform positions in the same order)
+        self.sorted_stats = {}
+        for metric_name in metric_cols:
+            self.sorted_stats[metric_name] = {}
+            for stat in ('mean', 'max'):
+                entries = sorted(
+                    (stats[metric_name][stat], position)
+                    for position, stats in enumerate(summary_stats['by_platform'].values())
+                    if stats.get(metric_name) is not None
+                )
+                self.sorted_stats[metric_name][stat] = (
+                    [value for value, _ in entries],
+                    [position for _, position in entries]
+                )
+        
+        # metric -> (intervals, reach), see _interval_reach
+        self._interval_reaches = {}
+    
+    def platforms_in(self, claim_lower: str) -> List[str]:
+        """Platforms named in the claim, in summary order."""
+        return [self.platforms[i] for i in sorted(self.platform_matcher.find(claim_lower))]
+    
+    def near(self, metric_name: str, stat: str, claimed_value: float) -> Dict[int, float]:
+        """Platform positions whose stat is within MATCH_TOLERANCE of the claimed value."""
+        values, positions = self.sorted_stats[metric_name][stat]
+        # Widen the bisect window slightly, then apply the exact tolerance test
+        lo = bisect_left(values, claimed_value - MATCH_TOLERANCE - 1e-9)
+        hi = bisect_right(values, claimed_value + MATCH_TOLERANCE + 1e-9)
+        return {
+            positions[i]: values[i]
+            for i in range(lo, hi)
+            if abs(claimed_value - values[i]) < MATCH_TOLERANCE
+        }
+    
+    def in_interval(self, metric_name: str, claimed_value: float, margin: float,
+                    intervals: Dict) -> Dict[int, Tuple[float, Tuple[float, float]]]:
+        """
+        Platform positions whose mean's confidence interval, widened by margin, contains the claimed value.
+        intervals are the metric's own ({'by_platform': {platform: (low, high)}, ...}).
+        No interval reaches further from its platform's mean than the widest one does,
+        so only means within that reach (plus margin) of the claim are bisected out and checked.
+        """
+        values, positions = self.sorted_stats[metric_name]['mean']
+        reach = self._interval_reach(metric_name, intervals) + margin
+        lo = bisect_left(values, claimed_value - reach - 1e-9)
+        hi = bisect_right(values, claimed_value + reach + 1e-9)
+        matches = {}
+        for i in range(lo, hi):
+            interval = intervals['by_platform'].get(self.platforms[positions[i]])
+            if interval and interval[0] - margin <= claimed_value <= interval[1] + margin:
+                matches[positions[i]] = (values[i], interval)
+        return matches
+    
+    def _interval_reach(self, metric_name: str, intervals: Dict) -> float:
+        """Furthest any platform's interval bound lies from its mean, computed once per set of intervals."""
+        cached = self._interval_reaches.get(metric_name)
+        if cached is not None and cached[0] is intervals:
+            return cached[1]
+        
+        values, positions = self.sorted_stats[metric_name]['mean']
+        reach = 0.0
+        for value, position in zip(values, positions):
+            interval = intervals['by_platform'].get(self.platforms[position])
+            if interval:
+                reach = max(reach, value - interval[0], interval[1] - value)
+        self._interval_reaches[metric_name] = (intervals, reach)
+        return reach
+
 
 class DataAnalyzer:
     """
     Analyzes uploaded CSV data and validates claims against actual data.
     Uses Polars instead of Pandas for better compatibility.
+    
+    Args:
+        sketch_compression: Summarise with t-digest sketches of this compression
+            (see quantile_sketch) instead of exact medians and quantiles
     """
     
-    def __init__(self):
+    def __init__(self, sketch_compression: Optional[int] = None):
+        self.sketch_compression = sketch_compression
         self.df = None
         self.summary_stats = None
         self.platform_col = None
+        self.date_col = None
+        self.dimension_cols = []
         self.metric_cols = {}
+        self.columns = []
+        self._validation_index = None
+        self._aggregates = None
+        self._period_cache = {}
+        # metric -> {'by_platform': {platform: (low, high)}, 'overall': (low, high)}:
+        # the frame's default bootstrap intervals, filled in as they are computed
+        self._intervals = {}
+        # Held while the frame and its interval cache are read or replaced together
+        self._intervals_lock = threading.Lock()
+        # One bootstrap at a time, so a claim arriving during precompute_intervals
+        # waits for its result instead of computing the same draws again
+        self._bootstrap_lock = threading.Lock()
+        # (path, rows, [(suffix, inode), ...]): where the frame's first rows are
+        # saved, in order, as Arrow part files; None when they are not
+        self._stored = None
+        self._append_lock = threading.Lock()
     
-    def load_csv(self, csv_content: bytes) -> Dict:
-        """Load and validate CSV data."""
+    def load_csv(self, csv_content: bytes, streaming: bool = False) -> Dict:
+        """
+        Load and validate CSV data.
+        
+        Args:
+            csv_content: Raw CSV bytes
+            streaming: Parse through a lazy scan that keeps only the platform
+                and metric columns (see load_csv_path)
+        """
+        if streaming:
+            with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+                tmp.write(csv_content)
+            try:
+                return self.load_csv_path(tmp.name)
+            finally:
+                os.unlink(tmp.name)
+        
         try:
-            self.df = pl.read_csv(io.BytesIO(csv_content))
-            self._detect_columns()
+            with timed('csv_parse'):
+                self.df = pl.read_csv(io.BytesIO(csv_content))
+            with timed('column_detection'):
+                self._detect_columns(self.df.columns)
             
             if not self.platform_col:
                 return {
@@ -26,20 +200,972 @@ class DataAnalyzer:
                     'error': 'Could not find platform/channel column'
                 }
             
-            self.summary_stats = self._generate_summary()
+            with timed('date_index'):
+                self.df = self._index_dates(self.df)
+            self.columns = list(self.df.columns)
+            self._aggregates = None
+            with timed('summary'):
+                self.summary_stats = self._generate_summary()
+                self._build_validation_index()
+            self._period_cache = {}
+            self._intervals = {}
+            self._stored = None
             
-            return {
-                'success': True,
-                'rows': int(len(self.df)),
-                'columns': list(self.df.columns),
-                'summary': self.summary_stats
-            }
+            return self.load_result()
         except Exception as e:
             return {'success': False, 'error': f'Failed to parse CSV: {str(e)}'}
     
-    def _detect_columns(self):
+    def load_csv_path(self, path: str) -> Dict:
+        """
+        Load a CSV file from disk with the streaming engine.
+        Columns are detected from the header alone, and only the platform and
+        metric columns are parsed and kept in memory.
+        """
+        try:
+            with timed('column_detection'):
+                columns = pl.read_csv(path, n_rows=0).columns
+                self._detect_columns(columns)
+            
+            if not self.platform_col:
+                return {
+                    'success': False,
+                    'error': 'Could not find platform/channel column'
+                }
+            
+            projected = [self.platform_col]
+            projected.extend(col for col in self.metric_cols.values() if col not in projected)
+            if self.date_col and self.date_col not in projected:
+                projected.append(self.date_col)
+            projected.extend(col for col in self.dimension_cols if col not in projected)
+            
+            with timed('csv_parse'):
+                self.df = pl.scan_csv(path).select(projected).collect(streaming=True)
+            with timed('date_index'):
+                self.df = self._index_dates(self.df)
+            self.columns = columns
+            self._aggregates = None
+            with timed('summary'):
+                self.summary_stats = self._generate_summary()
+                self._build_validation_index()
+            self._period_cache = {}
+            self._intervals = {}
+            self._stored = None
+            
+            return self.load_result()
+        except Exception as e:
+            return {'success': False, 'error': f'Failed to parse CSV: {str(e)}'}
+    
+    def load_result(self) -> Dict:
+        """Describe the loaded dataset in the format returned by load_csv."""
+        return {
+            'success': True,
+            'rows': int(len(self.df)),
+            'columns': list(self.columns),
+            'summary': self.summary_stats
+        }
+    
+    def estimated_size(self) -> int:
+        """
+        Approximate bytes held by the loaded dataset: the frame plus the
+        incremental aggregates kept once rows have been appended.
+        """
+        if self.df is None:
+            return 0
+        size = int(self.df.estimated_size())
+        aggregates = self._aggregates
+        if aggregates is not None:
+            size += aggregates.estimated_size()
+        return size
+    
+    def clone(self) -> 'DataAnalyzer':
+        """
+        Copy this analyzer's loaded state.
+        The frame itself is shared, since Polars operations never modify it in place.
+        """
+        other = DataAnalyzer(self.sketch_compression)
+        other.df = self.df
+        other.summary_stats = copy.deepcopy(self.summary_stats)
+        other.platform_col = self.platform_col
+        other.date_col = self.date_col
+        other.dimension_cols = list(self.dimension_cols)
+        other.metric_cols = dict(self.metric_cols)
+        other.columns = list(self.columns)
+        other._validation_index = self._validation_index
+        # Never modified in place (append builds new aggregates), so safe to share
+        other._aggregates = self._aggregates
+        other._period_cache = self._period_cache
+        # Filled in place as metrics are computed, which holds for clones too (same frame)
+        other._intervals = self._intervals
+        other._stored = self._stored
+        return other
+    
+    def save(self, path: str):
+        """
+        Persist the loaded dataset: the frame as uncompressed Arrow IPC part
+        files and columns/summary as JSON (<path>.json).
+        The first part is <path>.arrow; saving after an append adds a part
+        with just the appended rows (<path>.<first row>.arrow), so the cost
+        follows the delta. A frame that was reordered, or already has
+        MAX_CHUNKS parts, is rewritten as one part. A dataset already saved
+        elsewhere (e.g. a repeat upload) is hard-linked rather than copied.
+        Files are written under temporary names and renamed into place, so
+        readers never see a partial file. Afterwards the frame is served
+        memory-mapped from the saved parts. Default confidence intervals are
+        saved too, once computed for every metric (see precompute_intervals).
+        Each save bumps a counter in the JSON (see saved_version); callers
+        that save from several processes must hold a lock around it.
+        """
+        df = self.df
+        parts = self._save_parts(path, df)
+        meta = {
+            'version': (self.saved_version(path) or 0) + 1,
+            'columns': self.columns,
+            'platform_col': self.platform_col,
+            'date_col': self.date_col,
+            'dimension_cols': self.dimension_cols,
+            'metric_cols': self.metric_cols,
+            'sketch_compression': self.sketch_compression,
+            'parts': [suffix for suffix, _ in parts],
+            'summary': self.summary_stats
+        }
+        meta_path = f'{path}.json'
+        with open(f'{meta_path}.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(f'{meta_path}.tmp', meta_path)
+        self._remove_stale_parts(path, parts)
+        
+        # Same rows in the same order, now shared with other processes through the page cache
+        if df is self.df:
+            self.df = self._read_parts(path, meta['parts'])
+            self._stored = (path, len(df), parts)
+            self._save_intervals()
+    
+    @staticmethod
+    def saved_version(path: str) -> Optional[int]:
+        """
+        How many times the dataset at path has been saved, or None if it is not saved.
+        Unlike the file's mtime, this changes on every save however close together they are.
+        """
+        try:
+            with open(f'{path}.json', 'r') as f:
+                version = json.load(f).get('version', 0)
+        except (OSError, ValueError, AttributeError):
+            return None
+        return version if isinstance(version, int) else 0
+    
+    @classmethod
+    def open(cls, path: str) -> Optional['DataAnalyzer']:
+        """
+        Reopen a dataset written by save(), or None if it is missing or unreadable.
+        The frame is memory-mapped rather than parsed, so processes opening the
+        same dataset share one copy through the page cache.
+        """
+        try:
+            with open(f'{path}.json', 'r') as f:
+                meta = json.load(f)
+            suffixes = meta.get('parts', ['.arrow'])
+            # Inodes are taken before mapping: if a part is replaced in between,
+            # the mismatch only stops it from being hard-linked later
+            parts = [(suffix, os.stat(f'{path}{suffix}').st_ino) for suffix in suffixes]
+            analyzer = cls(meta.get('sketch_compression'))
+            analyzer.df = cls._read_parts(path, suffixes)
+            analyzer.columns = meta['columns']
+            analyzer.platform_col = meta['platform_col']
+            analyzer.date_col = meta.get('date_col')
+            analyzer.dimension_cols = meta.get('dimension_cols', [])
+            analyzer.metric_cols = meta['metric_cols']
+            analyzer.summary_stats = meta['summary']
+            analyzer._stored = (path, len(analyzer.df), parts)
+            analyzer._intervals = cls._read_intervals(path, analyzer._stored)
+            return analyzer
+        except Exception:
+            return None
+    
+    def _save_parts(self, path: str, df: pl.DataFrame) -> List[Tuple[str, int]]:
+        """Write (or link) the part files for df under path; returns [(suffix, inode), ...]."""
+        stored = self._stored
+        if stored is not None and stored[1] <= len(df) and len(stored[2]) < MAX_CHUNKS:
+            stored_path, rows, parts = stored
+            if stored_path != path:
+                parts = self._link_parts(stored_path, path, parts)
+            if parts is not None:
+                if rows < len(df):
+                    parts = parts + [self._write_part(path, f'.{rows}.arrow', df.slice(rows))]
+                return parts
+        return [self._write_part(path, '.arrow', df)]
+    
+    @staticmethod
+    def _write_part(path: str, suffix: str, frame: pl.DataFrame) -> Tuple[str, int]:
+        part_path = f'{path}{suffix}'
+        frame.write_ipc(f'{part_path}.tmp', compression='uncompressed')
+        os.replace(f'{part_path}.tmp', part_path)
+        return suffix, os.stat(part_path).st_ino
+    
+    @staticmethod
+    def _link_parts(source: str, path: str, parts: List[Tuple[str, int]]) -> Optional[List[Tuple[str, int]]]:
+        """
+        Hard-link another saved copy's parts under path. None if any part is gone,
+        was replaced since this frame was mapped from it, or cannot be linked
+        (e.g. another filesystem); the caller then writes the frame instead.
+        """
+        for suffix, inode in parts:
+            tmp_path = f'{path}{suffix}.tmp'
+            try:
+                if os.path.lexists(tmp_path):
+                    os.remove(tmp_path)
+                os.link(f'{source}{suffix}', tmp_path)
+                if os.stat(tmp_path).st_ino != inode:
+                    os.remove(tmp_path)
+                    return None
+                os.replace(tmp_path, f'{path}{suffix}')
+            except OSError:
+                return None
+        return parts
+    
+    @staticmethod
+    def _remove_stale_parts(path: str, parts: List[Tuple[str, int]]):
+        """Delete appended parts the saved frame no longer uses (e.g. after a rewrite)."""
+        base = Path(path)
+        current = {f'{base.name}{suffix}' for suffix, _ in parts}
+        for part_path in base.parent.glob(f'{base.name}.*.arrow'):
+            if part_path.name not in current:
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+    
+    def _save_intervals(self):
+        """
+        Save the frame's default intervals (<path>.intervals.json) once every
+        metric has them, tagged with the saved parts they describe, so open()
+        ignores them once the dataset has been saved again.
+        """
+        with self._intervals_lock:
+            df, intervals, stored = self.df, dict(self._intervals), self._stored
+        if stored is None or stored[1] != len(df) or any(name not in intervals for name in self._metrics_in(df)):
+            return
+        
+        path, rows, parts = stored
+        saved = {
+            'rows': rows,
+            'parts': parts,
+            'resamples': bootstrap.DEFAULT_RESAMPLES,
+            'confidence': bootstrap.DEFAULT_CONFIDENCE,
+            'metrics': intervals
+        }
+        intervals_path = f'{path}.intervals.json'
+        # Per-thread temporary name, as a save and a background computation may finish together
+        tmp_path = f'{intervals_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, intervals_path)
+        except OSError:
+            # Best-effort: workers reopening the dataset then compute intervals as needed
+            pass
+    
+    @staticmethod
+    def _read_intervals(path: str, stored: Tuple) -> Dict:
+        """Intervals saved for exactly the parts just opened, or {} if there are none."""
+        try:
+            with open(f'{path}.intervals.json', 'r') as f:
+                saved = json.load(f)
+            if (saved['rows'] != stored[1] or saved['parts'] != [list(part) for part in stored[2]]
+                    or saved['resamples'] != bootstrap.DEFAULT_RESAMPLES
+                    or saved['confidence'] != bootstrap.DEFAULT_CONFIDENCE):
+                return {}
+            return {
+                metric_name: {
+                    'by_platform': {
+                        platform: tuple(interval) for platform, interval in intervals['by_platform'].items()
+                    },
+                    'overall': tuple(intervals['overall']) if intervals['overall'] else None
+                }
+                for metric_name, intervals in saved['metrics'].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+    
+    @staticmethod
+    def _read_parts(path: str, suffixes: List[str]) -> pl.DataFrame:
+        frames = [pl.read_ipc(f'{path}{suffix}', memory_map=True, rechunk=False) for suffix in suffixes]
+        if len(frames) == 1:
+            return frames[0]
+        # Appended parts may have widened numeric columns, as in append_csv_path
+        return pl.concat(frames, how='diagonal_relaxed', rechunk=False)
+    
+    def append_csv(self, csv_content: bytes) -> Dict:
+        """Append rows from CSV bytes to the loaded dataset (see append_csv_path)."""
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+            tmp.write(csv_content)
+        try:
+            return self.append_csv_path(tmp.name)
+        finally:
+            os.unlink(tmp.name)
+    
+    def append_csv_path(self, path: str) -> Dict:
+        """
+        Merge new rows into the loaded dataset.
+        The summary is updated from the new rows alone; the existing frame is
+        never modified, so clones sharing it are unaffected.
+        
+        Args:
+            path: CSV file with the same platform and metric columns
+            
+        Returns:
+            The updated dataset description (as load_csv), plus appended_rows
+        """
+        if self.df is None:
+            return {'success': False, 'error': 'No data loaded'}
+        
+        with self._append_lock:
+            try:
+                header = pl.read_csv(path, n_rows=0).columns
+                required = [self.platform_col] + list(self.metric_cols.values())
+                missing = [col for col in required if col not in header]
+                if missing:
+                    return {
+                        'success': False,
+                        'error': f'Appended data is missing columns: {", ".join(missing)}'
+                    }
+                
+                with timed('csv_parse'):
+                    delta = pl.scan_csv(path).select(
+                        [col for col in self.df.columns if col in header]
+                    ).collect()
+                delta = self._conform(self._parse_dates(delta))
+                if self.date_col in delta.columns:
+                    delta = delta.sort(self.date_col, nulls_last=True)
+                
+                with timed('summary'):
+                    aggregates = self._aggregates or IncrementalSummary.from_frame(
+                        self.df, self.platform_col, self.metric_cols, self._compression()
+                    )
+                    aggregates = aggregates.merged(delta)
+                    summary_stats = aggregates.summary()
+                
+                df = pl.concat([self.df, delta], how='diagonal_relaxed', rechunk=False)
+                stored = self._stored
+                if self.date_col and not self._extends_sorted(delta):
+                    df = df.sort(self.date_col, nulls_last=True)
+                    # Rows moved, so the saved parts no longer hold a prefix of the frame
+                    stored = None
+                if df.n_chunks() > MAX_CHUNKS:
+                    df = df.rechunk()
+                
+                # Publish the summary before the index built from it; validate_claim
+                # reads the index first, so it never sees platforms missing from the summary
+                with self._intervals_lock:
+                    self.df = df
+                    self._intervals = {}
+                    self._stored = stored
+                self.summary_stats = summary_stats
+                self._aggregates = aggregates
+                self._period_cache = {}
+                self._build_validation_index()
+                
+                result = self.load_result()
+                result['appended_rows'] = int(len(delta))
+                return result
+            except Exception as e:
+                return {'success': False, 'error': f'Failed to append CSV: {str(e)}'}
+    
+    def summarize_range(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict:
+        """
+        Per-platform summary for rows dated within a range.
+        The date-sorted frame is sliced with a binary search, so only the
+        rows in range are aggregated.
+        
+        Args:
+            start: First date included (YYYY-MM-DD), or None for the earliest
+            end: Last date included (YYYY-MM-DD), or None for the latest
+            
+        Returns:
+            Range bounds, row count and a summary in the load_csv format
+        """
+        frame = self._date_slice(start, end)
+        return {
+            'start': self._iso(frame[self.date_col].min()) if len(frame) else start,
+            'end': self._iso(frame[self.date_col].max()) if len(frame) else end,
+            'rows': len(frame),
+            'summary': self._generate_summary(frame)
+        }
+    
+    def rolling_summary(self, window_days: int, start: Optional[str] = None,
+                        end: Optional[str] = None) -> Dict:
+        """
+        Trailing-window metric means per platform, one point per day with data.
+        
+        Args:
+            window_days: Window length in days (e.g. 7, 28 or 90)
+            start: First day to report (YYYY-MM-DD); earlier rows still feed its window
+            end: Last day to report (YYYY-MM-DD)
+            
+        Returns:
+            {'window_days', 'by_platform': {platform: [{'date', 'rows', metric: mean}, ...]}}
+        """
+        if not 1 <= window_days <= 3660:
+            raise ValueError('window_days must be between 1 and 3660')
+        
+        first_day = self._parse_bound(start)
+        lookback = None if first_day is None else (first_day - datetime.timedelta(days=window_days - 1)).isoformat()
+        frame = self._date_slice(lookback, end)
+        metrics = self._metrics_in(frame)
+        
+        # Daily sums and counts first, so each window sums a few rows per day
+        day = pl.col(self.date_col).cast(pl.Date).alias('__day')
+        daily = frame.group_by([self.platform_col, day]).agg(
+            [pl.count().alias('__rows')] +
+            [pl.col(col).sum().alias(f'{name}__sum') for name, col in metrics.items()] +
+            [pl.col(col).count().alias(f'{name}__n') for name, col in metrics.items()]
+        ).sort('__day')
+        
+        windows = daily.rolling('__day', period=f'{window_days}d', by=self.platform_col).agg(
+            [pl.col('__rows').sum()] +
+            [(pl.col(f'{name}__sum').sum() / pl.col(f'{name}__n').sum()).round(2).alias(name)
+             for name in metrics]
+        )
+        if first_day is not None:
+            windows = windows.filter(pl.col('__day') >= first_day)
+        
+        by_platform = {}
+        for row in windows.sort([self.platform_col, '__day']).iter_rows(named=True):
+            point = {'date': self._iso(row['__day']), 'rows': int(row['__rows'])}
+            point.update((name, row[name]) for name in metrics)
+            by_platform.setdefault(str(row[self.platform_col]), []).append(point)
+        
+        return {'window_days': window_days, 'by_platform': by_platform}
+    
+    def compare_periods(self, period: str = 'month', complete_only: bool = True) -> Dict:
+        """
+        Period-over-period change in each metric's mean, per platform and overall.
+        
+        Args:
+            period: 'week', 'month', 'quarter' or 'year' (calendar periods)
+            complete_only: Compare the last two complete periods, ignoring a
+                period the data only partly covers
+            
+        Returns:
+            Both periods' bounds, and per metric the previous and current means
+            with the absolute and percentage change
+        """
+        if period not in PERIODS:
+            raise ValueError(f'period must be one of: {", ".join(PERIODS)}')
+        
+        by_platform, overall = self._period_buckets(period)
+        starts = overall['__start'].to_list()
+        if complete_only and len(starts) and not overall['__complete'][-1]:
+            starts = starts[:-1]
+        if len(starts) < 2:
+            return {'period': period, 'error': 'Not enough dated data for two periods'}
+        previous, current = starts[-2], starts[-1]
+        
+        metrics = self._metrics_in(self.df)
+        
+        def changes(buckets: pl.DataFrame, keys: List[str]) -> pl.DataFrame:
+            cur = buckets.filter(pl.col('__start') == current).drop(['__start', '__end', '__complete'])
+            prev = buckets.filter(pl.col('__start') == previous).drop(['__start', '__end', '__complete'])
+            if keys:
+                joined = cur.join(prev, on=keys, how='outer_coalesce', suffix='__prev')
+            else:
+                joined = pl.concat([cur, prev.rename({c: f'{c}__prev' for c in prev.columns})], how='horizontal')
+            return joined.with_columns(
+                [(pl.col(name) - pl.col(f'{name}__prev')).alias(f'{name}__change') for name in metrics] +
+                [pl.when(pl.col(f'{name}__prev') != 0)
+                 .then((pl.col(name) - pl.col(f'{name}__prev')) / pl.col(f'{name}__prev').abs() * 100)
+                 .alias(f'{name}__pct') for name in metrics]
+            )
+        
+        def describe(row: Dict) -> Dict:
+            result = {'rows': {'previous': row['__rows__prev'] or 0, 'current': row['__rows'] or 0}}
+            for name in metrics:
+                result[name] = {
+                    'previous': self._round(row[f'{name}__prev']),
+                    'current': self._round(row[name]),
+                    'change': self._round(row[f'{name}__change']),
+                    'pct_change': self._round(row[f'{name}__pct'])
+                }
+            return result
+        
+        bounds = overall.filter(pl.col('__start').is_in([previous, current])).sort('__start')
+        return {
+            'period': period,
+            'previous': {'start': self._iso(previous), 'end': self._iso(bounds['__end'][0])},
+            'current': {'start': self._iso(current), 'end': self._iso(bounds['__end'][1])},
+            'by_platform': {
+                str(row[self.platform_col]): describe(row)
+                for row in changes(by_platform, [self.platform_col]).iter_rows(named=True)
+            },
+            'overall': describe(changes(overall, []).row(0, named=True))
+        }
+    
+    def confidence_intervals(self, resamples: int = bootstrap.DEFAULT_RESAMPLES,
+                             confidence: float = bootstrap.DEFAULT_CONFIDENCE) -> Optional[Dict]:
+        """
+        Bootstrap confidence intervals for each metric's mean, per platform and
+        overall (see bootstrap.mean_intervals). The default intervals are
+        computed once per dataset version, usually in the background (see
+        precompute_intervals), and reused by validate_claim.
+        
+        Returns:
+            Intervals as (low, high), or None when NumPy is not installed
+        """
+        with self._intervals_lock:
+            df, intervals = self.df, self._intervals
+        metrics = self._metrics_in(df)
+        if resamples != bootstrap.DEFAULT_RESAMPLES or confidence != bootstrap.DEFAULT_CONFIDENCE:
+            with timed('bootstrap'):
+                return bootstrap.mean_intervals(df, self.platform_col, metrics, resamples, confidence)
+        if not bootstrap.available():
+            return None
+        
+        self._compute_intervals(df, intervals, metrics)
+        by_platform = {}
+        for metric_name in metrics:
+            for platform, interval in intervals[metric_name]['by_platform'].items():
+                by_platform.setdefault(platform, {})[metric_name] = interval
+        return {
+            'resamples': resamples,
+            'confidence': confidence,
+            'by_platform': by_platform,
+            'overall': {
+                metric_name: intervals[metric_name]['overall']
+                for metric_name in metrics if intervals[metric_name]['overall'] is not None
+            }
+        }
+    
+    def precompute_intervals(self):
+        """
+        Compute the default confidence intervals of every metric that lacks
+        them, then save them with the stored dataset (see save).
+        This takes seconds on large datasets, so it is meant to run off the
+        request path after each load or append; a claim arriving first gets
+        only its own metric computed.
+        """
+        with self._intervals_lock:
+            df, intervals = self.df, self._intervals
+        if df is None or not bootstrap.available():
+            return
+        self._compute_intervals(df, intervals, self._metrics_in(df))
+        self._save_intervals()
+    
+    def _metric_intervals(self, metric_name: str) -> Optional[Dict]:
+        """One metric's default intervals, computed now if needed; None without NumPy."""
+        if not bootstrap.available():
+            return None
+        with self._intervals_lock:
+            df, intervals = self.df, self._intervals
+        metrics = self._metrics_in(df)
+        if metric_name in metrics:
+            self._compute_intervals(df, intervals, {metric_name: metrics[metric_name]})
+        return intervals.get(metric_name)
+    
+    def _compute_intervals(self, df: pl.DataFrame, intervals: Dict, metrics: Dict[str, str]):
+        """Add the default intervals of the given metrics that df's interval cache lacks."""
+        with self._bootstrap_lock:
+            missing = {name: col for name, col in metrics.items() if name not in intervals}
+            if not missing:
+                return
+            
+            with timed('bootstrap'):
+                computed = bootstrap.mean_intervals(df, self.platform_col, missing)
+            for metric_name in missing:
+                intervals[metric_name] = {
+                    'by_platform': {
+                        platform: group[metric_name]
+                        for platform, group in computed['by_platform'].items() if metric_name in group
+                    },
+                    'overall': computed['overall'].get(metric_name)
+                }
+    
+    def scan_confounders(self, max_strata: int = 50, min_rows: int = 20) -> Dict:
+        """
+        Look for Simpson's paradox and confounding in the data itself.
+        For every metric pair, compares the overall correlation with the pooled
+        within-strata correlation for each candidate stratifier (platform,
+        dimension columns such as region or device, and calendar month).
+        
+        The data is read once: a single group-by over all stratifier columns
+        collects each cell's counts, sums and sums of squares and products for
+        every pair. Those sums add up, so each stratifier is a re-aggregation
+        of the (small) cell table, and strata are reduced with expressions
+        rather than a Python loop.
+        
+        Args:
+            max_strata: Skip stratifiers with more distinct values than this
+            min_rows: Strata smaller than this are not counted as reversed
+            
+        Returns:
+            Scan scope plus findings, strongest first. Each finding names the
+            metric pair and stratifier, with the overall and within-strata
+            correlations and the share of each metric's variance the
+            stratifier explains
+        """
+        metrics = self._metrics_in(self.df)
+        pairs = list(itertools.combinations(metrics, 2))
+        result = {'rows': int(len(self.df)), 'metric_pairs': len(pairs), 'stratified_by': [], 'findings': []}
+        if not pairs or not len(self.df):
+            return result
+        
+        row_columns, pair_sums = self._pair_sums(pairs, metrics)
+        sum_columns = [expr.meta.output_name() for expr in row_columns]
+        key_columns = [self.platform_col] + [col for col in self.dimension_cols if col in self.df.columns]
+        if self.date_col:
+            key_columns.append(self.date_col)
+        
+        cells = (
+            self.df.lazy()
+            .select([pl.col(col) for col in key_columns] + row_columns)
+            .group_by(key_columns)
+            .agg([pl.col(col).sum() for col in sum_columns])
+            .collect(streaming=True)
+        )
+        stratifiers = {col: col for col in key_columns if col != self.date_col}
+        if self.date_col:
+            cells = cells.with_columns(pl.col(self.date_col).dt.truncate('1mo').alias('__month'))
+            stratifiers['month'] = '__month'
+        
+        counts = cells.select([pl.col(col).n_unique() for col in stratifiers.values()]).row(0)
+        stratifiers = {
+            name: col for (name, col), count in zip(stratifiers.items(), counts) if 2 <= count <= max_strata
+        }
+        result['stratified_by'] = list(stratifiers)
+        
+        totals = cells.select([pl.col(col).sum() for col in sum_columns]).row(0, named=True)
+        overall = [self._pair_totals(totals, sums) for sums in pair_sums]
+        
+        findings = []
+        for name, col in stratifiers.items():
+            strata = cells.group_by(col).agg([pl.col(c).sum() for c in sum_columns])
+            
+            # Within-strata sums of squares and reversal counts for every pair at once
+            reductions = []
+            for i, sums in enumerate(pair_sums):
+                n = pl.col(sums['n'])
+                sxy, sxx, syy = (self._centred_sum(sums, a, b) for a, b in ('xy', 'xx', 'yy'))
+                sign = 1 if overall[i]['sxy'] >= 0 else -1
+                reversed_ = (
+                    (n >= min_rows) & (sxx > 0) & (syy > 0)
+                    & (sxy * sign / (sxx * syy).sqrt() <= -CONFOUNDER_MIN_CORR)
+                )
+                reductions.extend([
+                    sxy.sum().alias(f'{i}__sxy'),
+                    sxx.sum().alias(f'{i}__sxx'),
+                    syy.sum().alias(f'{i}__syy'),
+                    (n >= min_rows).sum().alias(f'{i}__strata'),
+                    reversed_.sum().alias(f'{i}__reversed'),
+                    pl.when(reversed_).then(n).otherwise(0).sum().alias(f'{i}__reversed_rows')
+                ])
+            within = strata.select(reductions).row(0, named=True)
+            
+            for i, (metric_x, metric_y) in enumerate(pairs):
+                finding = self._confounder_finding(name, metric_x, metric_y, overall[i], within, f'{i}__')
+                if finding:
+                    findings.append(finding)
+        
+        findings.sort(key=lambda f: abs(f['overall_corr'] - f['within_strata_corr']), reverse=True)
+        result['findings'] = findings
+        return result
+    
+    def _period_buckets(self, period: str):
+        """Per-platform and overall means for every calendar period, cached until the data changes."""
+        cache = self._period_cache
+        if period not in cache:
+            frame = self._date_slice(None, None)
+            metrics = self._metrics_in(frame)
+            index = pl.col(self.date_col).cast(pl.Date).alias('__date')
+            frame = frame.with_columns(index).sort('__date')
+            last_date = frame['__date'][-1] if len(frame) else None
+            aggs = [pl.count().alias('__rows')] + [
+                pl.col(col).mean().alias(name) for name, col in metrics.items()
+            ]
+            
+            def buckets(**group) -> pl.DataFrame:
+                result = frame.group_by_dynamic(
+                    '__date', every=PERIODS[period], include_boundaries=True, **group
+                ).agg(aggs)
+                # A period is complete when the data reaches its last day
+                return result.with_columns(
+                    pl.col('__date').alias('__start'),
+                    (pl.col('_upper_boundary').cast(pl.Date) - pl.duration(days=1)).alias('__end')
+                ).with_columns(
+                    (pl.col('__end') <= last_date).alias('__complete')
+                ).drop(['__date', '_lower_boundary', '_upper_boundary'])
+            
+            cache[period] = (buckets(by=self.platform_col), buckets())
+        return cache[period]
+    
+    def _trend_verifications(self, claim_lower: str, index: ValidationIndex) -> List[Dict]:
+        """Check claims like "ROAS rose last month" against period-over-period changes."""
+        period_match = TREND_PERIOD_PATTERN.search(claim_lower)
+        if not period_match:
+            return []
+        direction = next(
+            (name for name, pattern in TREND_DIRECTIONS.items() if pattern.search(claim_lower)), None
+        )
+        if direction is None:
+            return []
+        
+        # "this month" compares the period in progress; "last month" the latest complete one
+        period = period_match.group(2)
+        comparison = self.compare_periods(period, complete_only=period_match.group(1) != 'this')
+        if 'error' in comparison:
+            return []
+        
+        platforms = index.platforms_in(claim_lower)
+        verifications = []
+        for metric_name in index.metric_patterns:
+            if not re.search(rf'\b{metric_name}\b', claim_lower):
+                continue
+            scopes = [(p, comparison['by_platform'].get(p)) for p in platforms] or [('All', comparison['overall'])]
+            results = []
+            for scope, stats in scopes:
+                change = stats[metric_name]['change'] if stats else None
+                results.append({
+                    'platform': scope,
+                    'previous': stats[metric_name]['previous'] if stats else None,
+                    'current': stats[metric_name]['current'] if stats else None,
+                    'change': change,
+                    'supported': change is not None and (change > 0 if direction == 'up' else change < 0)
+                })
+            verifications.append({
+                'type': 'trend_claim',
+                'metric': metric_name,
+                'direction': direction,
+                'period': period,
+                'previous_period': comparison['previous'],
+                'current_period': comparison['current'],
+                'results': results
+            })
+        return verifications
+    
+    def _pair_sums(self, pairs: List, metrics: Dict[str, str]):
+        """
+        Per-row columns whose sums give each metric pair's count, sums, and sums
+        of squares and products. Values are centred on their means so the sums
+        stay numerically stable. A pair involving a metric with nulls gets its
+        own columns, restricted to rows where both values are present.
+        
+        Returns:
+            (column expressions, per pair {'n', 'x', 'y', 'xx', 'yy', 'xy'} -> column name)
+        """
+        stats = self.df.select(
+            [pl.col(col).mean().alias(f'{name}__mean') for name, col in metrics.items()] +
+            [pl.col(col).null_count().alias(f'{name}__nulls') for name, col in metrics.items()]
+        ).row(0, named=True)
+        
+        def centred(name: str) -> pl.Expr:
+            return pl.col(metrics[name]).cast(pl.Float64) - (stats[f'{name}__mean'] or 0.0)
+        
+        columns = {'__rows': pl.lit(1, dtype=pl.Int64)}
+        pair_sums = []
+        for i, (metric_x, metric_y) in enumerate(pairs):
+            x, y = centred(metric_x), centred(metric_y)
+            if stats[f'{metric_x}__nulls'] or stats[f'{metric_y}__nulls']:
+                both = x.is_not_null() & y.is_not_null()
+                x, y = pl.when(both).then(x), pl.when(both).then(y)
+                columns[f'__{i}__n'] = both.cast(pl.Int64)
+                names = {'n': f'__{i}__n', 'x': f'__{i}__x', 'y': f'__{i}__y',
+                         'xx': f'__{i}__xx', 'yy': f'__{i}__yy'}
+            else:
+                names = {'n': '__rows', 'x': f'__{metric_x}', 'y': f'__{metric_y}',
+                         'xx': f'__{metric_x}__sq', 'yy': f'__{metric_y}__sq'}
+            names['xy'] = f'__{i}__xy'
+            
+            for key, expr in (('x', x), ('y', y), ('xx', x * x), ('yy', y * y), ('xy', x * y)):
+                columns.setdefault(names[key], expr)
+            pair_sums.append(names)
+        
+        return [expr.alias(name) for name, expr in columns.items()], pair_sums
+    
+    @staticmethod
+    def _centred_sum(sums: Dict[str, str], a: str, b: str) -> pl.Expr:
+        """Sum of products of deviations from the group mean, from raw sums."""
+        n = pl.col(sums['n'])
+        return pl.when(n > 0).then(
+            pl.col(sums[a + b]) - pl.col(sums[a]) * pl.col(sums[b]) / n
+        ).otherwise(0.0)
+    
+    @staticmethod
+    def _pair_totals(totals: Dict, sums: Dict[str, str]) -> Dict:
+        n = totals[sums['n']]
+        
+        def centred(a: str, b: str) -> float:
+            return totals[sums[a + b]] - totals[sums[a]] * totals[sums[b]] / n if n else 0.0
+        
+        return {'n': n, 'sxy': centred('x', 'y'), 'sxx': centred('x', 'x'), 'syy': centred('y', 'y')}
+    
+    @staticmethod
+    def _corr(sxy: float, sxx: float, syy: float) -> Optional[float]:
+        if sxx <= 0 or syy <= 0:
+            return None
+        return sxy / (sxx * syy) ** 0.5
+    
+    def _confounder_finding(self, stratifier: str, metric_x: str, metric_y: str,
+                            overall: Dict, within: Dict, prefix: str) -> Optional[Dict]:
+        """Classify one metric pair under one stratifier, or None if nothing stands out."""
+        overall_corr = self._corr(overall['sxy'], overall['sxx'], overall['syy'])
+        within_corr = self._corr(within[f'{prefix}sxy'], within[f'{prefix}sxx'], within[f'{prefix}syy'])
+        if overall_corr is None or within_corr is None:
+            return None
+        
+        # Share of each metric's variance lying between strata (eta squared)
+        explained = {
+            metric_x: 1 - within[f'{prefix}sxx'] / overall['sxx'],
+            metric_y: 1 - within[f'{prefix}syy'] / overall['syy']
+        }
+        
+        reverses = (
+            min(abs(overall_corr), abs(within_corr)) >= CONFOUNDER_MIN_CORR
+            and (overall_corr > 0) != (within_corr > 0)
+        )
+        if reverses:
+            finding_type = 'simpsons_paradox'
+            message = (
+                f'{metric_x} and {metric_y} correlate {overall_corr:+.2f} overall but '
+                f'{within_corr:+.2f} within each {stratifier}: the trend reverses once '
+                f'{stratifier} is held fixed'
+            )
+        elif (abs(overall_corr - within_corr) >= CONFOUNDER_MIN_SHIFT
+              and min(explained.values()) >= CONFOUNDER_MIN_ETA):
+            finding_type = 'confounder'
+            message = (
+                f'{stratifier} explains {explained[metric_x]:.0%} of the variance in {metric_x} '
+                f'and {explained[metric_y]:.0%} in {metric_y}; their correlation moves from '
+                f'{overall_corr:+.2f} overall to {within_corr:+.2f} within each {stratifier}'
+            )
+        else:
+            return None
+        
+        return {
+            'type': finding_type,
+            'fallacy': 'confounding_variables',
+            'metrics': [metric_x, metric_y],
+            'stratified_by': stratifier,
+            'overall_corr': round(overall_corr, 3),
+            'within_strata_corr': round(within_corr, 3),
+            'explained_variance': {metric: round(value, 3) for metric, value in explained.items()},
+            'strata': int(within[f'{prefix}strata']),
+            'strata_reversed': int(within[f'{prefix}reversed']),
+            'reversed_row_share': round(within[f'{prefix}reversed_rows'] / overall['n'], 3),
+            'message': message
+        }
+    
+    def _date_slice(self, start: Optional[str], end: Optional[str]) -> pl.DataFrame:
+        """Rows dated within [start, end], found by binary search on the sorted date column."""
+        if not self.date_col:
+            raise ValueError('Dataset has no date column')
+        
+        dates = self.df[self.date_col]
+        lo, hi = 0, len(dates) - dates.null_count()  # undated rows are sorted last
+        first_day, last_day = self._parse_bound(start), self._parse_bound(end)
+        if first_day is not None:
+            lo = self._search_dates(dates, first_day)
+        if last_day is not None:
+            hi = min(hi, self._search_dates(dates, last_day + datetime.timedelta(days=1)))
+        return self.df.slice(lo, max(hi - lo, 0))
+    
+    @staticmethod
+    def _search_dates(dates: pl.Series, day: datetime.date) -> int:
+        """Position of the first row dated on or after day."""
+        return int(dates.search_sorted(pl.Series([day]).cast(dates.dtype), side='left')[0])
+    
+    @staticmethod
+    def _parse_bound(value: Optional[str]) -> Optional[datetime.date]:
+        if value is None or value == '':
+            return None
+        try:
+            return datetime.date.fromisoformat(str(value)[:10])
+        except ValueError:
+            raise ValueError(f'Invalid date: {value} (expected YYYY-MM-DD)')
+    
+    @staticmethod
+    def _iso(value) -> Optional[str]:
+        if value is None:
+            return None
+        return value.date().isoformat() if isinstance(value, datetime.datetime) else value.isoformat()
+    
+    @staticmethod
+    def _rounding_margin(number_text: str) -> float:
+        """Half a unit in the last digit of a number as written ("4.1" -> 0.05, "4" -> 0.5)."""
+        return 0.5 * 10 ** -len(number_text.partition('.')[2])
+    
+    @staticmethod
+    def _round(value) -> Optional[float]:
+        return None if value is None else float(round(value, 2))
+    
+    def _compression(self) -> Optional[int]:
+        """Sketch compression when approximate summaries are enabled and possible."""
+        return self.sketch_compression if quantile_sketch.available() else None
+    
+    def _metrics_in(self, df: pl.DataFrame) -> Dict[str, str]:
+        return {name: col for name, col in self.metric_cols.items() if col in df.columns}
+    
+    def _parse_dates(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Parse the date column (ISO dates or datetimes). Unparseable values become null."""
+        if not self.date_col or self.date_col not in df.columns:
+            return df
+        
+        column = df[self.date_col]
+        if column.dtype == pl.Date or column.dtype == pl.Datetime:
+            return df
+        if column.dtype != pl.Utf8:
+            raise ValueError(f'Column {self.date_col} does not contain dates')
+        
+        for parse in (column.str.to_date, column.str.to_datetime):
+            try:
+                return df.with_columns(parse(strict=False))
+            except pl.ComputeError:
+                continue
+        raise ValueError(f'Column {self.date_col} does not contain dates')
+    
+    def _index_dates(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Parse dates at ingest and sort by them, so date ranges are a binary search away."""
+        if not self.date_col:
+            return df
+        try:
+            df = self._parse_dates(df)
+        except ValueError:
+            # Not a usable date column; the dataset still loads without time queries
+            self.date_col = None
+            return df
+        return df.sort(self.date_col, nulls_last=True)
+    
+    def _extends_sorted(self, delta: pl.DataFrame) -> bool:
+        """Whether appending delta keeps the frame sorted by date (e.g. a later day's rows)."""
+        if self.date_col not in delta.columns:
+            return False
+        dates = delta[self.date_col]
+        if self.df[self.date_col].null_count() or dates.null_count():
+            return False
+        if not dates.is_sorted():
+            return False
+        existing = self.df[self.date_col]
+        return len(existing) == 0 or len(dates) == 0 or dates[0] >= existing[-1]
+    
+    def _conform(self, delta: pl.DataFrame) -> pl.DataFrame:
+        """Cast appended columns to the dataset's types; numeric columns may widen."""
+        casts = []
+        for col in delta.columns:
+            dtype = self.df.schema[col]
+            if delta.schema[col] == dtype or (dtype.is_numeric() and delta.schema[col].is_numeric()):
+                continue
+            if col in self.metric_cols.values():
+                raise ValueError(f'Column {col} must be numeric')
+            casts.append(pl.col(col).cast(dtype))
+        return delta.with_columns(casts) if casts else delta
+    
+    def _detect_columns(self, columns: List[str]):
         """Detect relevant columns (case-insensitive)."""
-        cols_lower = {col.lower(): col for col in self.df.columns}
+        cols_lower = {col.lower(): col for col in columns}
+        self.platform_col = None
+        self.date_col = None
+        self.metric_cols = {}
+        
+        for keyword in ['date', 'day', 'report_date', 'datetime', 'timestamp']:
+            if keyword in cols_lower:
+                self.date_col = cols_lower[keyword]
+                break
         
         platform_keywords = ['platform', 'channel', 'ad_platform', 'source', 'medium']
         for keyword in platform_keywords:
@@ -62,102 +1188,151 @@ class DataAnalyzer:
                 if keyword in cols_lower:
                     self.metric_cols[metric_name] = cols_lower[keyword]
                     break
+        
+        self.dimension_cols = [
+            cols_lower[keyword] for keyword in DIMENSION_KEYWORDS
+            if keyword in cols_lower and cols_lower[keyword] not in self.metric_cols.values()
+            and cols_lower[keyword] != self.platform_col
+        ]
     
-    def _generate_summary(self) -> Dict:
-        """Generate summary statistics by platform."""
+    def _generate_summary(self, df: Optional[pl.DataFrame] = None) -> Dict:
+        """Generate summary statistics by platform (for the whole frame unless df is given)."""
         if not self.platform_col:
             return {}
         
+        df = self.df if df is None else df
         summary = {'by_platform': {}, 'overall': {}}
+        metrics = {name: col for name, col in self.metric_cols.items() if col in df.columns}
+        if df.is_empty():
+            return summary
         
-        # Get unique platforms
-        platforms = self.df[self.platform_col].unique().to_list()
-        
-        for platform in platforms:
-            # Filter data for this platform
-            group = self.df.filter(pl.col(self.platform_col) == platform)
-            platform_stats = {'count': int(len(group))}
-            
-            # Calculate metrics
-            for metric_name, col_name in self.metric_cols.items():
-                if col_name in group.columns:
-                    platform_stats[metric_name] = {
-                        'mean': float(round(group[col_name].mean(), 2)),
-                        'median': float(round(group[col_name].median(), 2)),
-                        'min': float(round(group[col_name].min(), 2)),
-                        'max': float(round(group[col_name].max(), 2))
-                    }
-            
-            summary['by_platform'][str(platform)] = platform_stats
+        if self._compression():
+            # One chunked pass into mergeable sketches, which later appends extend
+            aggregates = IncrementalSummary.from_frame(df, self.platform_col, metrics, self._compression())
+            if df is self.df:
+                self._aggregates = aggregates
+            return aggregates.summary()
+        
+        # One group-by pass computes every metric for every platform
+        by_platform = df.group_by(self.platform_col).agg(
+            [pl.count().alias('__count')] + self._summary_exprs(metrics)
+        )
+        
+        for row in by_platform.iter_rows(named=True):
+            platform_stats = {'count': int(row['__count'])}
+            platform_stats.update(self._stats_from_row(row, metrics))
+            summary['by_platform'][str(row[self.platform_col])] = platform_stats
         
         # Overall stats
-        for metric_name, col_name in self.metric_cols.items():
-            if col_name in self.df.columns:
-                summary['overall'][metric_name] = {
-                    'mean': float(round(self.df[col_name].mean(), 2)),
-                    'median': float(round(self.df[col_name].median(), 2)),
-                    'min': float(round(self.df[col_name].min(), 2)),
-                    'max': float(round(self.df[col_name].max(), 2))
-                }
+        if metrics:
+            overall = df.select(self._summary_exprs(metrics)).row(0, named=True)
+            summary['overall'] = self._stats_from_row(overall, metrics)
         
         return summary
     
+    def _summary_exprs(self, metrics: Dict[str, str]) -> List[pl.Expr]:
+        """Build mean/median/p90/p99/min/max aggregations for each metric column."""
+        exprs = []
+        for metric_name, col_name in metrics.items():
+            col = pl.col(col_name)
+            exprs.extend([
+                col.mean().alias(f'{metric_name}__mean'),
+                col.median().alias(f'{metric_name}__median'),
+                col.quantile(0.9, 'linear').alias(f'{metric_name}__p90'),
+                col.quantile(0.99, 'linear').alias(f'{metric_name}__p99'),
+                col.min().alias(f'{metric_name}__min'),
+                col.max().alias(f'{metric_name}__max')
+            ])
+        return exprs
+    
+    def _stats_from_row(self, row: Dict, metrics: Dict[str, str]) -> Dict:
+        """Unpack aggregated columns into the nested summary format (None for a metric with no values)."""
+        return {
+            metric_name: {
+                stat: float(round(row[f'{metric_name}__{stat}'], 2))
+                for stat in ('mean', 'median', 'p90', 'p99', 'min', 'max')
+            } if row[f'{metric_name}__mean'] is not None else None
+            for metric_name in metrics
+        }
+    
+    def _build_validation_index(self) -> ValidationIndex:
+        """(Re)build the validation index for the current summary."""
+        self._validation_index = ValidationIndex(self.summary_stats, self.metric_cols)
+        return self._validation_index
+    
     def validate_claim(self, claim_text: str) -> Dict:
         """Validate a claim against the loaded data."""
+        with timed('validation'):
+            return self._validate_claim(claim_text)
+    
+    def _validate_claim(self, claim_text: str) -> Dict:
         if self.df is None:
             return {'verified': False, 'message': 'No data loaded'}
         
+        index = self._validation_index or self._build_validation_index()
         claim_lower = claim_text.lower()
         verifications = []
         
-        for platform in self.summary_stats['by_platform'].keys():
-            if platform.lower() in claim_lower:
-                verifications.append({
-                    'type': 'platform_detected',
-                    'platform': platform,
-                    'stats': self.summary_stats['by_platform'][platform]
-                })
+        for platform in index.platforms_in(claim_lower):
+            verifications.append({
+                'type': 'platform_detected',
+                'platform': platform,
+                'stats': self.summary_stats['by_platform'][platform]
+            })
         
-        import re
-        for metric_name, col_name in self.metric_cols.items():
-            patterns = [
-                rf'{metric_name}\s*(?:is|:|=)\s*(\d+\.?\d*)',
-                rf'{metric_name}\s*(?:of|at)\s*(\d+\.?\d*)'
-            ]
-            
+        for metric_name, patterns in index.metric_patterns.items():
             for pattern in patterns:
-                match = re.search(pattern, claim_lower)
+                match = pattern.search(claim_lower)
                 if match:
                     claimed_value = float(match.group(1))
-                    matching_platforms = []
+                    intervals = self._metric_intervals(metric_name)
                     
-                    for platform, stats in self.summary_stats['by_platform'].items():
-                        if metric_name in stats:
-                            actual_mean = stats[metric_name]['mean']
-                            actual_max = stats[metric_name]['max']
-                            
-                            if abs(claimed_value - actual_mean) < 0.5:
-                                matching_platforms.append({
-                                    'platform': platform,
-                                    'actual_value': actual_mean,
-                                    'match_type': 'mean'
-                                })
-                            elif abs(claimed_value - actual_max) < 0.5:
-                                matching_platforms.append({
-                                    'platform': platform,
-                                    'actual_value': actual_max,
-                                    'match_type': 'max'
-                                })
+                    # A mean match takes precedence over a max match
+                    matches = {
+                        position: (actual_max, 'max', None)
+                        for position, actual_max in index.near(metric_name, 'max', claimed_value).items()
+                    }
+                    if intervals is not None:
+                        # Claims are rounded, so the interval is widened by half the claim's last digit
+                        matches.update(
+                            (position, (actual_mean, 'mean', interval))
+                            for position, (actual_mean, interval) in index.in_interval(
+                                metric_name, claimed_value, self._rounding_margin(match.group(1)),
+                                intervals
+                            ).items()
+                        )
+                    else:
+                        matches.update(
+                            (position, (actual_mean, 'mean', None))
+                            for position, actual_mean in index.near(metric_name, 'mean', claimed_value).items()
+                        )
+                    
+                    matching_platforms = []
+                    for position, (actual_value, match_type, interval) in sorted(matches.items()):
+                        entry = {
+                            'platform': index.platforms[position],
+                            'actual_value': actual_value,
+                            'match_type': match_type
+                        }
+                        if interval:
+                            entry['confidence_interval'] = [self._round(bound) for bound in interval]
+                        matching_platforms.append(entry)
                     
-                    verifications.append({
+                    verification = {
                         'type': 'metric_claim',
                         'metric': metric_name,
                         'claimed_value': claimed_value,
                         'matching_platforms': matching_platforms
-                    })
+                    }
+                    if intervals is not None:
+                        verification['confidence_level'] = bootstrap.DEFAULT_CONFIDENCE
+                    verifications.append(verification)
+        
+        if self.date_col:
+            verifications.extend(self._trend_verifications(claim_lower, index))
         
         return {
             'verified': len(verifications) > 0,
             'verifications': verifications,
             'summary': self.summary_stats
-        }
\ No newline at end of file
+        }
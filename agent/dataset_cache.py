@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from data_analyzer import DataAnalyzer
+
+
+class DatasetCache:
+    """
+    Parsed uploads keyed by content hash.
+    A repeat upload of the same file is still sanitized (which is what hashes
+    it), but skips parsing and the summary. Entries that were saved (see
+    DataAnalyzer.save) are hard-linked, not rewritten, when saved again.
+    Entries are held in memory under an LRU bound and, when a cache directory
+    is configured, written to disk as Arrow IPC so they survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 256 * 1024 * 1024,
+                 cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, digest: str) -> Optional[DataAnalyzer]:
+        """
+        Look up a parsed upload.
+
+        Args:
+            digest: SHA-256 hex digest of the upload (from app.sanitize_csv_stream)
+
+        Returns:
+            A fresh DataAnalyzer with the cached state, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry.clone()
+
+        analyzer = self._read_disk(digest)
+        with self._lock:
+            if analyzer is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(digest, analyzer)
+        return analyzer.clone()
+
+    def put(self, digest: str, analyzer: DataAnalyzer):
+        """Cache a successfully loaded analyzer under its content hash."""
+        cached = analyzer.clone()
+        with self._lock:
+            self._store(digest, cached)
+        self._write_disk(digest, cached)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory use."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _store(self, digest: str, analyzer: DataAnalyzer):
+        if digest in self._entries:
+            self._total_bytes -= self._entries.pop(digest).df.estimated_size()
+        self._entries[digest] = analyzer
+        self._total_bytes += analyzer.df.estimated_size()
+
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.df.estimated_size()
+
+    def _write_disk(self, digest: str, analyzer: DataAnalyzer):
+        """Persist an entry (see DataAnalyzer.save)."""
+        if not self.cache_dir:
+            return
+
+        try:
+            analyzer.save(str(self.cache_dir / digest))
+        except OSError:
+            # The disk store is best-effort; the in-memory entry still serves hits
+            pass
+
+    def _read_disk(self, digest: str) -> Optional[DataAnalyzer]:
+        if not self.cache_dir:
+            return None
+        return DataAnalyzer.open(str(self.cache_dir / digest))
@@ -0,0 +1,139 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class DatasetRegistry:
+    """
+    Holds uploaded datasets keyed by dataset ID.
+    Least recently used datasets are evicted once the memory budget or the
+    dataset limit is exceeded, and idle datasets expire after the TTL.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, ttl_seconds: float = 3600,
+                 max_datasets: int = 64):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_datasets = max_datasets
+        self._datasets = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, analyzer, dataset_id: Optional[str] = None, version: Optional[int] = None) -> str:
+        """
+        Register a loaded DataAnalyzer.
+
+        Args:
+            analyzer: DataAnalyzer holding a successfully loaded dataset
+            dataset_id: Existing ID to (re)register under; a new one is issued if omitted
+            version: Stored version of the dataset this copy was loaded from, if persisted
+
+        Returns:
+            The dataset ID callers use to refer to it
+        """
+        dataset_id = dataset_id or secrets.token_urlsafe(16)
+        size = self._dataset_size(analyzer)
+
+        with self._lock:
+            if dataset_id in self._datasets:
+                self._remove(dataset_id)
+            self._datasets[dataset_id] = {
+                'analyzer': analyzer,
+                'bytes': size,
+                'last_access': time.monotonic(),
+                'version': version
+            }
+            self._total_bytes += size
+            self._evict()
+
+        return dataset_id
+
+    def get(self, dataset_id: str):
+        """Return the DataAnalyzer for a dataset ID, or None if unknown or expired."""
+        with self._lock:
+            entry = self._datasets.get(dataset_id)
+            if entry is None:
+                return None
+
+            now = time.monotonic()
+            if now - entry['last_access'] > self.ttl_seconds:
+                self._remove(dataset_id)
+                return None
+
+            entry['last_access'] = now
+            self._datasets.move_to_end(dataset_id)
+            return entry['analyzer']
+
+    def version(self, dataset_id: str) -> Optional[int]:
+        """Stored version the registered copy was loaded from (None if unknown)."""
+        with self._lock:
+            entry = self._datasets.get(dataset_id)
+            return entry['version'] if entry else None
+
+    def refresh(self, dataset_id: str, version: Optional[int] = None):
+        """
+        Re-measure a dataset after it has grown (e.g. rows were appended).
+
+        Args:
+            dataset_id: Registered dataset ID
+            version: New stored version once the grown dataset has been saved;
+                None keeps the current one, so an unsaved copy still counts as current
+        """
+        with self._lock:
+            entry = self._datasets.get(dataset_id)
+            if entry is None:
+                return
+            size = self._dataset_size(entry['analyzer'])
+            self._total_bytes += size - entry['bytes']
+            entry['bytes'] = size
+            if version is not None:
+                entry['version'] = version
+            self._datasets.move_to_end(dataset_id)
+            self._evict()
+
+    def remove(self, dataset_id: str) -> bool:
+        """Drop a dataset. Returns False if it was not registered."""
+        with self._lock:
+            if dataset_id not in self._datasets:
+                return False
+            self._remove(dataset_id)
+            return True
+
+    def stats(self) -> Dict:
+        """Current dataset count and memory held."""
+        with self._lock:
+            return {
+                'datasets': len(self._datasets),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def _evict(self):
+        """Drop expired datasets, then least recently used ones until within budget."""
+        now = time.monotonic()
+        expired = [
+            dataset_id for dataset_id, entry in self._datasets.items()
+            if now - entry['last_access'] > self.ttl_seconds
+        ]
+        for dataset_id in expired:
+            self._remove(dataset_id)
+
+        # The most recent dataset is always kept, even if it alone exceeds the budget
+        while len(self._datasets) > 1 and (
+            self._total_bytes > self.max_bytes or len(self._datasets) > self.max_datasets
+        ):
+            self._remove(next(iter(self._datasets)))
+
+    def _remove(self, dataset_id: str):
+        entry = self._datasets.pop(dataset_id)
+        self._total_bytes -= entry['bytes']
+
+    @staticmethod
+    def _dataset_size(analyzer) -> int:
+        """Approximate in-memory size of the analyzer's frame and aggregates."""
+        return analyzer.estimated_size()
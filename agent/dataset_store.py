@@ -0,0 +1,129 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from data_analyzer import DataAnalyzer
+
+# File locks serialise appends across worker processes where available
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Dataset IDs come from clients, so only plain token characters may reach the filesystem
+DATASET_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+# Expired files are looked for at most this often (seconds)
+PURGE_INTERVAL = 600
+
+
+class DatasetStore:
+    """
+    Uploaded datasets persisted by dataset ID in a local directory.
+    Every worker process can reopen any dataset, memory-mapped, so a
+    restart or worker recycle loses nothing and workers share one copy of
+    the data through the page cache. Files are removed once they have not
+    been written for the retention period.
+    """
+
+    def __init__(self, data_dir: str, retention_seconds: float = 24 * 3600):
+        self.data_dir = Path(data_dir)
+        self.retention_seconds = retention_seconds
+        self._next_purge = 0.0
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+    def save(self, dataset_id: str, analyzer: DataAnalyzer) -> Optional[int]:
+        """
+        Write a dataset under its ID.
+
+        Returns:
+            The stored version (see version()), or None if the ID is invalid
+        """
+        path = self._path(dataset_id)
+        if path is None:
+            return None
+
+        analyzer.save(str(path))
+        self._purge_expired()
+        return self.version(dataset_id)
+
+    def open(self, dataset_id: str) -> Optional[DataAnalyzer]:
+        """Reopen a stored dataset memory-mapped, or None if it is not stored."""
+        path = self._path(dataset_id)
+        if path is None:
+            return None
+        return DataAnalyzer.open(str(path))
+
+    def version(self, dataset_id: str) -> Optional[int]:
+        """
+        Save counter that grows whenever the dataset is rewritten (e.g. appended to),
+        so workers can tell that a copy they hold is stale. None if not stored.
+        Appends compare it under lock(), so no two saves share a version.
+        """
+        path = self._path(dataset_id)
+        if path is None:
+            return None
+        return DataAnalyzer.saved_version(str(path))
+
+    def remove(self, dataset_id: str):
+        path = self._path(dataset_id)
+        if path is None:
+            return
+        # IDs contain no dots, so this matches only this dataset's files (frame parts, metadata, lock)
+        for file_path in self.data_dir.glob(f'{dataset_id}.*'):
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+    @contextmanager
+    def lock(self, dataset_id: str):
+        """
+        Hold an exclusive cross-process lock on a dataset while rewriting it.
+        Only stored datasets are locked (a dataset no other worker can open
+        needs no lock), so unknown IDs never leave a lock file behind.
+        """
+        path = self._path(dataset_id)
+        if path is None or fcntl is None or self.version(dataset_id) is None:
+            yield
+            return
+
+        with open(f'{path}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, dataset_id: str) -> Optional[Path]:
+        if not isinstance(dataset_id, str) or not DATASET_ID_PATTERN.fullmatch(dataset_id):
+            return None
+        return self.data_dir / dataset_id
+
+    def _purge_expired(self):
+        """Remove datasets not written within the retention period."""
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + PURGE_INTERVAL
+
+        for meta_path in self.data_dir.glob('*.json'):
+            try:
+                expired = now - meta_path.stat().st_mtime > self.retention_seconds
+            except OSError:
+                continue
+            if expired:
+                self.remove(meta_path.stem)
+
+        # Lock files left by datasets whose other files are already gone
+        for lock_path in self.data_dir.glob('*.lock'):
+            try:
+                orphaned = (not lock_path.with_suffix('.json').exists()
+                            and now - lock_path.stat().st_mtime > self.retention_seconds)
+                if orphaned:
+                    os.remove(lock_path)
+            except OSError:
+                continue
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import marshal
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from result_records import FallacyText
+from trigger_matcher import TriggerIndex
+
+# How often (seconds) the watcher checks fallacies.json for edits
+CONFIG_CHECK_INTERVAL = 1.0
+
+# Bumped whenever the compiled structures change shape, so older snapshot files are ignored
+SNAPSHOT_FORMAT = 2
+
+DEFAULT_PATH = Path(__file__).parent.parent / 'config' / 'fallacies.json'
+
+TRIGGER_KEYS = ('keywords', 'metrics', 'patterns')
+CHALLENGE_KEYS = ('constructive', 'direct', 'missing_data', 'alternatives')
+
+# One manager per config file per process, shared by every detector
+_managers: Dict[str, 'FallacyConfig'] = {}
+_managers_lock = threading.Lock()
+
+
+def shared(path=DEFAULT_PATH) -> 'FallacyConfig':
+    """The process-wide manager for a fallacy database, created on first use."""
+    key = str(Path(path).resolve())
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = FallacyConfig(key)
+        return manager
+
+
+class FallacySnapshot:
+    """
+    One compiled version of the fallacy database: the parsed fallacies, their
+    TriggerIndex and the display text results refer to. Never modified once
+    built; a reload builds a new snapshot, so a reader holding one always
+    sees a consistent set.
+    """
+
+    __slots__ = ('fallacies', 'triggers', 'texts', 'version', 'stat')
+
+    def __init__(self, fallacies: Dict, triggers: TriggerIndex, version: str, stat: tuple):
+        self.fallacies = fallacies
+        self.triggers = triggers
+        self.texts = {fallacy_id: FallacyText(fallacy_id, fallacy) for fallacy_id, fallacy in fallacies.items()}
+        self.version = version
+        self.stat = stat
+
+
+class FallacyConfig:
+    """
+    Keeps the current FallacySnapshot of fallacies.json.
+    A background thread polls the file and compiles edits off the request
+    path; the new snapshot replaces the old one with a single reference
+    assignment, so readers never wait and never see a half-built database.
+    An edit that is unreadable or fails validation keeps the current snapshot.
+
+    Each compiled snapshot is also saved next to the source
+    (fallacies.json.compiled), keyed by the source's content hash, so a cold
+    start skips JSON parsing and trigger compilation. The file is a marshal
+    of plain dicts, lists, strings and ints (never pickle), and its contents
+    are checked when read, so a damaged or tampered file cannot run code or
+    break matching; it is just recompiled.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, snapshot_path: Optional[str] = None,
+                 check_interval: float = CONFIG_CHECK_INTERVAL):
+        self.path = Path(path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.path.with_name(f'{self.path.name}.compiled')
+        self.check_interval = check_interval
+        self._rejected_stat = None
+        self._watcher_pid = None
+        self._watcher_lock = threading.Lock()
+        self.snapshot = self._load(_stat(self.path))
+
+    def current(self) -> FallacySnapshot:
+        """The latest snapshot. Starts this process's watcher on first use."""
+        if self._watcher_pid != os.getpid():
+            self._start_watcher()
+        return self.snapshot
+
+    def check(self) -> bool:
+        """
+        Compile and swap in fallacies.json if it was edited since the current
+        snapshot was loaded.
+
+        Returns:
+            True if a snapshot with different content was swapped in
+        """
+        try:
+            stat = _stat(self.path)
+        except OSError:
+            return False
+        if stat == self.snapshot.stat or stat == self._rejected_stat:
+            return False
+
+        try:
+            snapshot = self._load(stat)
+        except (OSError, ValueError):
+            # Remember the bad edit so it is not recompiled every interval
+            self._rejected_stat = stat
+            return False
+
+        changed = snapshot.version != self.snapshot.version
+        self.snapshot = snapshot
+        return changed
+
+    def _start_watcher(self):
+        # A forked worker inherits the attribute but not the thread, hence the pid
+        with self._watcher_lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+            threading.Thread(target=self._watch, name='fallacy-config-watcher', daemon=True).start()
+
+    def _watch(self):
+        pid = os.getpid()
+        while self._watcher_pid == pid:
+            time.sleep(self.check_interval)
+            self.check()
+
+    def _load(self, stat: tuple) -> FallacySnapshot:
+        """Snapshot of the file's current content, from the compiled snapshot file when it matches."""
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()[:16]
+
+        compiled = self._read_compiled(version)
+        if compiled is not None:
+            fallacies, triggers = compiled
+            return FallacySnapshot(fallacies, triggers, version, stat)
+
+        fallacies = json.loads(raw)
+        validate(fallacies)
+        snapshot = FallacySnapshot(fallacies, TriggerIndex(fallacies), version, stat)
+        self._write_compiled(snapshot)
+        return snapshot
+
+    def _read_compiled(self, version: str):
+        """(fallacies, triggers) from the snapshot file, or None if it is missing, stale or invalid."""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                # loads() on the whole file: load() reads a file object in small pieces
+                compiled = marshal.loads(f.read())
+            if compiled['format'] == SNAPSHOT_FORMAT and compiled['version'] == version:
+                fallacies = compiled['fallacies']
+                validate(fallacies)
+                triggers = TriggerIndex.from_dict(compiled['triggers'])
+                if triggers.fallacy_ids == list(fallacies):
+                    return fallacies, triggers
+        except Exception:
+            # Missing, truncated, tampered with, or written by an incompatible version of the code
+            pass
+        return None
+
+    def _write_compiled(self, snapshot: FallacySnapshot):
+        # Per-process temporary name, so workers compiling at once don't interleave
+        tmp_path = f'{self.snapshot_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                # Built once the file is open, so an unwritable deploy doesn't pay for it
+                marshal.dump({
+                    'format': SNAPSHOT_FORMAT,
+                    'version': snapshot.version,
+                    'fallacies': snapshot.fallacies,
+                    'triggers': snapshot.triggers.to_dict()
+                }, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            # Best-effort: a read-only deploy just compiles at every start
+            pass
+
+
+def validate(fallacies: Dict):
+    """
+    Check a parsed fallacy database has the shape the detector and challenge
+    generator rely on.
+
+    Raises:
+        ValueError: describing the first problem found
+    """
+    if not isinstance(fallacies, dict) or not fallacies:
+        raise ValueError('fallacy database must be a non-empty object')
+
+    for fallacy_id, fallacy in fallacies.items():
+        if not isinstance(fallacy, dict):
+            raise ValueError(f'{fallacy_id}: must be an object')
+        for key in ('name', 'description'):
+            if not isinstance(fallacy.get(key), str):
+                raise ValueError(f'{fallacy_id}: {key} must be a string')
+        _check_lists(fallacy_id, 'triggers', fallacy.get('triggers'), TRIGGER_KEYS, required=False)
+        _check_lists(fallacy_id, 'challenges', fallacy.get('challenges'), CHALLENGE_KEYS, required=True)
+
+
+def _check_lists(fallacy_id: str, section: str, value, keys: tuple, required: bool):
+    if not isinstance(value, dict):
+        raise ValueError(f'{fallacy_id}: {section} must be an object')
+    for key in keys:
+        if key not in value and not required:
+            continue
+        items = value.get(key)
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            raise ValueError(f'{fallacy_id}: {section}.{key} must be a list of strings')
+
+
+def _stat(path: Path) -> tuple:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
@@ -1,7 +1,10 @@
-import json
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+import fallacy_config
+from fallacy_config import FallacySnapshot
 from input_processor import InputProcessor
+from metrics import timed
+from result_records import Detection
+from trigger_matcher import TriggerIndex
 
 class FallacyDetector:
     """
@@ -11,15 +14,40 @@ class FallacyDetector:
     
     def __init__(self):
         self.processor = InputProcessor()
-        self.fallacies = self._load_fallacies()
+        self.config = fallacy_config.shared()
+        self.fallacy_path = self.config.path
+        self.snapshot: FallacySnapshot = self.config.snapshot
     
-    def _load_fallacies(self) -> Dict:
-        """Load the fallacy database from JSON."""
-        fallacy_path = Path(__file__).parent.parent / 'config' / 'fallacies.json'
-        with open(fallacy_path, 'r') as f:
-            return json.load(f)
+    @property
+    def fallacies(self) -> Dict:
+        return self.snapshot.fallacies
     
-    def detect(self, claim_text: str) -> List[Dict]:
+    @property
+    def triggers(self) -> TriggerIndex:
+        return self.snapshot.triggers
+    
+    @property
+    def config_version(self) -> str:
+        """Content hash of the fallacies.json this detector is using."""
+        return self.snapshot.version
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Switch to the latest compiled fallacy database. Edits to fallacies.json
+        are picked up and compiled in the background (see FallacyConfig), so
+        this never reads the file itself.
+        
+        Returns:
+            True if the database content changed
+        """
+        snapshot = self.config.current()
+        if snapshot is self.snapshot:
+            return False
+        changed = snapshot.version != self.snapshot.version
+        self.snapshot = snapshot
+        return changed
+    
+    def detect(self, claim_text: str) -> List[Detection]:
         """
         Analyze claim and detect potential fallacies.
         
@@ -27,19 +55,72 @@ class FallacyDetector:
             claim_text: The user's analytical claim
             
         Returns:
-            List of detected fallacies with confidence scores
+            Detected fallacies with confidence scores, highest score first
+        """
+        snapshot = self.snapshot
+        return self._expand(self._score(claim_text, snapshot.triggers), snapshot.texts)
+    
+    def detect_many(self, claims: List[str]) -> List[List[Detection]]:
+        """
+        Detect fallacies for a batch of claims.
+        Repeated claims are tokenized and scored only once.
+        
+        Args:
+            claims: List of analytical claims
+            
+        Returns:
+            One detection list per claim, in input order
+        """
+        snapshot = self.snapshot
+        return [self._expand(scored, snapshot.texts) for scored in self._score_many(claims, snapshot.triggers)]
+    
+    def score_many(self, claims: List[str]) -> List[List[Tuple[str, int]]]:
         """
+        Score a batch of claims without building the full detection records.
+        Compact enough to send between processes; turn back into detections
+        with expand().
+        
+        Args:
+            claims: List of analytical claims
+            
+        Returns:
+            One list of (fallacy_id, match_score) pairs per claim, highest score first
+        """
+        return self._score_many(claims, self.triggers)
+    
+    def expand(self, scored: List[Tuple[str, int]]) -> List[Detection]:
+        """Build detection records from (fallacy_id, match_score) pairs."""
+        return self._expand(scored, self.snapshot.texts)
+    
+    def _score_many(self, claims: List[str], triggers: TriggerIndex) -> List[List[Tuple[str, int]]]:
+        results = {}
+        for claim_text in claims:
+            if claim_text not in results:
+                results[claim_text] = self._score(claim_text, triggers)
+        
+        return [results[claim_text] for claim_text in claims]
+    
+    def _score(self, claim_text: str, triggers: TriggerIndex) -> List[Tuple[str, int]]:
+        """Score every fallacy against a claim, keeping those that matched."""
         # Process the claim first
-        processed = self.processor.process(claim_text)
+        with timed('input_processing'):
+            processed = self.processor.process(claim_text)
         
+        with timed('detection'):
+            return self._match(claim_text, processed, triggers)
+    
+    def _match(self, claim_text: str, processed: Dict, triggers: TriggerIndex) -> List[Tuple[str, int]]:
         # Check for signs of good methodology (reduce false positives)
         good_signals = self._check_good_methodology(claim_text.lower())
         
-        detected = []
+        scored = []
+        
+        # Score every fallacy in one pass over the claim
+        scores = triggers.score(processed)
         
-        # Check each fallacy for pattern matches
-        for fallacy_id, fallacy_data in self.fallacies.items():
-            match_score = self._calculate_match_score(processed, fallacy_data)
+        for fallacy_id, match_score in zip(triggers.fallacy_ids, scores):
+            if match_score == 0:
+                continue
             
             # Reduce score if good methodology signals present
             if good_signals['has_controlled_experiment']:
@@ -50,19 +131,19 @@ class FallacyDetector:
                 match_score = max(0, match_score - 2)  # Reduce by 2 points
             
             if match_score > 0:
-                detected.append({
-                    'fallacy_id': fallacy_id,
-                    'fallacy_name': fallacy_data['name'],
-                    'description': fallacy_data['description'],
-                    'confidence': self._score_to_confidence(match_score),
-                    'match_score': match_score,
-                    'challenges': fallacy_data['challenges']
-                })
+                scored.append((fallacy_id, match_score))
         
-        # Sort by confidence (highest first)
-        detected.sort(key=lambda x: x['match_score'], reverse=True)
+        # Sort by score (highest first)
+        scored.sort(key=lambda x: x[1], reverse=True)
         
-        return detected
+        return scored
+    
+    def _expand(self, scored: List[Tuple[str, int]], texts: Dict) -> List[Detection]:
+        # Records point at the snapshot's shared text rather than copying it
+        return [
+            Detection(texts[fallacy_id], match_score, self._score_to_confidence(match_score))
+            for fallacy_id, match_score in scored
+        ]
     
     def _check_good_methodology(self, text: str) -> Dict:
         """Check for signs of proper analytical methodology."""
@@ -104,42 +185,6 @@ class FallacyDetector:
         
         return good_signals
     
-    def _calculate_match_score(self, processed: Dict, fallacy_data: Dict) -> int:
-        """
-        Calculate how well the claim matches a fallacy pattern.
-        Higher score = stronger match.
-        """
-        score = 0
-        triggers = fallacy_data['triggers']
-        
-        # Check keyword matches
-        claim_keywords = processed['keywords']
-        fallacy_keywords = set(word.lower() for word in triggers.get('keywords', []))
-        keyword_matches = claim_keywords.intersection(fallacy_keywords)
-        score += len(keyword_matches) * 3  # Keywords worth 3 points each
-        
-        # Check metric matches
-        claim_metrics = [m.lower() for m in processed['metrics_found']]
-        fallacy_metrics = [m.lower() for m in triggers.get('metrics', [])]
-        
-        for metric in claim_metrics:
-            if metric in fallacy_metrics or 'any metric' in fallacy_metrics:
-                score += 5  # Metrics worth 5 points each
-        
-        # Check pattern matches
-        claim_text_lower = processed['original_claim'].lower()
-        fallacy_patterns = triggers.get('patterns', [])
-        
-        for pattern in fallacy_patterns:
-            if pattern.lower() in claim_text_lower:
-                score += 2  # Patterns worth 2 points each
-        
-        # Bonus for action words (indicates recommendation)
-        if processed['has_recommendation'] and 'reallocate' in triggers.get('keywords', []):
-            score += 3
-        
-        return score
-    
     def _score_to_confidence(self, score: int) -> str:
         """Convert numeric score to confidence level."""
         if score >= 15:
@@ -172,9 +217,9 @@ if __name__ == "__main__":
         print(f"Found {len(detected_fallacies)} potential fallacy/fallacies:\n")
         
         for i, fallacy in enumerate(detected_fallacies, 1):
-            print(f"{i}. {fallacy['fallacy_name']} (Confidence: {fallacy['confidence']})")
-            print(f"   Score: {fallacy['match_score']}")
-            print(f"   Description: {fallacy['description']}")
+            print(f"{i}. {fallacy.fallacy_name} (Confidence: {fallacy.confidence})")
+            print(f"   Score: {fallacy.match_score}")
+            print(f"   Description: {fallacy.description}")
             print()
     else:
         print("No fallacies detected.")
@@ -0,0 +1,326 @@
+import sys
+from heapq import merge
+from typing import Dict, Optional
+
+import polars as pl
+
+from quantile_sketch import TDigest
+
+# Pending values are folded into the sorted base once they outgrow this share of it
+COMPACT_RATIO = 8
+COMPACT_MIN = 4096
+
+# Sketched summaries are built from the frame this many rows at a time
+SKETCH_CHUNK_ROWS = 1000000
+
+# Quantiles reported besides the median, by summary key
+QUANTILES = {'p90': 0.9, 'p99': 0.99}
+
+
+class SortedRuns:
+    """
+    Every value of one column in sorted order, for exact order statistics.
+    A large sorted base (a Polars Series) plus a small sorted list of values
+    appended since; the k-th value of the union is a binary search over
+    the pending list. Instances are immutable, so a snapshot can be shared.
+    """
+
+    def __init__(self, base: pl.Series, pending=()):
+        self.base = base
+        self.pending = list(pending)
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.pending)
+
+    def estimated_size(self) -> int:
+        """Approximate bytes held: the base Series plus the pending list and its (float) values."""
+        return (int(self.base.estimated_size()) + sys.getsizeof(self.pending)
+                + len(self.pending) * sys.getsizeof(0.0))
+
+    def merged(self, values: pl.Series) -> 'SortedRuns':
+        """Return a copy with the (sorted) values added."""
+        pending = list(merge(self.pending, values.to_list()))
+        if len(pending) > max(COMPACT_MIN, len(self.base) // COMPACT_RATIO):
+            return SortedRuns(self._concat(self.base, pl.Series(self.base.name, pending)))
+        return SortedRuns(self.base, pending)
+
+    def combined(self, other: 'SortedRuns') -> 'SortedRuns':
+        """Sorted runs holding both instances' values."""
+        pending = pl.Series(self.base.name, list(merge(self.pending, other.pending)))
+        return SortedRuns(self._concat(self._concat(self.base, other.base), pending))
+
+    def kth(self, k: int) -> float:
+        """The k-th smallest value (0-based)."""
+        base, pending = self.base, self.pending
+        # i = how many of the k + 1 smallest values come from pending
+        lo, hi = max(0, k + 1 - len(base)), min(k + 1, len(pending))
+        while lo < hi:
+            i = (lo + hi) // 2
+            j = k + 1 - i
+            if j > 0 and base[j - 1] > pending[i]:
+                lo = i + 1
+            else:
+                hi = i
+        i, j = lo, k + 1 - lo
+        candidates = []
+        if i > 0:
+            candidates.append(pending[i - 1])
+        if j > 0:
+            candidates.append(base[j - 1])
+        return max(candidates)
+
+    def median(self) -> Optional[float]:
+        """Median matching Polars' (mean of the middle pair for even counts)."""
+        n = len(self)
+        if n == 0:
+            return None
+        if n % 2:
+            return float(self.kth(n // 2))
+        return (self.kth(n // 2 - 1) + self.kth(n // 2)) / 2
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantile matching Polars' 'linear' interpolation."""
+        n = len(self)
+        if n == 0:
+            return None
+        position = q * (n - 1)
+        k = int(position)
+        low = self.kth(k)
+        if k + 1 >= n or position == k:
+            return float(low)
+        return low + (self.kth(k + 1) - low) * (position - k)
+
+    @staticmethod
+    def _concat(base: pl.Series, extra: pl.Series) -> pl.Series:
+        if len(extra) == 0:
+            return base
+        if len(base) == 0:
+            return extra
+        if extra.dtype != base.dtype:
+            # e.g. float values appended to an integer column
+            base, extra = base.cast(pl.Float64), extra.cast(pl.Float64)
+        return pl.concat([base, extra]).sort()
+
+
+class MetricAggregate:
+    """
+    count/sum/min/max of one metric, for one platform or overall, plus its
+    values as SortedRuns (exact quantiles) or a TDigest (approximate).
+    """
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'values')
+
+    def __init__(self, count: int, total, minimum, maximum, values):
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+        self.values = values
+
+    def estimated_size(self) -> int:
+        return self.values.estimated_size()
+
+    def merged(self, count: int, total, minimum, maximum, values: pl.Series) -> 'MetricAggregate':
+        if count == 0:
+            return self
+        return MetricAggregate(
+            self.count + count,
+            self.total + total,
+            minimum if self.minimum is None else min(self.minimum, minimum),
+            maximum if self.maximum is None else max(self.maximum, maximum),
+            self.values.merged(values)
+        )
+
+    def combined(self, other: 'MetricAggregate') -> 'MetricAggregate':
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        return MetricAggregate(
+            self.count + other.count,
+            self.total + other.total,
+            min(self.minimum, other.minimum),
+            max(self.maximum, other.maximum),
+            self.values.combined(other.values)
+        )
+
+    def stats(self) -> Optional[Dict]:
+        """mean/median/p90/p99/min/max, rounded as in DataAnalyzer summaries, or None with no values."""
+        if not self.count:
+            return None
+        stats = [('mean', self.total / self.count), ('median', self.values.median())]
+        stats.extend((name, self.values.quantile(q)) for name, q in QUANTILES.items())
+        stats.extend([('min', self.minimum), ('max', self.maximum)])
+        return {stat: float(round(value, 2)) for stat, value in stats}
+
+
+class IncrementalSummary:
+    """
+    Per-platform and overall aggregates that can absorb new rows.
+    Merging a delta costs time proportional to the delta (plus a binary
+    search per median), not to the full history. merged() returns a new
+    summary and leaves this one untouched.
+
+    With a sketch compression, quantiles come from t-digests instead of the
+    sorted values: approximate, but memory per platform is fixed and
+    summaries of separate chunks (or workers) combine into one.
+    """
+
+    def __init__(self, platform_col: str, metrics: Dict[str, str], platforms: Dict, overall: Dict,
+                 compression: Optional[int] = None):
+        self.platform_col = platform_col
+        self.metrics = metrics
+        self.platforms = platforms
+        self.overall = overall
+        self.compression = compression
+
+    @classmethod
+    def from_frame(cls, df: pl.DataFrame, platform_col: str, metrics: Dict[str, str],
+                   compression: Optional[int] = None) -> 'IncrementalSummary':
+        """
+        Build the aggregates for a full frame: one sort per metric, or with a
+        sketch compression, one pass over the frame in chunks.
+        """
+        if compression:
+            summary = cls(platform_col, metrics, {}, {
+                metric_name: MetricAggregate(0, 0, None, None, TDigest(compression))
+                for metric_name in metrics
+            }, compression)
+            for chunk in df.iter_slices(SKETCH_CHUNK_ROWS):
+                summary = summary.merged(chunk)
+            return summary
+
+        platforms = {}
+        for key, rows, aggregates in cls._aggregate(df, platform_col, metrics):
+            platforms[key] = (
+                rows,
+                {
+                    metric_name: MetricAggregate(count, total, minimum, maximum, SortedRuns(values))
+                    for metric_name, (count, total, minimum, maximum, values) in zip(metrics, aggregates)
+                }
+            )
+
+        overall = {}
+        for metric_name, col in metrics.items():
+            column = df[col].drop_nulls()
+            overall[metric_name] = MetricAggregate(
+                len(column), column.sum(), column.min(), column.max(), SortedRuns(column.sort())
+            )
+
+        return cls(platform_col, metrics, platforms, overall)
+
+    def merged(self, delta: pl.DataFrame) -> 'IncrementalSummary':
+        """Return the aggregates with the delta's rows added."""
+        platforms = dict(self.platforms)
+        # Sketches take values in any order; sorted runs need them sorted
+        for key, rows, aggregates in self._aggregate(delta, self.platform_col, self.metrics,
+                                                     sort=not self.compression):
+            old_rows, old_metrics = platforms.get(key) or self._empty_platform()
+            platforms[key] = (
+                old_rows + rows,
+                {
+                    metric_name: old_metrics[metric_name].merged(count, total, minimum, maximum, values)
+                    for metric_name, (count, total, minimum, maximum, values) in zip(self.metrics, aggregates)
+                }
+            )
+
+        overall = {}
+        for metric_name, col in self.metrics.items():
+            column = delta[col].drop_nulls()
+            overall[metric_name] = self.overall[metric_name].merged(
+                len(column), column.sum(), column.min(), column.max(),
+                column if self.compression else column.sort()
+            )
+
+        return IncrementalSummary(self.platform_col, self.metrics, platforms, overall, self.compression)
+
+    def combined(self, other: 'IncrementalSummary') -> 'IncrementalSummary':
+        """Aggregates of both summaries' rows, e.g. built from separate chunks or by separate workers."""
+        platforms = dict(self.platforms)
+        for key, (rows, metric_aggregates) in other.platforms.items():
+            old_rows, old_metrics = platforms.get(key) or self._empty_platform()
+            platforms[key] = (
+                old_rows + rows,
+                {
+                    metric_name: old_metrics[metric_name].combined(aggregate)
+                    for metric_name, aggregate in metric_aggregates.items()
+                }
+            )
+
+        overall = {
+            metric_name: aggregate.combined(other.overall[metric_name])
+            for metric_name, aggregate in self.overall.items()
+        }
+        return IncrementalSummary(self.platform_col, self.metrics, platforms, overall, self.compression)
+
+    def estimated_size(self) -> int:
+        """
+        Approximate bytes held by the aggregates. Without a sketch compression
+        every metric's values are kept sorted once per platform and once
+        overall, so this is about twice the metric columns' size.
+        """
+        aggregates = [*self.overall.values()]
+        for _, metric_aggregates in self.platforms.values():
+            aggregates.extend(metric_aggregates.values())
+        return sum(aggregate.estimated_size() for aggregate in aggregates)
+
+    def summary(self) -> Dict:
+        """Summary in the DataAnalyzer._generate_summary format."""
+        summary = {'by_platform': {}, 'overall': {}}
+        for key, (rows, metric_aggregates) in self.platforms.items():
+            platform_stats = {'count': rows}
+            platform_stats.update(
+                (metric_name, aggregate.stats()) for metric_name, aggregate in metric_aggregates.items()
+            )
+            summary['by_platform'][str(key)] = platform_stats
+
+        if self.metrics:
+            summary['overall'] = {
+                metric_name: aggregate.stats() for metric_name, aggregate in self.overall.items()
+            }
+        return summary
+
+    def _empty_platform(self):
+        """(rows, metric aggregates) for a platform not seen before."""
+        if self.compression:
+            return 0, {
+                metric_name: MetricAggregate(0, 0, None, None, TDigest(self.compression))
+                for metric_name in self.metrics
+            }
+        return 0, {
+            metric_name: MetricAggregate(0, 0, None, None, SortedRuns(pl.Series(
+                metric_name, [], dtype=self.overall[metric_name].values.base.dtype
+            )))
+            for metric_name in self.metrics
+        }
+
+    @staticmethod
+    def _aggregate(df: pl.DataFrame, platform_col: str, metrics: Dict[str, str], sort: bool = True):
+        """Yield (platform, rows, [(count, sum, min, max, values) per metric]) per platform."""
+        exprs = [pl.count().alias('__rows')]
+        for metric_name, col in metrics.items():
+            values = pl.col(col).drop_nulls()
+            exprs.extend([
+                values.len().alias(f'{metric_name}__count'),
+                values.sum().alias(f'{metric_name}__sum'),
+                values.min().alias(f'{metric_name}__min'),
+                values.max().alias(f'{metric_name}__max'),
+                (values.sort() if sort else values).alias(f'{metric_name}__values')
+            ])
+
+        grouped = df.group_by(platform_col).agg(exprs)
+        # Sorted values stay as Series; only the scalar aggregates go through Python
+        value_columns = [grouped[f'{metric_name}__values'] for metric_name in metrics]
+        scalars = grouped.drop([f'{metric_name}__values' for metric_name in metrics])
+
+        for i, row in enumerate(scalars.iter_rows(named=True)):
+            yield row[platform_col], int(row['__rows']), [
+                (
+                    int(row[f'{metric_name}__count']),
+                    row[f'{metric_name}__sum'],
+                    row[f'{metric_name}__min'],
+                    row[f'{metric_name}__max'],
+                    values[i]
+                )
+                for metric_name, values in zip(metrics, value_columns)
+            ]
@@ -1,5 +1,8 @@
 import re
 from typing import Dict, List, Set
+from trigger_matcher import AhoCorasick
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
 
 class InputProcessor:
     """
@@ -28,6 +31,41 @@ class InputProcessor:
             'superior', 'inferior', 'outperform', 'underperform',
             'vs', 'versus', 'compared to', 'than'
         ]
+        
+        self.stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been'}
+        
+        self._compile()
+    
+    def _compile(self):
+        """
+        Precompile the vocabularies so a claim is scanned once.
+        Substring checks share one automaton; whole-word checks are answered
+        from the claim's token set, with a regex only for multi-word phrases.
+        """
+        vocabularies = {
+            'metrics': [m.lower() for m in self.known_metrics],
+            'actions': self.action_words,
+            'comparisons': self.comparison_words
+        }
+        
+        substrings = []
+        self._substring_groups = {}
+        for group, words in vocabularies.items():
+            start = len(substrings)
+            substrings.extend(words)
+            self._substring_groups[group] = range(start, len(substrings))
+        self._substring_matcher = AhoCorasick(substrings)
+        
+        self._word_vocab = {}
+        for group in ('actions', 'comparisons'):
+            single_words = {}
+            phrases = []
+            for position, word in enumerate(vocabularies[group]):
+                if WORD_PATTERN.fullmatch(word):
+                    single_words.setdefault(word, position)
+                else:
+                    phrases.append((position, word, re.compile(r'\b' + re.escape(word) + r'\b')))
+            self._word_vocab[group] = (vocabularies[group], single_words, phrases)
     
     def process(self, claim_text: str) -> Dict:
         """
@@ -41,57 +79,46 @@ class InputProcessor:
         """
         claim_lower = claim_text.lower()
         
+        # Single tokenization and substring pass shared by every extractor
+        tokens = set(WORD_PATTERN.findall(claim_lower))
+        hits = self._substring_matcher.find(claim_lower)
+        
         result = {
             'original_claim': claim_text,
-            'metrics_found': self._extract_metrics(claim_lower),
-            'action_words_found': self._extract_action_words(claim_lower),
-            'comparison_words_found': self._extract_comparison_words(claim_lower),
-            'has_recommendation': self._has_recommendation(claim_lower),
-            'has_comparison': self._has_comparison(claim_lower),
-            'keywords': self._extract_all_keywords(claim_lower)
+            'metrics_found': self._extract_metrics(hits),
+            'action_words_found': self._extract_words('actions', claim_lower, tokens),
+            'comparison_words_found': self._extract_words('comparisons', claim_lower, tokens),
+            'has_recommendation': self._has_group(hits, 'actions'),
+            'has_comparison': self._has_group(hits, 'comparisons'),
+            'keywords': self._extract_all_keywords(tokens)
         }
         
         return result
     
-    def _extract_metrics(self, text: str) -> List[str]:
+    def _extract_metrics(self, hits: Set[int]) -> List[str]:
         """Extract marketing metrics mentioned in the text."""
-        found_metrics = []
-        for metric in self.known_metrics:
-            if metric.lower() in text:
-                found_metrics.append(metric)
+        offset = self._substring_groups['metrics'].start
+        found_metrics = [self.known_metrics[i - offset] for i in hits if i in self._substring_groups['metrics']]
         return list(set(found_metrics))  # Remove duplicates
     
-    def _extract_action_words(self, text: str) -> List[str]:
-        """Extract action/recommendation words."""
-        found_actions = []
-        for action in self.action_words:
-            if re.search(r'\b' + re.escape(action) + r'\b', text):
-                found_actions.append(action)
-        return found_actions
-    
-    def _extract_comparison_words(self, text: str) -> List[str]:
-        """Extract comparison indicators."""
-        found_comparisons = []
-        for comp in self.comparison_words:
-            if re.search(r'\b' + re.escape(comp) + r'\b', text):
-                found_comparisons.append(comp)
-        return found_comparisons
-    
-    def _has_recommendation(self, text: str) -> bool:
-        """Check if the claim contains a recommendation."""
-        return any(action in text for action in self.action_words)
+    def _extract_words(self, group: str, text: str, tokens: Set[str]) -> List[str]:
+        """Extract whole-word vocabulary matches, in vocabulary order."""
+        words, single_words, phrases = self._word_vocab[group]
+        positions = [single_words[token] for token in tokens if token in single_words]
+        for position, word, pattern in phrases:
+            if pattern.search(text):
+                positions.append(position)
+        return [words[position] for position in sorted(positions)]
     
-    def _has_comparison(self, text: str) -> bool:
-        """Check if the claim makes a comparison."""
-        return any(comp in text for comp in self.comparison_words)
+    def _has_group(self, hits: Set[int], group: str) -> bool:
+        """Check whether any word of a vocabulary group occurs as a substring."""
+        group_range = self._substring_groups[group]
+        return any(i in group_range for i in hits)
     
-    def _extract_all_keywords(self, text: str) -> Set[str]:
+    def _extract_all_keywords(self, tokens: Set[str]) -> Set[str]:
         """Extract all significant keywords for pattern matching."""
-        # Split into words and filter out common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been'}
-        words = re.findall(r'\b\w+\b', text)
-        keywords = {word for word in words if word not in stop_words and len(word) > 2}
-        return keywords
+        # Filter out common stop words
+        return {word for word in tokens if word not in self.stop_words and len(word) > 2}
 
 
 # Test function
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+# Set METRICS_ENABLED=0 to turn instrumentation off entirely
+ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+
+# Latency buckets in seconds, from regex-scale work up to large CSV loads
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+PREFIX = 'data_paradox'
+
+# Request methods counted under their own name; any other (client-supplied) method counts as 'other'
+REQUEST_METHODS = frozenset({'GET', 'POST', 'HEAD', 'OPTIONS'})
+
+
+def _escape(value) -> str:
+    """A label value escaped for the exposition format (backslash, double quote, newline)."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in Prometheus layout."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f'{name}_sum{{{labels}}} {total}')
+        lines.append(f'{name}_count{{{labels}}} {count}')
+        return lines
+
+
+class _StageTimer:
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry, stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe_stage(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class MetricsRegistry:
+    """
+    Per-process latency histograms for pipeline stages and requests,
+    plus request counters. Rendered in the Prometheus text format.
+    """
+
+    def __init__(self, enabled: bool = ENABLED):
+        self.enabled = enabled
+        self.stages = {}
+        self.requests = {}
+        self.request_latency = {}
+        self._lock = threading.Lock()
+
+    def timed(self, stage: str):
+        """Context manager recording the time spent in a pipeline stage."""
+        return _StageTimer(self, stage) if self.enabled else _NOOP
+
+    def observe_stage(self, stage: str, seconds: float):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, Histogram())
+        histogram.observe(seconds)
+
+    def observe_request(self, method: str, endpoint: str, status: int, seconds: float):
+        """Count a finished request and record its latency."""
+        if not self.enabled:
+            return
+
+        method = method.upper() if method.upper() in REQUEST_METHODS else 'other'
+        key = (method, endpoint, str(status))
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.request_latency.setdefault(endpoint, Histogram())
+        histogram.observe(seconds)
+
+    def render(self, gauges: Iterable[Tuple[str, str, Dict[str, str], float]] = ()) -> str:
+        """
+        Render everything recorded so far as Prometheus text.
+
+        Args:
+            gauges: (name, help, labels, value) point-in-time values collected by the caller
+
+        Returns:
+            Exposition text (format version 0.0.4)
+        """
+        lines = []
+
+        name = f'{PREFIX}_stage_seconds'
+        lines.append(f'# HELP {name} Time spent in each pipeline stage')
+        lines.append(f'# TYPE {name} histogram')
+        for stage, histogram in sorted(self.stages.items()):
+            lines.extend(histogram.lines(name, f'stage="{_escape(stage)}"'))
+
+        name = f'{PREFIX}_requests_total'
+        lines.append(f'# HELP {name} HTTP requests by endpoint and status')
+        lines.append(f'# TYPE {name} counter')
+        with self._lock:
+            requests = sorted(self.requests.items())
+            request_latency = sorted(self.request_latency.items())
+        for (method, endpoint, status), count in requests:
+            lines.append(
+                f'{name}{{method="{_escape(method)}",endpoint="{_escape(endpoint)}",'
+                f'status="{_escape(status)}"}} {count}'
+            )
+
+        name = f'{PREFIX}_request_seconds'
+        lines.append(f'# HELP {name} HTTP request latency by endpoint')
+        lines.append(f'# TYPE {name} histogram')
+        for endpoint, histogram in request_latency:
+            lines.extend(histogram.lines(name, f'endpoint="{_escape(endpoint)}"'))
+
+        # Samples of one metric must be contiguous, so group gauges by name
+        families = {}
+        for gauge_name, help_text, labels, value in gauges:
+            families.setdefault(gauge_name, (help_text, []))[1].append((labels, value))
+
+        for gauge_name, (help_text, samples) in families.items():
+            name = f'{PREFIX}_{gauge_name}'
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Shared by the agent modules and the Flask app
+registry = MetricsRegistry()
+timed = registry.timed
@@ -0,0 +1,122 @@
+import math
+from typing import Optional
+
+import polars as pl
+
+# Sketches are built with NumPy; without it summaries stay exact
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Roughly compression / 2 centroids per digest. Rank error near the median is
+# about 1 / compression and much smaller towards the tails (p99)
+DEFAULT_COMPRESSION = 200
+
+
+def available() -> bool:
+    return np is not None
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (a merging t-digest). Values are summarised as
+    weighted centroids, small near the tails and larger around the median, so
+    memory is fixed by the compression however many values are added.
+    Compression is vectorized: points are sorted and bucketed on the t-digest
+    scale function rather than merged one at a time. Instances are
+    immutable, like SortedRuns, which they can stand in for.
+    """
+
+    __slots__ = ('compression', 'means', 'weights', 'minimum', 'maximum')
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION, means=None, weights=None,
+                 minimum: Optional[float] = None, maximum: Optional[float] = None):
+        self.compression = compression
+        self.means = np.empty(0) if means is None else means
+        self.weights = np.empty(0) if weights is None else weights
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __len__(self) -> int:
+        return int(self.weights.sum())
+
+    def estimated_size(self) -> int:
+        """Approximate bytes held by the centroids."""
+        return int(self.means.nbytes + self.weights.nbytes)
+
+    @classmethod
+    def from_values(cls, values: pl.Series, compression: int = DEFAULT_COMPRESSION) -> 'TDigest':
+        """Digest of a null-free Series, in any order."""
+        return cls(compression).merged(values)
+
+    def merged(self, values: pl.Series) -> 'TDigest':
+        """Return a copy with the values (null-free, any order) added."""
+        if len(values) == 0:
+            return self
+        points = np.sort(values.cast(pl.Float64).to_numpy())
+        n = len(points)
+
+        # Single points have known ranks, so bucket boundaries come from inverting
+        # the scale function (see _compressed) rather than evaluating it per point
+        half_range = self.compression / 4
+        k = np.arange(math.ceil(-half_range), math.floor(half_range) + 1)
+        q = (np.sin(2 * math.pi * k / self.compression) + 1) / 2
+        starts = np.unique(np.clip(np.ceil(q * n - 0.5), 0, n - 1).astype(np.int64))
+        starts[0] = 0
+
+        weights = np.diff(np.append(starts, n)).astype(np.float64)
+        batch = TDigest(
+            self.compression, np.add.reduceat(points, starts) / weights, weights,
+            float(points[0]), float(points[-1])
+        )
+        return self.combined(batch) if len(self.weights) else batch
+
+    def combined(self, other: 'TDigest') -> 'TDigest':
+        """Digest of both digests' values (e.g. from different chunks or workers)."""
+        if len(other.weights) == 0:
+            return self
+        if len(self.weights) == 0:
+            return other
+        return self._compressed(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+            other.minimum, other.maximum
+        )
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate q-quantile. Centroids are taken to sit at the middle of the
+        (0-based) ranks they cover, with linear interpolation between them and
+        out to the exact minimum and maximum; while every centroid is a single
+        value this is exactly Polars' 'linear' quantile.
+        """
+        if len(self.weights) == 0:
+            return None
+        total = self.weights.sum()
+        centres = np.cumsum(self.weights) - self.weights / 2 - 0.5
+        ranks = np.concatenate([[0.0], centres, [total - 1]])
+        values = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        return float(np.interp(q * (total - 1), ranks, values))
+
+    def median(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+    def _compressed(self, means, weights, minimum: float, maximum: float) -> 'TDigest':
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        # Bucket centroids by the scale function k(q) = compression / (2 pi) * asin(2q - 1)
+        # at the middle of their rank range; each bucket spans at most one unit of k
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.concatenate([[True], k[1:] != k[:-1]]))
+
+        bucket_weights = np.add.reduceat(weights, starts)
+        bucket_means = np.add.reduceat(means * weights, starts) / bucket_weights
+        return TDigest(
+            self.compression, bucket_means, bucket_weights,
+            minimum if self.minimum is None else min(self.minimum, minimum),
+            maximum if self.maximum is None else max(self.maximum, maximum)
+        )
@@ -0,0 +1,109 @@
+from typing import Dict, Tuple
+
+NO_ISSUES_MESSAGE = 'No obvious fallacies detected. However, always validate with data!'
+
+
+class FallacyText:
+    """
+    Display text of one fallacy, as shown in challenge responses.
+    Built once per compiled fallacy database (see FallacySnapshot) and shared
+    by every result that mentions the fallacy. The question lists are already
+    cut to the lengths responses show, as tuples, so results hand them out
+    without copying.
+    """
+
+    __slots__ = ('fallacy_id', 'name', 'description', 'challenges', 'constructive_questions',
+                 'direct_challenges', 'missing_data', 'alternative_explanations')
+
+    def __init__(self, fallacy_id: str, fallacy: Dict):
+        challenges = fallacy['challenges']
+        self.fallacy_id = fallacy_id
+        self.name = fallacy['name']
+        self.description = fallacy['description']
+        self.challenges = challenges
+        self.constructive_questions = tuple(challenges['constructive'][:3])
+        self.direct_challenges = tuple(challenges['direct'][:3])
+        self.missing_data = tuple(challenges['missing_data'])
+        self.alternative_explanations = tuple(challenges['alternatives'][:2])
+
+
+class Detection:
+    """One fallacy detected in a claim: its shared text plus this claim's score."""
+
+    __slots__ = ('text', 'match_score', 'confidence')
+
+    def __init__(self, text: FallacyText, match_score: int, confidence: str):
+        self.text = text
+        self.match_score = match_score
+        self.confidence = confidence
+
+    @property
+    def fallacy_id(self) -> str:
+        return self.text.fallacy_id
+
+    @property
+    def fallacy_name(self) -> str:
+        return self.text.name
+
+    @property
+    def description(self) -> str:
+        return self.text.description
+
+    def to_dict(self) -> Dict:
+        return {
+            'fallacy_id': self.text.fallacy_id,
+            'fallacy_name': self.text.name,
+            'description': self.text.description,
+            'confidence': self.confidence,
+            'match_score': self.match_score,
+            'challenges': self.text.challenges
+        }
+
+    def section(self) -> Dict:
+        """This detection as one entry of a response's 'challenges' list."""
+        text = self.text
+        return {
+            'fallacy_name': text.name,
+            'confidence': self.confidence,
+            'description': text.description,
+            'constructive_questions': text.constructive_questions,
+            'direct_challenges': text.direct_challenges,
+            'missing_data': text.missing_data,
+            'alternative_explanations': text.alternative_explanations
+        }
+
+
+class ChallengeResponse:
+    """
+    Challenge response for one claim: the top detections and how many
+    fallacies were detected in all. Immutable, so cached responses are
+    shared between requests; to_dict() builds the JSON shape only when the
+    response is written out.
+    """
+
+    __slots__ = ('claim', 'fallacies_detected', 'top')
+
+    def __init__(self, claim: str, fallacies_detected: int, top: Tuple[Detection, ...]):
+        self.claim = claim
+        self.fallacies_detected = fallacies_detected
+        self.top = top
+
+    @property
+    def status(self) -> str:
+        return 'challenges_found' if self.top else 'no_issues'
+
+    def for_claim(self, claim: str) -> 'ChallengeResponse':
+        """The same results, echoing another caller's spelling of the claim."""
+        if claim == self.claim:
+            return self
+        return ChallengeResponse(claim, self.fallacies_detected, self.top)
+
+    def to_dict(self) -> Dict:
+        if not self.top:
+            return {'status': 'no_issues', 'message': NO_ISSUES_MESSAGE}
+        return {
+            'status': 'challenges_found',
+            'claim': self.claim,
+            'fallacies_detected': self.fallacies_detected,
+            'challenges': [detection.section() for detection in self.top]
+        }
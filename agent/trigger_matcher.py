@@ -0,0 +1,257 @@
+import itertools
+import operator
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher.
+    Finds every pattern occurring in a text in a single pass over the text,
+    regardless of how many patterns were compiled in.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            self._add(pattern, pattern_id)
+        self._build_failure_links()
+
+    def to_dict(self) -> Dict:
+        """
+        The compiled automaton as plain lists and dicts, e.g. to save with
+        marshal (see from_dict). Nodes are numbered breadth-first, so every failure
+        link points to a lower-numbered node.
+        """
+        order = [0]
+        for node in order:
+            order.extend(self._goto[node].values())
+        number = {node: position for position, node in enumerate(order)}
+        return {
+            'patterns': self.patterns,
+            'goto': [{char: number[child] for char, child in self._goto[node].items()} for node in order],
+            'fail': [number[self._fail[node]] for node in order],
+            'output': [self._output[node] for node in order]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AhoCorasick':
+        """
+        Rebuild a matcher from to_dict() output without compiling the patterns again.
+        Nodes must be numbered as to_dict() numbers them, every index is
+        checked, and failure links must point to lower-numbered nodes, so
+        find() on the result can neither fail nor loop.
+
+        Raises:
+            ValueError: if the data does not describe such an automaton
+        """
+        matcher = cls.__new__(cls)
+        try:
+            matcher.patterns = list(data['patterns'])
+            matcher._goto = list(data['goto'])
+            matcher._fail = list(data['fail'])
+            matcher._output = list(data['output'])
+            nodes = len(matcher._goto)
+            # Numbered breadth-first, the children listed node by node are exactly 1, 2, 3, ...
+            children = list(itertools.chain.from_iterable(map(dict.values, matcher._goto)))
+            valid = (
+                nodes > 0 and len(matcher._fail) == nodes and len(matcher._output) == nodes
+                and set(map(type, matcher.patterns)) <= {str}
+                and set(map(type, matcher._goto)) == {dict}
+                and children == list(range(1, nodes)) and set(map(type, children)) <= {int}
+                and _positions(matcher._fail, nodes) and matcher._fail[0] == 0
+                and all(map(operator.lt, matcher._fail[1:], range(1, nodes)))
+                and _positions(itertools.chain.from_iterable(matcher._output), len(matcher.patterns))
+            )
+        except (KeyError, TypeError, OverflowError):
+            valid = False
+        if not valid:
+            raise ValueError('not a compiled AhoCorasick matcher')
+        return matcher
+
+    def _add(self, pattern: str, pattern_id: int):
+        """Insert a pattern into the trie."""
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(pattern_id)
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each node to its longest proper suffix."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child].extend(self._output[self._fail[child]])
+
+    def find(self, text: str) -> Set[int]:
+        """Return the ids of all patterns that occur in the text."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        # The root only carries empty patterns, which match any text
+        found = set(output[0])
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+class TriggerIndex:
+    """
+    Compiled form of the fallacy trigger database.
+    Built once from fallacies.json so every claim is scored against all
+    fallacies at once instead of fallacy by fallacy.
+    """
+
+    def __init__(self, fallacies: Dict):
+        self.fallacy_ids = list(fallacies.keys())
+        self.keyword_index: Dict[str, List[int]] = {}
+        self.metric_index: Dict[str, List[int]] = {}
+        self.any_metric: List[int] = []
+        self.reallocate_bonus: List[int] = []
+        pattern_ids: Dict[str, int] = {}
+        self.pattern_owners: List[List[int]] = []
+
+        for idx, fallacy_data in enumerate(fallacies.values()):
+            triggers = fallacy_data['triggers']
+
+            for keyword in {word.lower() for word in triggers.get('keywords', [])}:
+                self.keyword_index.setdefault(keyword, []).append(idx)
+
+            metrics = {m.lower() for m in triggers.get('metrics', [])}
+            if 'any metric' in metrics:
+                self.any_metric.append(idx)
+            else:
+                for metric in metrics:
+                    self.metric_index.setdefault(metric, []).append(idx)
+
+            # Duplicate patterns each count, same as scanning the list
+            for pattern in triggers.get('patterns', []):
+                pattern = pattern.lower()
+                if pattern not in pattern_ids:
+                    pattern_ids[pattern] = len(self.pattern_owners)
+                    self.pattern_owners.append([])
+                self.pattern_owners[pattern_ids[pattern]].append(idx)
+
+            if 'reallocate' in triggers.get('keywords', []):
+                self.reallocate_bonus.append(idx)
+
+        self.pattern_matcher = AhoCorasick(pattern_ids.keys())
+
+    def to_dict(self) -> Dict:
+        """The compiled index as plain lists and dicts, e.g. to save with marshal (see from_dict)."""
+        return {
+            'fallacy_ids': self.fallacy_ids,
+            'keyword_index': self.keyword_index,
+            'metric_index': self.metric_index,
+            'any_metric': self.any_metric,
+            'reallocate_bonus': self.reallocate_bonus,
+            'pattern_owners': self.pattern_owners,
+            'pattern_matcher': self.pattern_matcher.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TriggerIndex':
+        """
+        Rebuild an index from to_dict() output without compiling the triggers again.
+
+        Raises:
+            ValueError: if the data does not describe a well-formed index
+        """
+        index = cls.__new__(cls)
+        try:
+            index.fallacy_ids = list(data['fallacy_ids'])
+            index.keyword_index = dict(data['keyword_index'])
+            index.metric_index = dict(data['metric_index'])
+            index.any_metric = list(data['any_metric'])
+            index.reallocate_bonus = list(data['reallocate_bonus'])
+            index.pattern_owners = list(data['pattern_owners'])
+            index.pattern_matcher = AhoCorasick.from_dict(data['pattern_matcher'])
+            owner_lists = [
+                *index.keyword_index.values(), *index.metric_index.values(),
+                index.any_metric, index.reallocate_bonus, *index.pattern_owners
+            ]
+            valid = (
+                set(map(type, index.fallacy_ids)) <= {str}
+                and set(map(type, itertools.chain(index.keyword_index, index.metric_index))) <= {str}
+                and set(map(type, owner_lists)) <= {list}
+                and _positions(itertools.chain.from_iterable(owner_lists), len(index.fallacy_ids))
+                and len(index.pattern_owners) == len(index.pattern_matcher.patterns)
+            )
+        except (KeyError, TypeError, OverflowError):
+            valid = False
+        if not valid:
+            raise ValueError('not a compiled TriggerIndex')
+        return index
+
+    def score(self, processed: Dict) -> List[int]:
+        """
+        Score a processed claim against every fallacy.
+
+        Args:
+            processed: Output of InputProcessor.process
+
+        Returns:
+            Match scores, in the same order as fallacy_ids
+        """
+        scores = [0] * len(self.fallacy_ids)
+
+        # Keywords worth 3 points each
+        for keyword in processed['keywords']:
+            for idx in self.keyword_index.get(keyword, ()):
+                scores[idx] += 3
+
+        # Metrics worth 5 points each
+        metrics = [m.lower() for m in processed['metrics_found']]
+        for metric in metrics:
+            for idx in self.metric_index.get(metric, ()):
+                scores[idx] += 5
+        if metrics:
+            for idx in self.any_metric:
+                scores[idx] += 5 * len(metrics)
+
+        # Patterns worth 2 points each
+        claim_text_lower = processed['original_claim'].lower()
+        for pattern_id in self.pattern_matcher.find(claim_text_lower):
+            for idx in self.pattern_owners[pattern_id]:
+                scores[idx] += 2
+
+        # Bonus for action words (indicates recommendation)
+        if processed['has_recommendation']:
+            for idx in self.reallocate_bonus:
+                scores[idx] += 3
+
+        return scores
+
+
+def _positions(values: Iterable, limit: int) -> bool:
+    """
+    Whether every value is an int in range(limit).
+
+    Raises:
+        TypeError: if a value is not an int (array() checks them in C)
+    """
+    values = array('q', values)
+    return not values or (min(values) >= 0 and max(values) < limit)
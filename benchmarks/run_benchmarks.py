@@ -0,0 +1,380 @@
+"""
+Benchmarks for the detection, comparison, upload, append, persistence and
+validation hot paths, and for app startup.
+
+Every corpus and dataset is generated from fixed seeds, so two runs on the
+same machine time exactly the same work. Results are written as JSON; pass
+a previous results file as --baseline to flag regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --rows 2000 100000 1000000 10000000
+    python benchmarks/run_benchmarks.py --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'agent'))
+sys.path.insert(0, str(ROOT))
+
+# Uploads are timed through the app's own sanitizer, so lift its size limit
+# (every benchmark size must fit) and keep rate-limit counters in memory
+os.environ.setdefault('MAX_UPLOAD_MB', str(1 << 20))
+os.environ.setdefault('RATELIMIT_STORAGE_URI', 'memory://')
+
+import polars as pl
+
+import bootstrap
+import quantile_sketch
+from challenge_generator import ChallengeGenerator
+from app import SUMMARY_SKETCH_COMPRESSION, sanitize_csv_stream
+from data_analyzer import DataAnalyzer
+from dataset_store import DatasetStore
+from fallacy_config import FallacyConfig
+from fallacy_detector import FallacyDetector
+from incremental_summary import IncrementalSummary
+from input_processor import InputProcessor
+
+SEED = 20240601
+SAMPLE_CSV = ROOT / 'digital_marketing_test_data.csv'
+DEFAULT_ROWS = [2000, 100000, 1000000]
+
+# Rows per appended delta, e.g. one day of new data
+APPEND_ROWS = 1000
+
+FILLER_WORDS = [
+    'the', 'our', 'team', 'campaign', 'last', 'quarter', 'results', 'show', 'that',
+    'we', 'saw', 'across', 'all', 'markets', 'this', 'month', 'compared', 'with',
+    'previous', 'period', 'and', 'customers', 'segment', 'audience', 'creative'
+]
+
+# Claim lengths (words) and the share of words drawn from the fallacy vocabulary
+CORPORA = {
+    'short_plain': (12, 0.1),
+    'short_dense': (12, 0.6),
+    'medium_mixed': (60, 0.3),
+    'long_mixed': (300, 0.3)
+}
+CLAIMS_PER_CORPUS = 500
+
+# First request served by a freshly started app, i.e. time to first response
+# for a new worker: /health alone, and a first analysis (loads the detector)
+STARTUP_REQUESTS = {
+    'health': "client.get('/health')",
+    'analyze': "client.post('/api/analyze', json={'claim': 'We should reallocate budget to high ROAS campaigns'})"
+}
+
+
+def fallacy_vocabulary():
+    """Trigger keywords, metrics and patterns from the fallacy database."""
+    with open(ROOT / 'config' / 'fallacies.json', 'r') as f:
+        fallacies = json.load(f)
+
+    vocab = set()
+    for fallacy in fallacies.values():
+        for group in ('keywords', 'metrics', 'patterns'):
+            vocab.update(fallacy['triggers'].get(group, []))
+    return sorted(vocab)
+
+
+def build_corpus(rng, vocab, length, trigger_share, count=CLAIMS_PER_CORPUS):
+    claims = []
+    for _ in range(count):
+        words = []
+        for _ in range(length):
+            if rng.random() < trigger_share:
+                words.append(rng.choice(vocab))
+            elif rng.random() < 0.05:
+                words.append(f'{rng.randint(1, 99)}%')
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+        claims.append(' '.join(words))
+    return claims
+
+
+def write_scaled_csv(rows, directory):
+    """Resample the sample dataset (with replacement, seeded) up to the requested row count."""
+    path = os.path.join(directory, f'scaled_{rows}.csv')
+    base = pl.read_csv(SAMPLE_CSV)
+    base.sample(n=rows, with_replacement=True, seed=SEED).write_csv(path)
+    return path
+
+
+def write_delta_csv(rows, directory):
+    """Rows resampled from the sample dataset, dated the day after it ends, as a daily append."""
+    path = os.path.join(directory, f'delta_{rows}.csv')
+    base = pl.read_csv(SAMPLE_CSV)
+    next_day = base['Date'].str.to_date().max() + datetime.timedelta(days=1)
+    base.sample(n=rows, with_replacement=True, seed=SEED).with_columns(
+        pl.lit(next_day.isoformat()).alias('Date')
+    ).write_csv(path)
+    return path
+
+
+def upload(path, directory):
+    """Load a CSV file as app.upload_csv does: sanitized while copied to disk, then parsed from the copy."""
+    with open(path, 'rb') as source, tempfile.NamedTemporaryFile(suffix='.csv', dir=directory) as tmp:
+        sanitize_csv_stream(source, tmp)
+        tmp.flush()
+        analyzer = DataAnalyzer(sketch_compression=SUMMARY_SKETCH_COMPRESSION)
+        analyzer.load_csv_path(tmp.name)
+    return analyzer
+
+
+def validation_claims(rng, analyzer, count=200):
+    """Claims quoting platform statistics, some exact and some off by a margin."""
+    platforms = [p for p in analyzer.summary_stats['by_platform']] or ['All']
+    metrics = list(analyzer.metric_cols)
+    claims = []
+    for _ in range(count):
+        metric = rng.choice(metrics)
+        platform_name = rng.choice(platforms)
+        stats = analyzer.summary_stats['by_platform'].get(platform_name, {}).get(metric, {})
+        value = stats.get('mean', 1.0) + rng.choice([0, 0, 0.3, 2.5, -4.0])
+        claims.append(f'{platform_name} has an average {metric} of {value:.2f} this month')
+    return claims
+
+
+def time_calls(func, inputs, repeats):
+    """Time func over every input, repeats times. Reports per-call microseconds."""
+    totals = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        totals.append(time.perf_counter() - start)
+
+    per_call = [t / len(inputs) * 1e6 for t in totals]
+    return {
+        'calls': len(inputs),
+        'repeats': repeats,
+        'median_us': round(statistics.median(per_call), 3),
+        'min_us': round(min(per_call), 3),
+        'max_us': round(max(per_call), 3)
+    }
+
+
+def time_once(func, repeats):
+    """Time a single expensive call. Reports seconds."""
+    totals = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        totals.append(time.perf_counter() - start)
+    return {
+        'repeats': repeats,
+        'median_s': round(statistics.median(totals), 6),
+        'min_s': round(min(totals), 6),
+        'max_s': round(max(totals), 6)
+    }
+
+
+def bench_text(results, repeats):
+    rng = random.Random(SEED)
+    vocab = fallacy_vocabulary()
+    corpora = {
+        name: build_corpus(rng, vocab, length, share)
+        for name, (length, share) in CORPORA.items()
+    }
+
+    processor = InputProcessor()
+    detector = FallacyDetector()
+    # No result cache, so comparisons time the full detection path
+    generator = ChallengeGenerator(cache_size=0)
+
+    for name, claims in corpora.items():
+        results[f'input_processor.process/{name}'] = time_calls(processor.process, claims, repeats)
+        results[f'fallacy_detector.detect/{name}'] = time_calls(detector.detect, claims, repeats)
+        pairs = list(zip(claims[::2], claims[1::2]))
+        results[f'challenge_generator.compare_claims/{name}'] = time_calls(
+            lambda pair: generator.compare_claims(*pair), pairs, repeats
+        )
+
+    # Cold start of the fallacy database: compiling fallacies.json, and
+    # loading the precompiled snapshot (an unwritable path forces compiling)
+    with tempfile.TemporaryDirectory() as workdir:
+        compiled_path = os.path.join(workdir, 'fallacies.json.compiled')
+        FallacyConfig(snapshot_path=compiled_path)
+        missing_path = os.path.join(workdir, 'missing', 'fallacies.json.compiled')
+        results['fallacy_config.load/source'] = time_calls(
+            lambda _: FallacyConfig(snapshot_path=missing_path), range(100), repeats
+        )
+        results['fallacy_config.load/compiled'] = time_calls(
+            lambda _: FallacyConfig(snapshot_path=compiled_path), range(100), repeats
+        )
+
+
+def bench_startup(results, repeats):
+    """Interpreter start + app import + one request, in a fresh process each time."""
+    env = dict(os.environ, RATELIMIT_STORAGE_URI='memory://')
+    for name, request in STARTUP_REQUESTS.items():
+        script = f"import app\nclient = app.app.test_client()\nassert {request}.status_code == 200\n"
+        results[f'app.startup/{name}'] = time_once(
+            lambda: subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, check=True), repeats
+        )
+
+
+def bench_data(results, rows_list, repeats, workdir):
+    rng = random.Random(SEED)
+    store = DatasetStore(os.path.join(workdir, 'datasets'))
+    delta_path = write_delta_csv(APPEND_ROWS, workdir)
+
+    for rows in rows_list:
+        path = write_scaled_csv(rows, workdir)
+        size = os.path.getsize(path)
+
+        results[f'app.upload/{rows}'] = time_once(lambda: upload(path, workdir), repeats)
+        results[f'app.upload/{rows}']['file_bytes'] = size
+        results[f'data_analyzer.load_csv_path/{rows}'] = time_once(
+            lambda: DataAnalyzer().load_csv_path(path), repeats
+        )
+        results[f'data_analyzer.load_csv_path/{rows}']['file_bytes'] = size
+        bench_persistence(results, rows, repeats, upload(path, workdir), store, delta_path)
+
+        analyzer = DataAnalyzer()
+        analyzer.load_csv_path(path)
+        claims = validation_claims(rng, analyzer)
+
+        # Exact medians and percentiles against mergeable t-digest sketches
+        results[f'data_analyzer.generate_summary/{rows}'] = time_once(analyzer._generate_summary, repeats)
+        if quantile_sketch.available():
+            results[f'incremental_summary.sketch/{rows}'] = time_once(
+                lambda: IncrementalSummary.from_frame(
+                    analyzer.df, analyzer.platform_col, analyzer.metric_cols, quantile_sketch.DEFAULT_COMPRESSION
+                ),
+                repeats
+            )
+
+        # Built lazily by the first validate_claim; later calls reuse it
+        results[f'data_analyzer.build_validation_index/{rows}'] = time_once(
+            analyzer._build_validation_index, repeats
+        )
+        if bootstrap.available():
+            results[f'bootstrap.mean_intervals/{rows}'] = time_once(
+                lambda: bootstrap.mean_intervals(analyzer.df, analyzer.platform_col, analyzer.metric_cols),
+                repeats
+            )
+            # Computed in the background after each load or append; keep it out of the per-claim times
+            analyzer.precompute_intervals()
+        results[f'data_analyzer.validate_claim/{rows}'] = time_calls(
+            analyzer.validate_claim, claims, repeats
+        )
+        os.remove(path)
+
+
+def bench_persistence(results, rows, repeats, uploaded, store, delta_path):
+    """Saving an upload, and appending a delta to it, as the upload and append endpoints do."""
+    dataset_id = f'bench_{rows}'
+    results[f'dataset_store.save/{rows}'] = time_once(
+        lambda: store.save(dataset_id, uploaded.clone()), repeats
+    )
+
+    # The first append to an exact-summary dataset builds its mergeable aggregates;
+    # later appends (and every append in sketch mode) cost only the delta
+    results[f'data_analyzer.append_csv_path/first/{rows}'] = time_once(
+        lambda: uploaded.clone().append_csv_path(delta_path), repeats
+    )
+    saved = uploaded.clone()
+    store.save(dataset_id, saved)
+    saved.append_csv_path(delta_path)
+    store.save(dataset_id, saved)
+
+    def append_and_save():
+        appended = saved.clone()
+        appended.append_csv_path(delta_path)
+        store.save(dataset_id, appended)
+
+    # Saving after an append writes only the new rows as a part file
+    results[f'data_analyzer.append_csv_path/{rows}'] = time_once(
+        lambda: saved.clone().append_csv_path(delta_path), repeats
+    )
+    results[f'app.append/{rows}'] = time_once(append_and_save, repeats)
+    store.remove(dataset_id)
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Benchmarks that got slower than the baseline by more than tolerance.
+    Compares best-of-repeats times, which are far less noisy than medians.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        key = 'min_us' if 'min_us' in current else 'min_s'
+        if key in previous and current[key] > previous[key] * (1 + tolerance):
+            regressions.append({
+                'benchmark': name,
+                'baseline': previous[key],
+                'current': current[key],
+                'unit': key.split('_')[1]
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Data Paradox Agent hot paths')
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to write results')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS,
+                        help='Dataset sizes for upload/validation benchmarks')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--skip-data', action='store_true', help='Only run the text benchmarks')
+    parser.add_argument('--baseline', help='Previous results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed slowdown over baseline before failing (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = {}
+    bench_text(results, args.repeats)
+    bench_startup(results, args.repeats)
+    if not args.skip_data:
+        with tempfile.TemporaryDirectory() as workdir:
+            bench_data(results, args.rows, args.repeats, workdir)
+
+    report = {
+        'meta': {
+            'seed': SEED,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'polars': pl.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count()
+        },
+        'results': results
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            report['regressions'] = compare_to_baseline(results, json.load(f), args.tolerance)
+        exit_code = 1 if report['regressions'] else 0
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        if 'median_us' in result:
+            print(f"{name:<55} {result['median_us']:>12.1f} us/call")
+        else:
+            print(f"{name:<55} {result['median_s']:>12.4f} s")
+    for regression in report.get('regressions', []):
+        print(f"REGRESSION {regression['benchmark']}: "
+              f"{regression['baseline']} -> {regression['current']} {regression['unit']}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
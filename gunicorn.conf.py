@@ -0,0 +1,19 @@
+import os
+
+# Threaded workers: a slow upload or long analysis occupies one thread, not a whole worker.
+# Async views (analyze/compare) hand CPU work to the app's analysis executor.
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 120
+
+# PRELOAD=1 imports the app once in the master instead of in every worker. The
+# heavy subsystems (Polars, the compiled fallacy database) are then loaded before
+# forking and shared copy-on-write; without it each worker loads them on first use.
+preload_app = os.environ.get('PRELOAD', '0') == '1'
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        import app
+        app.preload()
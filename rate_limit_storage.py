@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from math import floor
+from urllib.parse import urlparse
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+# Expired counters are purged after this many increments
+PURGE_EVERY = 1000
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Rate limit storage in a local SQLite file.
+    All gunicorn workers on a host share one set of counters, so each client
+    gets the configured budget once rather than once per worker. Every check
+    is a primary-key lookup, and expired counters are purged periodically.
+
+    Registered for ``sqlite:///relative/path.db`` and ``sqlite:////absolute/path.db``
+    URIs; swap the URI for ``redis://...`` to move to shared Redis storage.
+    Implements the limits 5 storage interface (``incr`` without ``elastic_expiry``).
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri: str = None, wrap_exceptions: bool = False, **options):
+        path = urlparse(uri).path[1:] if uri else ''
+        self.path = path or os.path.join(tempfile.gettempdir(), 'data-paradox-ratelimit.db')
+        self._local = threading.local()
+        self._increments = 0
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS counters ('
+                'key TEXT PRIMARY KEY, count INTEGER NOT NULL, expiry REAL NOT NULL)'
+            )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        One connection per thread and process; WAL lets workers read while
+        another writes. Connections inherited across fork are never reused.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _incr(self, conn: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        """Increment a counter, restarting it if it has expired."""
+        row = conn.execute(
+            'INSERT INTO counters (key, count, expiry) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            'count = CASE WHEN counters.expiry <= ? THEN excluded.count ELSE counters.count + excluded.count END, '
+            'expiry = CASE WHEN counters.expiry <= ? THEN excluded.expiry ELSE counters.expiry END '
+            'RETURNING count',
+            (key, amount, now + expiry, now, now)
+        ).fetchone()
+
+        self._increments += 1
+        if self._increments % PURGE_EVERY == 0:
+            conn.execute('DELETE FROM counters WHERE expiry <= ?', (now,))
+        return row[0]
+
+    def _get(self, conn: sqlite3.Connection, key: str, now: float) -> int:
+        row = conn.execute(
+            'SELECT count FROM counters WHERE key = ? AND expiry > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._incr(self._connection(), key, expiry, amount, time.time())
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        conn = self._connection()
+        now = time.time()
+        conn.execute(
+            'UPDATE counters SET count = MAX(count - ?, 0) WHERE key = ? AND expiry > ?',
+            (amount, key, now)
+        )
+        return self._get(conn, key, now)
+
+    def get(self, key: str) -> int:
+        return self._get(self._connection(), key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._connection().execute(
+            'SELECT expiry FROM counters WHERE key = ? AND expiry > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def clear(self, key: str) -> None:
+        self._connection().execute('DELETE FROM counters WHERE key = ?', (key,))
+
+    def reset(self) -> int:
+        return self._connection().execute('DELETE FROM counters').rowcount
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        conn = self._connection()
+        # IMMEDIATE takes the write lock up front, so check-and-increment is atomic across workers
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+                conn, previous_key, current_key, expiry, now
+            )
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            acquired = floor(weighted_count) + amount <= limit
+            if acquired:
+                # The current window's counter must outlive the next window
+                self._incr(conn, current_key, 2 * expiry, amount, now)
+            conn.execute('COMMIT')
+            return acquired
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _sliding_window_info(self, conn, previous_key: str, current_key: str, expiry: int, now: float):
+        previous_count = self._get(conn, previous_key, now)
+        current_count = self._get(conn, current_key, now)
+        if previous_count == 0:
+            previous_ttl = 0.0
+        else:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def get_sliding_window(self, key: str, expiry: int):
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window_info(self._connection(), previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+from pathlib import Path
+
+from flask import Response
+
+# Brotli is optional; without it only gzip variants are built
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIMETYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8'
+}
+
+
+class StaticBundle:
+    """
+    Prebuilt single-page UI.
+    Stylesheet and script get content-hashed names so they can be cached
+    forever; the page itself is revalidated with its ETag. Every asset is
+    compressed once at startup and served from memory.
+    """
+
+    def __init__(self, source_dir: str, url_prefix: str = '/ui/',
+                 hashed_assets=('app.css', 'app.js'), page: str = 'index.html'):
+        self.assets = {}
+        source = Path(source_dir)
+        page_text = (source / page).read_text(encoding='utf-8')
+
+        for filename in hashed_assets:
+            content = (source / filename).read_bytes()
+            stem, suffix = filename.rsplit('.', 1)
+            hashed_name = f'{stem}.{hashlib.sha256(content).hexdigest()[:12]}.{suffix}'
+            self._add(hashed_name, content, 'public, max-age=31536000, immutable')
+            page_text = page_text.replace('{{ ' + filename + ' }}', url_prefix + hashed_name)
+
+        self._add(page, page_text.encode('utf-8'), 'no-cache')
+
+    def _add(self, name: str, content: bytes, cache_control: str):
+        """Precompute the ETag and compressed variants of an asset."""
+        variants = {'identity': content}
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) < len(content):
+            variants['gzip'] = compressed
+        if brotli is not None:
+            compressed = brotli.compress(content, quality=11)
+            if len(compressed) < len(content):
+                variants['br'] = compressed
+
+        self.assets[name] = {
+            'etag': hashlib.sha256(content).hexdigest()[:16],
+            'content_type': MIMETYPES.get(Path(name).suffix, 'application/octet-stream'),
+            'cache_control': cache_control,
+            'variants': variants
+        }
+
+    def response(self, name: str, request):
+        """
+        Build the response for an asset, or None if it is not in the bundle.
+        Picks the best encoding the client accepts and answers 304 when the
+        client's If-None-Match already names this representation.
+        """
+        asset = self.assets.get(name)
+        if asset is None:
+            return None
+
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in asset['variants'] and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+
+        # Each encoding is a distinct representation, so it needs its own strong ETag
+        etag = asset['etag'] if encoding == 'identity' else f"{asset['etag']}-{encoding}"
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(asset['variants'][encoding], content_type=asset['content_type'])
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = asset['cache_control']
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
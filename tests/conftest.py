@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The agent modules import each other by bare name, as app.py arranges
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'agent'))
+
+# Keep the app's rate limit counters and stored datasets out of the files a local server uses
+TEST_DIR = tempfile.mkdtemp(prefix='paradox-tests-')
+os.environ.setdefault('RATELIMIT_STORAGE_URI', 'sqlite:///' + os.path.join(TEST_DIR, 'ratelimit.db'))
+os.environ.setdefault('DATASET_DIR', os.path.join(TEST_DIR, 'datasets'))
+
+# Claims shared by the detection tests
+CLAIMS = [
+    "Since campaigns with a ROAS above 4.0 represent our most efficient spend, we should immediately "
+    "reallocate 30% of the budget from underperforming Brand campaigns (ROAS < 2.0) to these high-performers "
+    "to maximize total profit.",
+    "Our analysis shows that campaigns with a Click-Through Rate (CTR) above 5% consistently yield a 20% lower "
+    "Cost Per Acquisition (CPA), suggesting that creative optimization is the primary lever.",
+    "Across the 1,800 campaigns, we found that YouTube and Display ads have a significantly higher ROAS than "
+    "Search ads when using a 30-day view-through attribution window. Therefore, we should transition the "
+    "majority of the Search budget to Video.",
+    "Higher CTR is correlated with lower CPA, so creative quality must drive conversions.",
+    "Our top performing campaigns are the winners; we should follow their lead and replicate the strategy.",
+    "Facebook is better than Google because its conversion rate is higher versus last quarter.",
+    "TikTok engagement rate vs Instagram engagement rate shows a clear relationship with ROI.",
+    "We should scale spend on retargeting audiences since the ROAS compared to prospecting is higher.",
+    "Nothing in this sentence matches anything.",
+    "",
+    "REALLOCATE BUDGET NOW",
+    "Shift the spend; reallocation of budget due to the 7-day attribution model credit window.",
+]
@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from conftest import CLAIMS
+
+pytest.importorskip('flask')
+import app as app_module
+
+
+@pytest.fixture
+def loader_threads(monkeypatch):
+    """Replace the loaded generator with a fresh holder, recording the thread that builds it."""
+    threads = []
+
+    def load():
+        threads.append(threading.current_thread().name)
+        return app_module.load_generator()
+
+    monkeypatch.setattr(app_module, 'generator', app_module.Lazy(load))
+    app_module.limiter.reset()
+    return threads
+
+
+def test_analyze_loads_generator_on_analysis_thread(loader_threads):
+    result = app_module.app.test_client().post('/api/analyze', json={'claim': CLAIMS[3]})
+
+    assert result.status_code == 200
+    assert result.get_json()['claim'] == CLAIMS[3]
+    assert len(loader_threads) == 1 and loader_threads[0].startswith('analysis')
+
+
+def test_compare_loads_generator_on_analysis_thread(loader_threads):
+    result = app_module.app.test_client().post('/api/compare', json={'claim_a': CLAIMS[3], 'claim_b': CLAIMS[8]})
+
+    assert result.status_code == 200
+    body = result.get_json()
+    assert body['claim_a']['analysis']['claim'] == CLAIMS[3]
+    assert body['claim_b']['analysis']['status'] == 'no_issues'
+    assert len(loader_threads) == 1 and loader_threads[0].startswith('analysis')
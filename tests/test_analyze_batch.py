@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+from conftest import CLAIMS
+
+pytest.importorskip('flask')
+import app as app_module
+
+
+def test_batch_runs_on_analysis_threads(monkeypatch):
+    challenge_generator = app_module.generator.get()
+    original = challenge_generator.generate_challenges_batch
+    threads = []
+
+    def record_thread(claims, *args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return original(claims, *args, **kwargs)
+
+    monkeypatch.setattr(challenge_generator, 'generate_challenges_batch', record_thread)
+    app_module.limiter.reset()
+    claims = [claim for claim in CLAIMS if claim]
+    result = app_module.app.test_client().post('/api/analyze/batch', json={'claims': claims})
+
+    assert result.status_code == 200
+    body = result.get_json()
+    assert body['count'] == len(claims)
+    assert [r.get('claim', claim) for r, claim in zip(body['results'], claims)] == claims
+    assert threads and threads[0].startswith('analysis')
+
+
+def test_batch_validates_against_missing_dataset():
+    app_module.limiter.reset()
+    result = app_module.app.test_client().post('/api/analyze/batch', json={
+        'claims': [CLAIMS[0]], 'validate_data': True, 'dataset_id': 'missing'
+    })
+
+    assert result.status_code == 200
+    assert result.get_json()['results'][0]['data_verification']['verified'] is False
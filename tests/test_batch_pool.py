@@ -0,0 +1,76 @@
+import pytest
+
+from conftest import CLAIMS
+
+from batch_pool import DetectionPool
+from fallacy_detector import FallacyDetector
+
+
+class StaleDetector(FallacyDetector):
+    """Reports a different fallacies.json than the workers loaded, and counts local redos."""
+
+    def __init__(self):
+        super().__init__()
+        self.local_claims = []
+
+    @property
+    def config_version(self) -> str:
+        return 'stale'
+
+    def detect_many(self, claims):
+        self.local_claims.extend(claims)
+        return super().detect_many(claims)
+
+
+def scored(detections):
+    return [[(d.fallacy_id, d.match_score) for d in claim] for claim in detections]
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with DetectionPool(processes=2, chunk_size=5) as pool:
+        yield pool
+
+
+def test_sharded_results_match_score_many(pool):
+    detector = FallacyDetector()
+    claims = CLAIMS * 3
+
+    detections = pool.detect_many(detector, claims)
+
+    assert len(detections) == len(claims)
+    assert scored(detections) == detector.score_many(claims)
+
+
+def test_version_mismatch_redoes_shards_locally(pool):
+    detector = StaleDetector()
+    claims = CLAIMS * 2
+
+    detections = pool.detect_many(detector, claims)
+
+    assert detector.local_claims == claims
+    assert scored(detections) == FallacyDetector().score_many(claims)
+
+
+def test_batch_endpoint_uses_configured_pool(pool, monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    calls = []
+    original = pool.detect_many
+
+    def record(detector, claims):
+        calls.append(len(claims))
+        return original(detector, claims)
+
+    monkeypatch.setattr(pool, 'detect_many', record)
+    monkeypatch.setattr(app_module, 'detection_pool', app_module.Lazy(lambda: pool))
+    app_module.generator.get().cache.clear()
+    app_module.limiter.reset()
+    claims = [claim + ' (pooled)' for claim in CLAIMS]
+
+    result = app_module.app.test_client().post('/api/analyze/batch', json={'claims': claims})
+
+    assert result.status_code == 200
+    assert result.get_json()['count'] == len(claims)
+    assert calls == [len(claims)]
@@ -0,0 +1,151 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pl = pytest.importorskip('polars')
+
+import bootstrap
+
+RESAMPLES = 4000
+CONFIDENCE = 0.95
+ALPHA = (1 - CONFIDENCE) / 2
+
+
+def plain_interval(values, rng, resamples=RESAMPLES):
+    """Percentile interval from resampling rows directly, the estimate the bins approximate."""
+    picks = rng.integers(0, len(values), size=(resamples, len(values)))
+    low, high = np.quantile(values[picks].mean(axis=1), [ALPHA, 1 - ALPHA])
+    return low, high
+
+
+def binned_intervals(groups):
+    """mean_intervals over one 'roas' metric, one group per sample."""
+    df = pl.DataFrame({
+        'group': [f'g{i:04d}' for i, values in enumerate(groups) for _ in values],
+        'roas': np.concatenate(groups),
+    })
+    result = bootstrap.mean_intervals(df, 'group', {'ROAS': 'roas'}, RESAMPLES, CONFIDENCE)
+    return [result['by_platform'][f'g{i:04d}']['ROAS'] for i in range(len(groups))]
+
+
+@pytest.mark.parametrize('n', [2000, bootstrap.ROW_RESAMPLE_ROWS + 1, 300, bootstrap.TAIL_ROWS, 5])
+def test_interval_matches_plain_resample_on_skewed_group(n):
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(0.0, 1.2, size=n)
+    (low, high), = binned_intervals([values])
+    plain_low, plain_high = plain_interval(values, rng)
+    plain_width = plain_high - plain_low
+
+    assert low < values.mean() < high
+    assert abs((high - low) - plain_width) <= 0.1 * plain_width
+    assert abs(low - plain_low) <= 0.1 * plain_width
+    assert abs(high - plain_high) <= 0.1 * plain_width
+
+
+@pytest.mark.parametrize('n', [400, bootstrap.TAIL_ROWS])
+def test_coverage_matches_plain_resample(n):
+    rng = np.random.default_rng(11)
+    sigma = 1.0
+    true_mean = np.exp(sigma ** 2 / 2)
+    groups = [rng.lognormal(0.0, sigma, size=n) for _ in range(150)]
+
+    binned = binned_intervals(groups)
+    plain = [plain_interval(values, rng, resamples=1000) for values in groups]
+
+    binned_coverage = np.mean([low <= true_mean <= high for low, high in binned])
+    plain_coverage = np.mean([low <= true_mean <= high for low, high in plain])
+    assert abs(binned_coverage - plain_coverage) <= 0.05
+    binned_width = np.mean([high - low for low, high in binned])
+    plain_width = np.mean([high - low for low, high in plain])
+    assert abs(binned_width - plain_width) <= 0.05 * plain_width
+
+
+def test_small_group_width_matches_plain_resample_index_bootstrap():
+    rng = np.random.default_rng(9)
+    widths, plain_widths = [], []
+    for _ in range(20):
+        values = rng.lognormal(0.0, 1.0, size=40)
+        (low, high), = binned_intervals([values])
+        plain_low, plain_high = plain_interval(values, rng)
+        widths.append(high - low)
+        plain_widths.append(plain_high - plain_low)
+    assert np.allclose(widths, plain_widths, rtol=0.08)
+
+
+def test_metric_intervals_do_not_depend_on_other_metrics():
+    rng = np.random.default_rng(10)
+    df = pl.DataFrame({
+        'group': rng.choice(['a', 'b'], 3000),
+        'roas': rng.lognormal(0, 1, 3000),
+        'ctr': rng.gamma(2, 1, 3000),
+    })
+    both = bootstrap.mean_intervals(df, 'group', {'ROAS': 'roas', 'CTR': 'ctr'}, 1000)
+    alone = bootstrap.mean_intervals(df, 'group', {'CTR': 'ctr'}, 1000)
+    assert both['by_platform']['a']['CTR'] == alone['by_platform']['a']['CTR']
+    assert both['overall']['CTR'] == alone['overall']['CTR']
+
+
+def test_small_group_resamples_row_by_row():
+    values = np.array([1.0, 2.0, 3.0, 50.0])
+    counts, means, variances = bootstrap._bins(values, bootstrap.BINS)
+    assert counts.tolist() == [1, 1, 1, 1]
+    assert means.tolist() == values.tolist()
+    assert variances.tolist() == [0.0] * 4
+
+    values = np.arange(bootstrap.ROW_RESAMPLE_ROWS, dtype=np.float64)
+    assert len(bootstrap._bins(values, bootstrap.BINS)[0]) == bootstrap.ROW_RESAMPLE_ROWS
+    values = np.arange(bootstrap.ROW_RESAMPLE_ROWS + 1, dtype=np.float64)
+    assert len(bootstrap._bins(values, bootstrap.BINS)[0]) == bootstrap.BINS
+
+
+def test_large_group_keeps_exact_tails():
+    values = np.sort(np.random.default_rng(3).lognormal(0.0, 1.0, size=5000))
+    counts, means, variances = bootstrap._bins(values, bootstrap.BINS)
+    assert counts.sum() == len(values)
+    assert len(counts) <= bootstrap.BINS
+    assert counts[:bootstrap.TAIL_ROWS].tolist() == [1] * bootstrap.TAIL_ROWS
+    assert counts[-bootstrap.TAIL_ROWS:].tolist() == [1] * bootstrap.TAIL_ROWS
+    assert means[-bootstrap.TAIL_ROWS:].tolist() == values[-bootstrap.TAIL_ROWS:].tolist()
+    assert np.all(variances[bootstrap.TAIL_ROWS:-bootstrap.TAIL_ROWS] > 0)
+
+
+@pytest.mark.parametrize('resamples', [99, 100001, 0, -1])
+def test_resample_bounds_rejected(resamples):
+    df = pl.DataFrame({'group': ['a', 'a', 'b'], 'roas': [1.0, 2.0, 3.0]})
+    with pytest.raises(ValueError):
+        bootstrap.mean_intervals(df, 'group', {'ROAS': 'roas'}, resamples=resamples)
+
+
+@pytest.mark.parametrize('resamples', [100, 100000])
+def test_resample_bounds_accepted(resamples):
+    df = pl.DataFrame({'group': ['a', 'a', 'b'], 'roas': [1.0, 2.0, 3.0]})
+    result = bootstrap.mean_intervals(df, 'group', {'ROAS': 'roas'}, resamples=resamples)
+    assert result['resamples'] == resamples
+    low, high = result['overall']['ROAS']
+    assert 1.0 <= low <= 2.0 <= high <= 3.0
+
+
+def test_in_interval_matches_linear_scan():
+    from data_analyzer import ValidationIndex
+
+    rng = np.random.default_rng(5)
+    platforms = [f'platform{i}' for i in range(40)]
+    means = rng.uniform(0, 10, size=len(platforms))
+    halves = rng.exponential(0.5, size=len(platforms))
+    summary = {'by_platform': {
+        platform: {'ROAS': {'mean': float(mean), 'max': float(mean) + 1}}
+        for platform, mean in zip(platforms, means)
+    }}
+    intervals = {'by_platform': {
+        platform: (float(mean - half), float(mean + half * 2))
+        for platform, mean, half in zip(platforms, means, halves)
+    }}
+    index = ValidationIndex(summary, {'ROAS': 'roas'})
+
+    for claimed in np.linspace(-2, 12, 57):
+        for margin in (0.0, 0.25):
+            expected = {
+                position for position, platform in enumerate(platforms)
+                if intervals['by_platform'][platform][0] - margin <= claimed
+                <= intervals['by_platform'][platform][1] + margin
+            }
+            assert set(index.in_interval('ROAS', float(claimed), margin, intervals)) == expected
@@ -0,0 +1,124 @@
+import io
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pl = pytest.importorskip('polars')
+
+from data_analyzer import DataAnalyzer
+
+
+def load(frame: pl.DataFrame) -> DataAnalyzer:
+    buffer = io.BytesIO()
+    frame.write_csv(buffer)
+    analyzer = DataAnalyzer()
+    assert analyzer.load_csv(buffer.getvalue())['success']
+    return analyzer
+
+
+def simpsons_frame(rng, sizes=(200, 200, 200)):
+    """Across platforms ROAS rises with CTR; within each platform it falls."""
+    platforms, ctr, roas = [], [], []
+    for i, size in enumerate(sizes):
+        x = rng.normal(2.0 + 3.0 * i, 0.5, size)
+        platforms += [f'P{i}'] * size
+        ctr.append(x)
+        roas.append(4.0 * i - 1.5 * (x - x.mean()) + rng.normal(0, 0.3, size))
+    return pl.DataFrame({'Platform': platforms, 'CTR': np.concatenate(ctr), 'ROAS': np.concatenate(roas)})
+
+
+def pooled_within_corr(groups, x, y):
+    dx = np.concatenate([x[groups == g] - x[groups == g].mean() for g in np.unique(groups)])
+    dy = np.concatenate([y[groups == g] - y[groups == g].mean() for g in np.unique(groups)])
+    return np.corrcoef(dx, dy)[0, 1]
+
+
+def finding(result, stratifier='Platform'):
+    matches = [f for f in result['findings'] if f['stratified_by'] == stratifier]
+    assert len(matches) == 1, result['findings']
+    return matches[0]
+
+
+def test_simpsons_paradox_is_found():
+    frame = simpsons_frame(np.random.default_rng(1))
+    result = load(frame).scan_confounders()
+    assert result['stratified_by'] == ['Platform']
+
+    found = finding(result)
+    assert found['type'] == 'simpsons_paradox'
+    assert set(found['metrics']) == {'roas', 'ctr'}
+    assert found['strata'] == 3 and found['strata_reversed'] == 3
+    assert found['reversed_row_share'] == 1.0
+
+    groups, x, y = frame['Platform'].to_numpy(), frame['CTR'].to_numpy(), frame['ROAS'].to_numpy()
+    assert found['overall_corr'] == pytest.approx(np.corrcoef(x, y)[0, 1], abs=1e-3)
+    assert found['within_strata_corr'] == pytest.approx(pooled_within_corr(groups, x, y), abs=1e-3)
+    assert found['overall_corr'] > 0 > found['within_strata_corr']
+
+
+def test_confounder_without_reversal():
+    rng = np.random.default_rng(2)
+    platforms = np.repeat(['A', 'B', 'C'], 1000)
+    shift = np.repeat([0.0, 3.0, 6.0], 1000)
+    frame = pl.DataFrame({
+        'Platform': platforms,
+        'CTR': shift + rng.normal(0, 1, len(shift)),
+        'ROAS': shift + rng.normal(0, 1, len(shift)),
+    })
+    found = finding(load(frame).scan_confounders())
+    assert found['type'] == 'confounder'
+    assert found['strata_reversed'] == 0
+    assert min(found['explained_variance'].values()) > 0.5
+
+
+def test_no_confounder_gives_no_findings():
+    rng = np.random.default_rng(3)
+    frame = pl.DataFrame({
+        'Platform': np.repeat(['A', 'B', 'C', 'D'], 100),
+        'CTR': rng.normal(3, 1, 400),
+        'ROAS': rng.normal(5, 1, 400),
+        'CPC': rng.normal(1, 0.2, 400),
+    })
+    result = load(frame).scan_confounders()
+    assert result['metric_pairs'] == 3
+    assert result['findings'] == []
+
+
+def test_strata_below_min_rows_are_not_counted():
+    frame = simpsons_frame(np.random.default_rng(4), sizes=(200, 200, 10))
+    found = finding(load(frame).scan_confounders(min_rows=20))
+    assert found['strata'] == 2
+    assert found['strata_reversed'] == 2
+    assert found['reversed_row_share'] == pytest.approx(400 / 410, abs=1e-3)
+
+    found = finding(load(frame).scan_confounders(min_rows=5))
+    assert found['strata'] == 3
+
+
+def test_null_metric_values_are_left_out_of_their_pairs():
+    rng = np.random.default_rng(5)
+    frame = simpsons_frame(rng).with_columns(pl.Series('CPC', rng.normal(1, 0.2, 600)))
+    missing = rng.random(600) < 0.2
+    frame = frame.with_columns(pl.when(pl.Series(missing)).then(None).otherwise(pl.col('CTR')).alias('CTR'))
+    result = load(frame).scan_confounders()
+
+    found = next(f for f in result['findings'] if set(f['metrics']) == {'roas', 'ctr'})
+    present = ~missing
+    groups = frame['Platform'].to_numpy()[present]
+    x = frame['CTR'].to_numpy()[present].astype(float)
+    y = frame['ROAS'].to_numpy()[present]
+    assert found['overall_corr'] == pytest.approx(np.corrcoef(x, y)[0, 1], abs=1e-3)
+    assert found['within_strata_corr'] == pytest.approx(pooled_within_corr(groups, x, y), abs=1e-3)
+    assert found['reversed_row_share'] == 1.0
+    assert not any('cpc' in f['metrics'] for f in result['findings'])
+
+
+def test_scan_stratifies_by_dimension_and_month():
+    frame = simpsons_frame(np.random.default_rng(6)).with_columns(
+        pl.Series('Region', ['north', 'south'] * 300),
+        pl.Series('Date', [f'2024-0{1 + i % 3}-15' for i in range(600)]),
+    )
+    result = load(frame).scan_confounders()
+    assert result['stratified_by'] == ['Platform', 'Region', 'month']
+    assert finding(result)['type'] == 'simpsons_paradox'
+    assert load(frame).scan_confounders(max_strata=2)['stratified_by'] == ['Region']
@@ -0,0 +1,92 @@
+import io
+
+import pytest
+
+pl = pytest.importorskip('polars')
+
+from conftest import ROOT
+from data_analyzer import DataAnalyzer
+from dataset_registry import DatasetRegistry
+
+CSV_PATH = ROOT / 'digital_marketing_test_data.csv'
+
+DELTA = (
+    b'Date,Platform,Website Sessions,ROAS,CTR,CPC\n'
+    b'2024-09-01,TikTok,2000,9.5,2.1,6.0\n'
+    b'2024-09-01,Google Ads,3100,11.2,1.7,5.1\n'
+)
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = DataAnalyzer()
+    assert analyzer.load_csv_path(str(CSV_PATH))['success']
+    return analyzer
+
+
+def append(analyzer, tmp_path, content=DELTA):
+    path = tmp_path / 'delta.csv'
+    path.write_bytes(content)
+    result = analyzer.append_csv_path(str(path))
+    assert result['success'], result
+    return result
+
+
+def test_refresh_keeps_version_unless_given(analyzer):
+    registry = DatasetRegistry()
+    dataset_id = registry.add(analyzer, version=7)
+    registry.refresh(dataset_id)
+    assert registry.version(dataset_id) == 7
+    registry.refresh(dataset_id, version=8)
+    assert registry.version(dataset_id) == 8
+
+
+def test_size_counts_incremental_aggregates(analyzer, tmp_path):
+    registry = DatasetRegistry()
+    dataset_id = registry.add(analyzer)
+    assert registry.stats()['bytes'] == analyzer.df.estimated_size()
+
+    append(analyzer, tmp_path)
+    registry.refresh(dataset_id)
+    frame_bytes = analyzer.df.estimated_size()
+    metric_bytes = analyzer.df.select(list(analyzer.metric_cols.values())).estimated_size()
+    # Sorted copies of every metric, per platform and overall
+    assert registry.stats()['bytes'] >= frame_bytes + 2 * metric_bytes * 0.9
+
+
+def test_sorted_runs_size_counts_pending_values():
+    from incremental_summary import SortedRuns
+
+    base = pl.Series('roas', [float(i) for i in range(1000)])
+    runs = SortedRuns(base)
+    assert runs.estimated_size() >= base.estimated_size()
+    grown = runs.merged(pl.Series('roas', [0.5, 1.5, 2.5]))
+    assert grown.base is base and len(grown.pending) == 3
+    assert grown.estimated_size() >= runs.estimated_size() + 3 * 8
+
+
+def test_failed_persist_keeps_appended_rows(monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    app_module.limiter.reset()
+    client = app_module.app.test_client()
+    upload = client.post('/api/upload', data={'file': (io.BytesIO(CSV_PATH.read_bytes()), 'data.csv')})
+    dataset_id = upload.get_json()['dataset_id']
+    rows = upload.get_json()['rows']
+
+    store = app_module.uploads.get().store
+    version = store.version(dataset_id)
+    assert version is not None and app_module.datasets.version(dataset_id) == version
+
+    def fail(*args):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(store, 'save', fail)
+    appended = client.post(f'/api/datasets/{dataset_id}/append', data={'file': (io.BytesIO(DELTA), 'delta.csv')})
+    assert appended.status_code == 200
+    assert appended.get_json()['rows'] == rows + 2
+
+    # The older copy on disk is not reopened over the live one
+    assert app_module.datasets.version(dataset_id) == version
+    assert len(app_module.get_dataset(dataset_id).df) == rows + 2
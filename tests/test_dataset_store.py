@@ -0,0 +1,138 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('polars')
+
+from conftest import ROOT
+from data_analyzer import DataAnalyzer
+from dataset_store import DatasetStore
+
+CSV_PATH = ROOT / 'digital_marketing_test_data.csv'
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(str(tmp_path / 'datasets'))
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = DataAnalyzer()
+    assert analyzer.load_csv_path(str(CSV_PATH))['success']
+    return analyzer
+
+
+@pytest.mark.parametrize('dataset_id', ['abc\n', 'abc\r', '', 'a.b', '../abc', 'a' * 65, 'abc/', None, 5])
+def test_invalid_ids_never_reach_the_filesystem(store, dataset_id):
+    assert store._path(dataset_id) is None
+    assert store.version(dataset_id) is None
+
+
+def test_save_and_open(store, analyzer):
+    version = store.save('abc_-1', analyzer)
+    assert version == store.version('abc_-1')
+    reopened = store.open('abc_-1')
+    assert len(reopened.df) == len(analyzer.df)
+    assert reopened.summary_stats == analyzer.summary_stats
+
+
+def test_lock_on_unknown_id_leaves_no_file(store):
+    with store.lock('unknown'):
+        pass
+    assert list(store.data_dir.iterdir()) == []
+
+
+def test_lock_on_stored_dataset(store, analyzer):
+    store.save('abc', analyzer)
+    with store.lock('abc'):
+        assert (store.data_dir / 'abc.lock').exists()
+    store.remove('abc')
+    assert list(store.data_dir.iterdir()) == []
+
+
+def test_purge_removes_orphaned_lock_files(store, analyzer):
+    store.retention_seconds = 60
+    orphan = store.data_dir / 'gone.lock'
+    orphan.touch()
+    old = time.time() - 120
+    os.utime(orphan, (old, old))
+    fresh_orphan = store.data_dir / 'recent.lock'
+    fresh_orphan.touch()
+
+    store.save('kept', analyzer)
+    with store.lock('kept'):
+        pass
+    kept_lock = store.data_dir / 'kept.lock'
+    os.utime(kept_lock, (old, old))
+
+    store._next_purge = 0
+    store._purge_expired()
+    assert not orphan.exists()
+    assert fresh_orphan.exists()
+    assert kept_lock.exists()
+
+
+@pytest.fixture
+def app_module():
+    pytest.importorskip('flask')
+    import app as app_module
+    app_module.limiter.reset()
+    return app_module
+
+
+def test_append_to_unknown_dataset_leaves_no_lock(app_module):
+    client = app_module.app.test_client()
+    response = client.post('/api/datasets/neverissued/append',
+                           data={'file': (io.BytesIO(b'Platform,ROAS\nTikTok,1.0\n'), 'delta.csv')})
+    assert response.status_code == 404
+    store = app_module.uploads.get().store
+    assert not (store.data_dir / 'neverissued.lock').exists()
+
+
+def test_async_views_look_up_datasets_off_the_event_loop(app_module, monkeypatch):
+    client = app_module.app.test_client()
+    upload = client.post('/api/upload', data={'file': (io.BytesIO(CSV_PATH.read_bytes()), 'data.csv')})
+    dataset_id = upload.get_json()['dataset_id']
+
+    lookup_threads = []
+    get_dataset = app_module.get_dataset
+
+    def recording_get_dataset(*args):
+        lookup_threads.append(threading.current_thread().name)
+        return get_dataset(*args)
+
+    monkeypatch.setattr(app_module, 'get_dataset', recording_get_dataset)
+    analyzed = client.post('/api/analyze', json={
+        'claim': 'TikTok has a ROAS of 11.0', 'validate_data': True, 'dataset_id': dataset_id
+    })
+    compared = client.post('/api/compare', json={
+        'claim_a': 'TikTok has a ROAS of 11.0', 'claim_b': 'Google Ads has a ROAS of 13.0',
+        'validate_data': True, 'dataset_id': dataset_id
+    })
+
+    assert analyzed.status_code == 200 and 'data_verification' in analyzed.get_json()
+    assert compared.status_code == 200 and 'data_verification' in compared.get_json()['claim_b']
+    assert len(lookup_threads) == 2
+    assert all(name.startswith('analysis') for name in lookup_threads)
+
+
+def test_version_changes_on_every_save_within_one_mtime_tick(store, analyzer, tmp_path):
+    store.save('abc', analyzer)
+    first = store.version('abc')
+    meta_path = store.data_dir / 'abc.json'
+    mtime = meta_path.stat().st_mtime_ns
+
+    # Another worker's copy appends and saves within the same filesystem tick
+    other = store.open('abc')
+    delta = tmp_path / 'delta.csv'
+    delta.write_bytes(b'Date,Platform,Website Sessions,ROAS,CTR,CPC\n2024-09-01,TikTok,2000,9.5,2.1,6.0\n')
+    assert other.append_csv_path(str(delta))['success']
+    store.save('abc', other)
+    os.utime(meta_path, ns=(mtime, mtime))
+
+    assert store.version('abc') == first + 1
+    assert len(store.open('abc').df) == len(analyzer.df) + 1
@@ -0,0 +1,148 @@
+import json
+import marshal
+import os
+
+import pytest
+
+import fallacy_config
+from conftest import ROOT
+from fallacy_config import FallacyConfig
+
+SOURCE = json.loads((ROOT / 'config' / 'fallacies.json').read_text())
+
+
+def write(path, fallacies, bump=1):
+    """Write the database and move its mtime on, as a later edit would."""
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(json.dumps(fallacies) if not isinstance(fallacies, str) else fallacies)
+    os.utime(path, ns=(previous + bump * 10 ** 9, previous + bump * 10 ** 9))
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'fallacies.json'
+    write(path, SOURCE)
+    return path
+
+
+def edited(name='Edited'):
+    fallacies = json.loads(json.dumps(SOURCE))
+    first = next(iter(fallacies.values()))
+    first['name'] = name
+    first['triggers']['keywords'].append('zeitgeist')
+    return fallacies
+
+
+def test_edit_is_swapped_in(path):
+    config = FallacyConfig(path)
+    before = config.snapshot
+    assert not config.check()
+
+    write(path, edited())
+    assert config.check()
+    after = config.snapshot
+    assert after is not before and after.version != before.version
+    assert next(iter(after.fallacies.values()))['name'] == 'Edited'
+    assert 'zeitgeist' in after.triggers.keyword_index
+    # The old snapshot is untouched for readers still holding it
+    assert 'zeitgeist' not in before.triggers.keyword_index
+
+
+def test_touch_without_change_keeps_version(path):
+    config = FallacyConfig(path)
+    version = config.snapshot.version
+    write(path, SOURCE)
+    assert not config.check()
+    assert config.snapshot.version == version
+
+
+@pytest.mark.parametrize('content', [
+    '{not json',
+    '{}',
+    json.dumps({'x': {'name': 'X', 'description': 'd', 'triggers': {}, 'challenges': {}}}),
+    json.dumps({'x': {'name': 'X', 'description': 'd', 'triggers': {'keywords': [1]},
+                      'challenges': dict.fromkeys(fallacy_config.CHALLENGE_KEYS, [])}}),
+])
+def test_invalid_edit_keeps_snapshot_until_the_file_changes(path, monkeypatch, content):
+    config = FallacyConfig(path)
+    before = config.snapshot
+    write(path, content)
+
+    loads = []
+    load = config._load
+    monkeypatch.setattr(config, '_load', lambda stat: loads.append(stat) or load(stat))
+    assert not config.check()
+    assert not config.check()
+    assert config.snapshot is before
+    assert len(loads) == 1
+
+    write(path, edited())
+    assert config.check()
+    assert len(loads) == 2
+
+
+def test_compiled_snapshot_is_used_when_current(path, monkeypatch):
+    version = FallacyConfig(path).snapshot.version
+    assert path.with_name('fallacies.json.compiled').exists()
+
+    def fail(*args):
+        raise AssertionError('recompiled')
+
+    monkeypatch.setattr(fallacy_config.TriggerIndex, '__init__', fail)
+    config = FallacyConfig(path)
+    assert config.snapshot.version == version
+    assert list(config.snapshot.fallacies) == list(SOURCE)
+
+
+def read_compiled(path):
+    return marshal.loads(path.with_name('fallacies.json.compiled').read_bytes())
+
+
+def test_stale_compiled_snapshot_is_rebuilt(path):
+    FallacyConfig(path)
+    write(path, edited())
+    config = FallacyConfig(path)
+    assert next(iter(config.snapshot.fallacies.values()))['name'] == 'Edited'
+    assert read_compiled(path)['version'] == config.snapshot.version
+
+
+def tamper(compiled):
+    compiled['triggers']['pattern_matcher']['fail'][1] = 10 ** 6
+    return compiled
+
+
+def old_format(compiled):
+    compiled['format'] = fallacy_config.SNAPSHOT_FORMAT - 1
+    return compiled
+
+
+def bad_fallacies(compiled):
+    compiled['fallacies'] = {'x': 1}
+    return compiled
+
+
+def mismatched_ids(compiled):
+    compiled['triggers']['fallacy_ids'].reverse()
+    return compiled
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda data: b'',
+    lambda data: data[:len(data) // 2],
+    lambda data: b'\x00garbage\xff' * 10,
+    lambda data: marshal.dumps([1, 2, 3]),
+    lambda data: marshal.dumps(tamper(marshal.loads(data))),
+    lambda data: marshal.dumps(old_format(marshal.loads(data))),
+    lambda data: marshal.dumps(bad_fallacies(marshal.loads(data))),
+    lambda data: marshal.dumps(mismatched_ids(marshal.loads(data))),
+])
+def test_corrupt_compiled_snapshot_is_ignored_and_rebuilt(path, corrupt):
+    expected = FallacyConfig(path).snapshot
+    compiled_path = path.with_name('fallacies.json.compiled')
+    compiled_path.write_bytes(corrupt(compiled_path.read_bytes()))
+
+    config = FallacyConfig(path)
+    assert config.snapshot.version == expected.version
+    assert config.snapshot.triggers.to_dict() == expected.triggers.to_dict()
+    assert read_compiled(path)['version'] == expected.version
+    assert config._read_compiled(expected.version) is not None
@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+from input_processor import InputProcessor
+from conftest import CLAIMS
+
+STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+              'from', 'is', 'are', 'was', 'were', 'be', 'been'}
+
+
+def baseline_process(processor, claim_text):
+    """The per-word regex and substring scan InputProcessor replaced, kept as the oracle."""
+    text = claim_text.lower()
+    return {
+        'original_claim': claim_text,
+        'metrics_found': list({metric for metric in processor.known_metrics if metric.lower() in text}),
+        'action_words_found': [
+            word for word in processor.action_words if re.search(r'\b' + re.escape(word) + r'\b', text)
+        ],
+        'comparison_words_found': [
+            word for word in processor.comparison_words if re.search(r'\b' + re.escape(word) + r'\b', text)
+        ],
+        'has_recommendation': any(word in text for word in processor.action_words),
+        'has_comparison': any(word in text for word in processor.comparison_words),
+        'keywords': {word for word in re.findall(r'\b\w+\b', text) if word not in STOP_WORDS and len(word) > 2},
+    }
+
+
+CORPUS = CLAIMS + [
+    # Multi-word phrases, whole and broken up
+    'Search performed better compared to Display, versus last year',
+    'compared  to last week (two spaces) and compared\nto the week before',
+    'The cost per acquisition and the return on ad spend moved; cost per click did not.',
+    'Our click-through rate and engagement rate beat the bounce rate',
+    # Punctuation next to keywords
+    'Should we shift? Yes: reallocate, scale-up, and cut!',
+    '"Higher" ROAS; (lower) CPA... more/less CTR vs. CPC',
+    "We'd rather invest—then adjust—than switch.",
+    'outperform/underperform, superior-inferior',
+    # Overlapping metric substrings and words inside longer words
+    'CPCs, CPMs and ROASes; the ROI-driven CACs',
+    'conversion rates vs conversion-rate vs conversionrate',
+    'cost per click-through rate',
+    'Shifting, moved, increases, changed, scaled, reductions, thanks, moreover, lessons',
+    'overshould unshift reallocated',
+    # Case and non-ASCII text
+    'ROAS ROAS roas RoAs CTR ctr',
+    'Énergie: the CPA in München should be REDUCED versus Zürich',
+    '   ',
+    '123 45.6 7,890 to be or not',
+]
+
+
+@pytest.fixture(scope='module')
+def processor():
+    return InputProcessor()
+
+
+@pytest.mark.parametrize('claim', CORPUS)
+def test_process_matches_baseline(processor, claim):
+    result = processor.process(claim)
+    expected = baseline_process(processor, claim)
+    assert sorted(result.pop('metrics_found')) == sorted(expected.pop('metrics_found'))
+    assert result == expected
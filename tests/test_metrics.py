@@ -0,0 +1,29 @@
+from metrics import MetricsRegistry
+
+
+def test_request_methods_map_onto_a_fixed_set():
+    registry = MetricsRegistry(enabled=True)
+    for method in ['GET', 'post', 'HEAD', 'OPTIONS', 'PROPFIND', 'X' * 1000, 'GET\nevil 1', 'DELETE']:
+        registry.observe_request(method, '/api/analyze', 200, 0.01)
+    assert {method for method, _, _ in registry.requests} == {'GET', 'POST', 'HEAD', 'OPTIONS', 'other'}
+    assert registry.requests[('other', '/api/analyze', '200')] == 4
+
+
+def test_render_escapes_label_values():
+    registry = MetricsRegistry(enabled=True)
+    registry.observe_stage('parse "csv"\nnext', 0.001)
+    registry.observe_request('GET', '/a\\b"c', 404, 0.01)
+    text = registry.render([('datasets', 'Stored datasets', {'worker': 'w"1\n'}, 3)])
+
+    assert 'stage="parse \\"csv\\"\\nnext"' in text
+    assert 'endpoint="/a\\\\b\\"c"' in text
+    assert 'data_paradox_datasets{worker="w\\"1\\n"} 3' in text
+    # Every sample stays on one line: name{labels} value
+    for line in text.splitlines():
+        assert line.startswith('# ') or line.startswith('data_paradox_')
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    registry.observe_request('GET', '/health', 200, 0.01)
+    assert registry.requests == {}
@@ -0,0 +1,133 @@
+import io
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pl = pytest.importorskip('polars')
+
+from data_analyzer import DataAnalyzer
+from incremental_summary import IncrementalSummary
+from quantile_sketch import DEFAULT_COMPRESSION, TDigest
+
+QUANTILES = [0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999]
+
+# Stated bound: no estimate is further than 1 / (2 * compression) in rank from its quantile
+RANK_ERROR = 1 / (2 * DEFAULT_COMPRESSION)
+
+
+def rank_error(digest, values):
+    ordered = np.sort(values)
+    return max(abs(np.searchsorted(ordered, digest.quantile(q)) / len(ordered) - q) for q in QUANTILES)
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).lognormal(0.0, 1.0, 200000)
+
+
+def test_merged_digest_within_rank_error(values):
+    digest = TDigest()
+    for chunk in np.array_split(values, 50):
+        digest = digest.merged(pl.Series(chunk))
+    assert len(digest) == len(values)
+    assert len(digest.weights) <= DEFAULT_COMPRESSION
+    assert rank_error(digest, values) <= RANK_ERROR
+    assert digest.quantile(0) == values.min() and digest.quantile(1) == values.max()
+
+
+def test_combined_digests_within_rank_error(values):
+    digests = [TDigest.from_values(pl.Series(chunk)) for chunk in np.array_split(values, 16)]
+    while len(digests) > 1:
+        digests = [a.combined(b) for a, b in zip(digests[::2], digests[1::2])]
+    assert len(digests[0]) == len(values)
+    assert rank_error(digests[0], values) <= RANK_ERROR
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 10, 31, 60])
+def test_small_groups_match_polars_linear_quantiles(n):
+    series = pl.Series(np.random.default_rng(n).normal(5, 2, n))
+    digest = TDigest.from_values(series)
+    for q in [0.0, 0.1, 0.25, 0.5, 0.9, 0.99, 1.0]:
+        assert digest.quantile(q) == pytest.approx(series.quantile(q, 'linear'), abs=1e-12)
+    assert digest.median() == pytest.approx(series.median(), abs=1e-12)
+
+
+def test_empty_digest():
+    digest = TDigest()
+    assert len(digest) == 0 and digest.quantile(0.5) is None
+    assert digest.merged(pl.Series([], dtype=pl.Float64)) is digest
+
+
+def frame(rng, rows):
+    return pl.DataFrame({
+        'Platform': rng.choice(['Google Ads', 'TikTok', 'Meta'], rows),
+        'ROAS': rng.lognormal(1.5, 0.6, rows),
+        'CTR': rng.gamma(2.0, 1.0, rows),
+    })
+
+
+def test_sketch_appends_agree_with_a_fresh_sketch():
+    rng = np.random.default_rng(1)
+    base, deltas = frame(rng, 20000), [frame(rng, 3000) for _ in range(4)]
+    metrics = {'roas': 'ROAS', 'ctr': 'CTR'}
+
+    appended = IncrementalSummary.from_frame(base, 'Platform', metrics, DEFAULT_COMPRESSION)
+    for delta in deltas:
+        appended = appended.merged(delta)
+    everything = pl.concat([base] + deltas)
+    fresh = IncrementalSummary.from_frame(everything, 'Platform', metrics, DEFAULT_COMPRESSION)
+
+    for platform, (rows, aggregates) in fresh.platforms.items():
+        appended_rows, appended_aggregates = appended.platforms[platform]
+        assert appended_rows == rows
+        for metric_name, col in metrics.items():
+            exact = everything.filter(pl.col('Platform') == platform)[col].to_numpy()
+            ours, theirs = appended_aggregates[metric_name], aggregates[metric_name]
+            assert (ours.count, ours.minimum, ours.maximum) == (theirs.count, theirs.minimum, theirs.maximum)
+            assert ours.total == pytest.approx(theirs.total)
+            assert rank_error(ours.values, exact) <= RANK_ERROR
+            assert rank_error(theirs.values, exact) <= RANK_ERROR
+
+
+def test_sketched_analyzer_append_matches_fresh_load(tmp_path):
+    rng = np.random.default_rng(2)
+    base, delta = frame(rng, 5000), frame(rng, 1000)
+    base.write_csv(tmp_path / 'base.csv')
+    delta.write_csv(tmp_path / 'delta.csv')
+    pl.concat([base, delta]).write_csv(tmp_path / 'all.csv')
+
+    appended = DataAnalyzer(sketch_compression=DEFAULT_COMPRESSION)
+    assert appended.load_csv_path(str(tmp_path / 'base.csv'))['success']
+    assert appended.append_csv_path(str(tmp_path / 'delta.csv'))['success']
+    fresh = DataAnalyzer(sketch_compression=DEFAULT_COMPRESSION)
+    assert fresh.load_csv_path(str(tmp_path / 'all.csv'))['success']
+
+    for platform, stats in fresh.summary_stats['by_platform'].items():
+        ours = appended.summary_stats['by_platform'][platform]
+        assert ours['count'] == stats['count']
+        for metric_name in ('roas', 'ctr'):
+            for stat in ('mean', 'min', 'max'):
+                assert ours[metric_name][stat] == stats[metric_name][stat]
+            for stat in ('median', 'p90'):
+                assert ours[metric_name][stat] == pytest.approx(stats[metric_name][stat], rel=0.02)
+
+
+@pytest.mark.parametrize('compression', [None, DEFAULT_COMPRESSION])
+def test_platform_with_all_null_metric(compression):
+    base = b"Platform,Spend,ROAS\nGoogle,10,2.0\nGoogle,20,3.0\nMeta,30,\nMeta,40,\n"
+    analyzer = DataAnalyzer(sketch_compression=compression)
+    assert analyzer.load_csv(base)['success']
+
+    meta = analyzer.summary_stats['by_platform']['Meta']
+    assert meta['count'] == 2 and meta['roas'] is None
+    assert meta['spend']['mean'] == 35.0
+    assert analyzer.summary_stats['overall']['roas']['mean'] == 2.5
+    assert analyzer.validate_claim('Meta ROAS is 2.5')['verified']
+    assert 'roas' not in analyzer.confidence_intervals(resamples=100)['by_platform']['Meta']
+
+    delta = b"Platform,Spend,ROAS\nMeta,5,1.5\n"
+    assert analyzer.append_csv(delta)['success']
+    fresh = DataAnalyzer(sketch_compression=compression)
+    assert fresh.load_csv(base + delta.split(b'\n', 1)[1])['success']
+    assert analyzer.summary_stats['by_platform']['Meta'] == fresh.summary_stats['by_platform']['Meta']
+    assert analyzer.summary_stats['by_platform']['Meta']['roas']['mean'] == 1.5
@@ -0,0 +1,136 @@
+import pytest
+
+pytest.importorskip('limits')
+
+import rate_limit_storage
+from rate_limit_storage import SQLiteStorage
+
+
+class Clock:
+    """Stands in for the time module inside rate_limit_storage."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit_storage, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'limits.db'}"
+
+
+def test_uri_path(tmp_path):
+    storage = SQLiteStorage(f"sqlite:///{tmp_path / 'limits.db'}")
+    assert storage.path == str(tmp_path / 'limits.db')
+    assert storage.check()
+
+
+def test_incr_get_and_expiry(uri, clock):
+    storage = SQLiteStorage(uri)
+    assert storage.get('k') == 0
+    assert storage.get_expiry('k') == clock.now
+
+    assert storage.incr('k', 10) == 1
+    assert storage.incr('k', 10, amount=3) == 4
+    assert storage.get('k') == 4
+    # Further increments keep the window's original expiry
+    clock.now += 4
+    assert storage.incr('k', 10) == 5
+    assert storage.get_expiry('k') == clock.now - 4 + 10
+
+    clock.now += 6
+    assert storage.get('k') == 0
+    assert storage.get_expiry('k') == clock.now
+    # An expired counter restarts on the next increment
+    assert storage.incr('k', 10) == 1
+    assert storage.get_expiry('k') == clock.now + 10
+
+
+def test_decr_never_goes_negative(uri, clock):
+    storage = SQLiteStorage(uri)
+    storage.incr('k', 10, amount=2)
+    assert storage.decr('k') == 1
+    assert storage.decr('k', 5) == 0
+
+
+def test_clear_and_reset(uri, clock):
+    storage = SQLiteStorage(uri)
+    storage.incr('a', 10)
+    storage.incr('b', 10)
+    storage.clear('a')
+    assert storage.get('a') == 0
+    assert storage.get('b') == 1
+    assert storage.reset() == 1
+    assert storage.get('b') == 0
+
+
+def test_expired_counters_are_purged(uri, clock, monkeypatch):
+    monkeypatch.setattr(rate_limit_storage, 'PURGE_EVERY', 3)
+    storage = SQLiteStorage(uri)
+    storage.incr('old', 1)
+    clock.now += 5
+    storage.incr('new', 10)
+    storage.incr('new', 10)
+    rows = storage._connection().execute('SELECT key FROM counters').fetchall()
+    assert rows == [('new',)]
+
+
+def test_counters_shared_across_connections(uri, clock):
+    first, second = SQLiteStorage(uri), SQLiteStorage(uri)
+    first.incr('k', 10)
+    second.incr('k', 10)
+    assert first.get('k') == 2
+    second.clear('k')
+    assert first.get('k') == 0
+
+
+def test_sliding_window_acquire_across_connections(uri, clock):
+    first, second = SQLiteStorage(uri), SQLiteStorage(uri)
+    clock.now = 600.0  # start of a 60 second window
+
+    acquired = [(first, second)[i % 2].acquire_sliding_window_entry('k', 5, 60) for i in range(8)]
+    assert acquired == [True] * 5 + [False] * 3
+    assert first.get_sliding_window('k', 60)[2] == 5
+    assert not second.acquire_sliding_window_entry('k', 5, 60, amount=6)
+
+    # Halfway through the next window the previous window counts 2.5, rounded down
+    clock.now = 690.0
+    acquired = [(second, first)[i % 2].acquire_sliding_window_entry('k', 5, 60) for i in range(5)]
+    assert acquired == [True, True, True, False, False]
+
+    previous, previous_ttl, current, _ = second.get_sliding_window('k', 60)
+    assert (previous, previous_ttl, current) == (5, 30.0, 3)
+
+    first.clear_sliding_window('k', 60)
+    assert second.get_sliding_window('k', 60)[:3] == (0, 0.0, 0)
+
+
+def test_eleventh_request_in_a_minute_is_rejected():
+    pytest.importorskip('flask_limiter')
+    import app as app_module
+
+    assert isinstance(app_module.limiter._storage, SQLiteStorage)
+    app_module.limiter.reset()
+    client = app_module.app.test_client()
+
+    # 10 per minute; an unknown dataset answers 404 while the limit allows it
+    statuses = [client.post('/api/datasets/missing/intervals', json={}).status_code for _ in range(11)]
+    assert statuses == [404] * 10 + [429]
+
+
+def test_installed_limits_matches_the_storage_interface():
+    import inspect
+
+    from limits.storage import Storage
+
+    # limits 4 passes elastic_expiry to incr, which SQLiteStorage does not take
+    assert 'elastic_expiry' not in inspect.signature(Storage.incr).parameters
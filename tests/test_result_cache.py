@@ -0,0 +1,81 @@
+import pytest
+
+from conftest import CLAIMS
+
+import result_cache
+from challenge_generator import ChallengeGenerator
+from fallacy_detector import FallacyDetector
+from result_cache import ResultCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, 'monotonic', clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(max_entries=4, ttl_seconds=60)
+    cache.put('a', 1)
+
+    clock.now += 60
+    assert cache.get('a') == 1
+    clock.now += 1
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    assert cache.stats() == {'entries': 0, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = ResultCache(max_entries=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None and len(cache) == 0
+
+
+def test_cache_hit_echoes_callers_claim():
+    generator = ChallengeGenerator()
+    claim = CLAIMS[0]
+    first = generator.generate_challenges(claim)
+
+    shouted = '  ' + claim.upper() + '  '
+    second = generator.generate_challenges(shouted)
+    assert generator.cache.hits == 1
+    assert second.claim == shouted and second.to_dict()['claim'] == shouted
+    assert second.top is first.top
+
+    batch = generator.generate_challenges_batch([claim.lower(), claim])
+    assert [response.claim for response in batch] == [claim.lower(), claim]
+    assert generator.cache.hits == 3
+
+
+def test_config_version_change_misses(monkeypatch):
+    generator = ChallengeGenerator()
+    claim = CLAIMS[0]
+    generator.generate_challenges(claim)
+    key = generator._cache_key(claim, 3)
+
+    monkeypatch.setattr(FallacyDetector, 'config_version', property(lambda self: 'edited'))
+    assert generator._cache_key(claim, 3) != key
+    generator.generate_challenges(claim)
+    assert generator.cache.hits == 0 and generator.cache.misses == 2
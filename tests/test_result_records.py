@@ -0,0 +1,62 @@
+import json
+
+from conftest import CLAIMS
+
+from challenge_generator import ChallengeGenerator
+from result_records import NO_ISSUES_MESSAGE
+
+
+def baseline_response(claim, detected, fallacies, max_fallacies=3):
+    """The response dict as the original dict-building generator produced it."""
+    if not detected:
+        return {'status': 'no_issues', 'message': NO_ISSUES_MESSAGE}
+    challenges = []
+    for fallacy_id, confidence in detected[:max_fallacies]:
+        fallacy = fallacies[fallacy_id]
+        challenges.append({
+            'fallacy_name': fallacy['name'],
+            'confidence': confidence,
+            'description': fallacy['description'],
+            'constructive_questions': fallacy['challenges']['constructive'][:3],
+            'direct_challenges': fallacy['challenges']['direct'][:3],
+            'missing_data': fallacy['challenges']['missing_data'],
+            'alternative_explanations': fallacy['challenges']['alternatives'][:2]
+        })
+    return {'status': 'challenges_found', 'claim': claim, 'fallacies_detected': len(detected),
+            'challenges': challenges}
+
+
+def as_json(value):
+    return json.loads(json.dumps(value))
+
+
+def test_to_dict_matches_baseline():
+    generator = ChallengeGenerator(cache_size=0)
+    with open(generator.detector.fallacy_path, encoding='utf-8') as f:
+        fallacies = json.load(f)
+
+    for claim in CLAIMS:
+        detected = [(d.fallacy_id, d.confidence) for d in generator.detector.detect(claim)]
+        response = generator.generate_challenges(claim).to_dict()
+        assert as_json(response) == baseline_response(claim, detected, fallacies)
+
+
+def test_known_claim_response():
+    response = ChallengeGenerator(cache_size=0).generate_challenges(CLAIMS[3]).to_dict()
+
+    assert response['status'] == 'challenges_found'
+    assert response['claim'] == CLAIMS[3]
+    assert response['fallacies_detected'] == 5
+    assert [c['fallacy_name'] for c in response['challenges']] == [
+        'Selection Bias in Traffic Quality', 'Correlation vs Causation Confusion', 'Incremental Return Fallacy'
+    ]
+    assert [c['confidence'] for c in response['challenges']] == ['HIGH', 'MEDIUM', 'MEDIUM']
+
+
+def test_compare_claims_returns_plain_dicts():
+    generator = ChallengeGenerator()
+    comparison = generator.compare_claims(CLAIMS[3], CLAIMS[8])
+
+    assert comparison['claim_a']['analysis'] == generator.generate_challenges(CLAIMS[3]).to_dict()
+    assert comparison['claim_b']['analysis'] == {'status': 'no_issues', 'message': NO_ISSUES_MESSAGE}
+    assert as_json(comparison)['claim_a']['risk_score'] == comparison['claim_a']['risk_score']
@@ -0,0 +1,149 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pl = pytest.importorskip('polars')
+
+from data_analyzer import DataAnalyzer
+
+FIRST_DAY = datetime.date(2024, 1, 1)
+LAST_DAY = datetime.date(2024, 4, 10)  # April is only partly covered
+UNDATED_ROWS = 5
+
+# Monthly ROAS level per platform: TikTok rises into March, Google Ads falls
+LEVELS = {
+    'TikTok': {1: 3.0, 2: 4.0, 3: 6.0, 4: 2.0},
+    'Google Ads': {1: 8.0, 2: 7.0, 3: 5.0, 4: 9.0},
+}
+
+
+@pytest.fixture(scope='module')
+def rows():
+    rng = np.random.default_rng(0)
+    rows = []
+    day = FIRST_DAY
+    while day <= LAST_DAY:
+        for platform, levels in LEVELS.items():
+            # Some days have no rows for a platform, some have several
+            for _ in range(int(rng.integers(0, 3))):
+                rows.append((day.isoformat(), platform, round(levels[day.month] + rng.normal(0, 0.2), 3),
+                             round(float(rng.uniform(1, 3)), 3)))
+        day += datetime.timedelta(days=1)
+    # Rows out of date order and without a date
+    rng.shuffle(rows)
+    rows += [(None, 'TikTok', 100.0, 1.0)] * UNDATED_ROWS
+    return rows
+
+
+@pytest.fixture(scope='module')
+def frame(rows):
+    return pl.DataFrame(rows, schema=['Date', 'Platform', 'ROAS', 'CTR'], orient='row')
+
+
+@pytest.fixture(scope='module')
+def analyzer(frame, tmp_path_factory):
+    path = tmp_path_factory.mktemp('timeseries') / 'data.csv'
+    frame.write_csv(path)
+    analyzer = DataAnalyzer()
+    assert analyzer.load_csv_path(str(path))['success']
+    return analyzer
+
+
+def dated(frame):
+    return frame.filter(pl.col('Date').is_not_null()).with_columns(pl.col('Date').str.to_date())
+
+
+def test_range_bounds_are_inclusive(analyzer, frame):
+    rows = dated(frame)
+    result = analyzer.summarize_range('2024-02-01', '2024-02-29')
+    february = rows.filter(pl.col('Date').is_between(datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)))
+    assert result['rows'] == len(february)
+    assert result['start'] == february['Date'].min().isoformat()
+    assert result['end'] == february['Date'].max().isoformat()
+    for platform, stats in result['summary']['by_platform'].items():
+        expected = february.filter(pl.col('Platform') == platform)['ROAS'].mean()
+        assert stats['roas']['mean'] == round(expected, 2)
+
+    single = analyzer.summarize_range(result['end'], result['end'])
+    assert single['rows'] == len(rows.filter(pl.col('Date') == february['Date'].max()))
+
+
+def test_range_leaves_out_undated_rows(analyzer, frame):
+    rows = dated(frame)
+    assert analyzer.summarize_range()['rows'] == len(rows) == len(frame) - UNDATED_ROWS
+    assert analyzer.summarize_range('2024-04-01')['rows'] == len(rows.filter(pl.col('Date') >= datetime.date(2024, 4, 1)))
+    assert analyzer.summarize_range(None, '2023-12-31')['rows'] == 0
+    assert analyzer.summarize_range('2024-05-01')['rows'] == 0
+    with pytest.raises(ValueError):
+        analyzer.summarize_range('2024-13-01')
+
+
+@pytest.mark.parametrize('window_days, start', [(1, None), (7, None), (28, '2024-03-01'), (90, '2024-04-01')])
+def test_rolling_windows_match_a_naive_filter(analyzer, frame, window_days, start):
+    rows = dated(frame)
+    result = analyzer.rolling_summary(window_days, start, '2024-04-05')
+    first_day = datetime.date.fromisoformat(start) if start else FIRST_DAY
+
+    for platform in LEVELS:
+        platform_rows = rows.filter(pl.col('Platform') == platform)
+        days = sorted(d for d in set(platform_rows['Date'].to_list())
+                      if first_day <= d <= datetime.date(2024, 4, 5))
+        points = result['by_platform'][platform]
+        assert [point['date'] for point in points] == [d.isoformat() for d in days]
+        for point, day in zip(points, days):
+            window = platform_rows.filter(pl.col('Date').is_between(day - datetime.timedelta(days=window_days - 1), day))
+            assert point['rows'] == len(window)
+            # Rounded to 2 places, so a half-cent tie may round either way
+            assert point['roas'] == pytest.approx(window['ROAS'].mean(), abs=0.0051)
+            assert point['ctr'] == pytest.approx(window['CTR'].mean(), abs=0.0051)
+
+
+def test_rolling_window_bounds(analyzer):
+    with pytest.raises(ValueError):
+        analyzer.rolling_summary(0)
+
+
+def monthly_mean(frame, platform, month):
+    rows = dated(frame).filter((pl.col('Platform') == platform) & (pl.col('Date').dt.month() == month))
+    return rows['ROAS'].mean()
+
+
+def test_complete_only_drops_the_partial_period(analyzer, frame):
+    complete = analyzer.compare_periods('month')
+    assert complete['previous'] == {'start': '2024-02-01', 'end': '2024-02-29'}
+    assert complete['current'] == {'start': '2024-03-01', 'end': '2024-03-31'}
+    tiktok = complete['by_platform']['TikTok']['roas']
+    assert tiktok['previous'] == round(monthly_mean(frame, 'TikTok', 2), 2)
+    assert tiktok['current'] == round(monthly_mean(frame, 'TikTok', 3), 2)
+
+    partial = analyzer.compare_periods('month', complete_only=False)
+    assert partial['previous']['start'] == '2024-03-01'
+    assert partial['current']['start'] == '2024-04-01'
+    assert partial['by_platform']['TikTok']['roas']['change'] < 0
+
+    assert 'error' in analyzer.compare_periods('year')
+    with pytest.raises(ValueError):
+        analyzer.compare_periods('fortnight')
+
+
+def trend(analyzer, claim):
+    verifications = [v for v in analyzer.validate_claim(claim)['verifications'] if v['type'] == 'trend_claim']
+    assert len(verifications) == 1
+    return verifications[0]
+
+
+def test_rose_last_month_claim_supported_and_refuted(analyzer):
+    supported = trend(analyzer, 'TikTok ROAS rose last month')
+    assert supported['direction'] == 'up'
+    assert supported['current_period']['start'] == '2024-03-01'
+    assert [r['supported'] for r in supported['results']] == [True]
+
+    refuted = trend(analyzer, 'Google Ads ROAS rose last month')
+    assert [(r['platform'], r['supported']) for r in refuted['results']] == [('Google Ads', False)]
+
+    # "this month" compares the month in progress, where the trends flip
+    this_month = trend(analyzer, 'TikTok ROAS fell this month')
+    assert this_month['direction'] == 'down'
+    assert this_month['current_period']['start'] == '2024-04-01'
+    assert [r['supported'] for r in this_month['results']] == [True]
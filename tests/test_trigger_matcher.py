@@ -0,0 +1,155 @@
+import json
+import marshal
+
+import pytest
+
+from conftest import CLAIMS, ROOT
+from input_processor import InputProcessor
+from trigger_matcher import AhoCorasick, TriggerIndex
+
+FALLACIES = json.loads((ROOT / 'config' / 'fallacies.json').read_text())
+
+
+def reference_score(processed, fallacy_data):
+    """The per-fallacy scorer TriggerIndex replaced, kept as the oracle."""
+    score = 0
+    triggers = fallacy_data['triggers']
+
+    fallacy_keywords = set(word.lower() for word in triggers.get('keywords', []))
+    score += len(processed['keywords'].intersection(fallacy_keywords)) * 3
+
+    claim_metrics = [m.lower() for m in processed['metrics_found']]
+    fallacy_metrics = [m.lower() for m in triggers.get('metrics', [])]
+    for metric in claim_metrics:
+        if metric in fallacy_metrics or 'any metric' in fallacy_metrics:
+            score += 5
+
+    claim_text_lower = processed['original_claim'].lower()
+    for pattern in triggers.get('patterns', []):
+        if pattern.lower() in claim_text_lower:
+            score += 2
+
+    if processed['has_recommendation'] and 'reallocate' in triggers.get('keywords', []):
+        score += 3
+
+    return score
+
+
+def assert_same_scores(fallacies, claims):
+    index = TriggerIndex(fallacies)
+    processor = InputProcessor()
+    for claim in claims:
+        processed = processor.process(claim)
+        expected = [reference_score(processed, fallacies[fallacy_id]) for fallacy_id in index.fallacy_ids]
+        assert index.score(processed) == expected, claim
+
+
+def brute_force_find(patterns, text):
+    return {pattern_id for pattern_id, pattern in enumerate(patterns) if pattern in text}
+
+
+def test_scores_match_reference_on_fallacy_database():
+    assert_same_scores(FALLACIES, CLAIMS)
+
+
+def test_scores_match_reference_with_overlapping_and_duplicate_patterns():
+    fallacies = {
+        'overlap': {'triggers': {
+            'keywords': [], 'metrics': ['ROAS'],
+            'patterns': ['perform', 'top perform', 'top performer', 'erform', 'form', 'top']
+        }},
+        'duplicates': {'triggers': {
+            'keywords': ['budget', 'Budget'], 'metrics': ['CPA', 'cpa'],
+            'patterns': ['spend', 'spend', 'SPEND', 'budget']
+        }},
+        'shared': {'triggers': {
+            'keywords': ['budget'], 'metrics': ['ROAS'],
+            'patterns': ['spend', 'top perform']
+        }},
+    }
+    claims = CLAIMS + [
+        "Our top performer's spend beat every other top performing campaign on ROAS.",
+        "spend spend spend the budget on CPA",
+    ]
+    assert_same_scores(fallacies, claims)
+
+
+def test_any_metric_scores_every_metric_found():
+    fallacies = {
+        'any': {'triggers': {'keywords': [], 'metrics': ['any metric'], 'patterns': []}},
+        'any_plus_named': {'triggers': {'keywords': [], 'metrics': ['Any Metric', 'ROAS'], 'patterns': []}},
+        'named': {'triggers': {'keywords': [], 'metrics': ['ROAS'], 'patterns': []}},
+    }
+    index = TriggerIndex(fallacies)
+    processed = InputProcessor().process("ROAS and CPA and CTR all moved")
+    assert index.score(processed) == [15, 15, 5]
+    assert_same_scores(fallacies, CLAIMS)
+
+
+def test_reallocate_bonus_is_case_sensitive():
+    fallacies = {
+        'lower': {'triggers': {'keywords': ['reallocate'], 'metrics': [], 'patterns': []}},
+        'upper': {'triggers': {'keywords': ['Reallocate'], 'metrics': [], 'patterns': []}},
+    }
+    index = TriggerIndex(fallacies)
+    processed = InputProcessor().process("We should reallocate the budget")
+    # Both match the keyword; only the exact lowercase trigger earns the bonus
+    assert index.score(processed) == [6, 3]
+    assert_same_scores(fallacies, CLAIMS)
+
+
+@pytest.mark.parametrize('patterns, text', [
+    (['he', 'she', 'his', 'hers'], 'ushers'),
+    (['a', 'aa', 'aaa', 'aa'], 'aaaa'),
+    (['abcd', 'bc', 'c', 'bcx'], 'abcx'),
+    (['', 'x'], 'abc'),
+    (['spend', 'top perform', 'perform'], 'underperforming top performers'),
+])
+def test_automaton_finds_every_occurring_pattern(patterns, text):
+    assert AhoCorasick(patterns).find(text) == brute_force_find(patterns, text)
+
+
+def test_snapshot_round_trip():
+    index = TriggerIndex(FALLACIES)
+    restored = TriggerIndex.from_dict(marshal.loads(marshal.dumps(index.to_dict())))
+    processor = InputProcessor()
+    for claim in CLAIMS:
+        processed = processor.process(claim)
+        assert restored.score(processed) == index.score(processed)
+
+
+def corrupt(data, path, value):
+    *parents, last = path
+    target = data
+    for key in parents:
+        target = target[key]
+    target[last] = value
+    return data
+
+
+@pytest.mark.parametrize('path, value', [
+    (('fallacy_ids',), None),
+    (('fallacy_ids', 0), 7),
+    (('any_metric',), [99]),
+    (('reallocate_bonus',), [-1]),
+    (('keyword_index', 'budget'), 'x'),
+    (('pattern_owners',), []),
+    (('pattern_matcher', 'fail', 1), 5),
+    (('pattern_matcher', 'fail', 3), 3),
+    (('pattern_matcher', 'goto', 0), []),
+    (('pattern_matcher', 'goto', 0, 'b'), 10 ** 30),
+    (('pattern_matcher', 'output', 1), [10 ** 6]),
+    (('pattern_matcher', 'patterns', 0), b'budget'),
+    (('pattern_matcher',), {}),
+])
+def test_from_dict_rejects_malformed_snapshot(path, value):
+    data = marshal.loads(marshal.dumps(TriggerIndex(FALLACIES).to_dict()))
+    with pytest.raises(ValueError):
+        TriggerIndex.from_dict(corrupt(data, path, value))
+
+
+def test_from_dict_rejects_non_dict():
+    with pytest.raises(ValueError):
+        TriggerIndex.from_dict({'fallacy_ids': []})
+    with pytest.raises(ValueError):
+        AhoCorasick.from_dict({'patterns': [], 'goto': [], 'fail': [], 'output': []})
@@ -0,0 +1,72 @@
+import hashlib
+import io
+
+import pytest
+
+pytest.importorskip('flask')
+
+import app as app_module
+from app import DANGEROUS_PATTERNS, sanitize_csv_stream
+
+HEADER = b'Date,Platform,ROAS\n2024-06-01,TikTok,11.07\n'
+
+
+@pytest.fixture
+def chunk_size(monkeypatch):
+    monkeypatch.setattr(app_module, 'UPLOAD_CHUNK_SIZE', 5)
+    return 5
+
+
+def sanitize(content):
+    dest = io.BytesIO()
+    digest = sanitize_csv_stream(io.BytesIO(content), dest)
+    return digest, dest.getvalue()
+
+
+def mixed_case(pattern: bytes) -> bytes:
+    return bytes(c if i % 2 else c ^ 0x20 if 0x61 <= c <= 0x7a else c for i, c in enumerate(pattern))
+
+
+@pytest.mark.parametrize('pattern', DANGEROUS_PATTERNS)
+def test_patterns_split_across_chunks_are_rejected(chunk_size, pattern):
+    # Every offset moves the chunk boundary to a different place inside the pattern
+    for offset in range(chunk_size + 1):
+        for variant in (pattern, pattern.upper(), mixed_case(pattern)):
+            content = HEADER[:len(HEADER) - offset] + variant + b',x\n'
+            with pytest.raises(ValueError, match='dangerous'):
+                sanitize(content)
+
+
+def test_pattern_longer_than_chunk_is_rejected_at_every_offset(monkeypatch):
+    monkeypatch.setattr(app_module, 'UPLOAD_CHUNK_SIZE', 3)
+    for offset in range(40):
+        with pytest.raises(ValueError, match='dangerous'):
+            sanitize(b'x' * offset + b'DaTa:TeXt/HtMl')
+
+
+def test_clean_content_is_copied_with_its_digest(chunk_size):
+    content = HEADER * 20 + 'Plateforme,Énergie,€ 12\n'.encode()
+    digest, copied = sanitize(content)
+    assert copied == content
+    assert digest == hashlib.sha256(content).hexdigest()
+
+
+def test_multibyte_characters_split_across_chunks_are_accepted(chunk_size):
+    for offset in range(chunk_size):
+        content = b'a' * offset + '€😀é'.encode() * 3
+        digest, _ = sanitize(content)
+        assert digest == hashlib.sha256(content).hexdigest()
+
+
+@pytest.mark.parametrize('ending', [b'\xe2\x82', b'\xf0\x9f\x98', b'\xc3', b'\xff', b'\x80'])
+def test_invalid_or_truncated_utf8_at_end_is_rejected(chunk_size, ending):
+    for offset in range(chunk_size):
+        with pytest.raises(ValueError, match='UTF-8'):
+            sanitize(HEADER + b'a' * offset + ending)
+
+
+def test_size_cap_is_enforced(chunk_size, monkeypatch):
+    monkeypatch.setattr(app_module, 'MAX_UPLOAD_BYTES', 20)
+    sanitize(b'a' * 20)
+    with pytest.raises(ValueError, match='too large'):
+        sanitize(b'a' * 21)
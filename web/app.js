@@ -0,0 +1,384 @@
+const examples = {
+    1: "Since campaigns with a ROAS above 4.0 represent our most efficient spend, we should immediately reallocate 30% of the budget from underperforming Brand campaigns (ROAS < 2.0) to these high-performers to maximize total profit.",
+    2: "Our analysis shows that campaigns with a Click-Through Rate (CTR) above 5% consistently yield a 20% lower Cost Per Acquisition (CPA), suggesting that creative optimization is the primary lever for solving the Google Tax problem.",
+    3: "Across the 1,800 campaigns, we found that YouTube and Display ads have a significantly higher ROAS than Search ads when using a 30-day view-through attribution window. Therefore, we should transition the majority of the Search budget to Video to avoid the high competition tax on Search."
+};
+
+let datasetLoaded = false;
+let datasetId = null;
+let currentMode = 'single';
+
+// Dark Mode Toggle
+function toggleTheme() {
+    const html = document.documentElement;
+    const currentTheme = html.getAttribute('data-theme');
+    const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+
+    html.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+
+    document.getElementById('themeToggle').textContent = newTheme === 'dark' ? '☀️' : '🌙';
+}
+
+// Load saved theme on page load
+(function() {
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    document.documentElement.setAttribute('data-theme', savedTheme);
+    if (document.getElementById('themeToggle')) {
+        document.getElementById('themeToggle').textContent = savedTheme === 'dark' ? '☀️' : '🌙';
+    }
+})();
+
+function showToast(message, type = 'info') {
+    const toast = document.createElement('div');
+    toast.className = `toast ${type}`;
+    toast.textContent = message;
+    document.body.appendChild(toast);
+
+    setTimeout(() => {
+        toast.style.animation = 'slideIn 0.3s ease-out reverse';
+        setTimeout(() => toast.remove(), 300);
+    }, 3000);
+}
+
+function switchMode(mode) {
+    currentMode = mode;
+
+    document.querySelectorAll('.mode-btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    event.target.classList.add('active');
+
+    const singleMode = document.getElementById('singleMode');
+    const compareMode = document.getElementById('compareMode');
+
+    if (mode === 'single') {
+        singleMode.classList.remove('hidden');
+        compareMode.classList.remove('active');
+    } else {
+        singleMode.classList.add('hidden');
+        compareMode.classList.add('active');
+    }
+
+    document.getElementById('results').innerHTML = '';
+}
+
+function loadExample(num) {
+    if (currentMode === 'single') {
+        document.getElementById('claim').value = examples[num];
+    } else {
+        document.getElementById('claimA').value = examples[num];
+    }
+}
+
+function loadExampleAndAnalyze(num) {
+    loadExample(num);
+    showToast('Example loaded! Analyzing...', 'info');
+    setTimeout(() => analyzeClaim(), 100);
+}
+
+function clearAll() {
+    if (currentMode === 'single') {
+        document.getElementById('claim').value = '';
+    } else {
+        document.getElementById('claimA').value = '';
+        document.getElementById('claimB').value = '';
+    }
+    document.getElementById('results').innerHTML = '';
+}
+
+async function handleFileUpload(event) {
+    const file = event.target.files[0];
+    if (!file) return;
+
+    if (!file.name.endsWith('.csv')) {
+        showToast('Please upload a CSV file', 'error');
+        return;
+    }
+
+    if (file.size > 50 * 1024 * 1024) {
+        showToast('File too large (max 50MB)', 'error');
+        return;
+    }
+
+    const formData = new FormData();
+    formData.append('file', file);
+
+    const summaryDiv = document.getElementById('dataSummary');
+    const summaryContent = document.getElementById('summaryContent');
+    summaryDiv.classList.add('active');
+    summaryContent.innerHTML = '<p>⏳ Loading and analyzing your data...</p>';
+
+    try {
+        const response = await fetch('/api/upload', {
+            method: 'POST',
+            body: formData
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            datasetLoaded = true;
+            datasetId = data.dataset_id;
+            displayDataSummary(data);
+            showToast('Dataset loaded successfully!', 'success');
+        } else {
+            summaryContent.innerHTML = `<p style="color: red;">❌ ${data.error}</p>`;
+            showToast(data.error, 'error');
+        }
+    } catch (error) {
+        summaryContent.innerHTML = `<p style="color: red;">❌ Error: ${error.message}</p>`;
+        showToast('Failed to upload file', 'error');
+    }
+}
+
+function displayDataSummary(data) {
+    const summaryContent = document.getElementById('summaryContent');
+
+    let html = `
+        <p><strong>Rows:</strong> ${data.rows} campaigns</p>
+        <p><strong>Platforms:</strong> ${Object.keys(data.summary.by_platform).join(', ')}</p>
+        <div class="platform-stats">
+    `;
+
+    for (const [platform, stats] of Object.entries(data.summary.by_platform)) {
+        html += `
+            <div class="platform-card">
+                <h5>${platform}</h5>
+                <p><strong>${stats.count}</strong> campaigns</p>
+        `;
+
+        if (stats.roas) html += `<p>ROAS: ${stats.roas.mean} avg</p>`;
+        if (stats.ctr) html += `<p>CTR: ${stats.ctr.mean}% avg</p>`;
+        if (stats.cpc) html += `<p>CPC: $${stats.cpc.mean} avg</p>`;
+
+        html += `</div>`;
+    }
+
+    html += `</div>`;
+    summaryContent.innerHTML = html;
+}
+
+async function analyzeClaim() {
+    const claim = document.getElementById('claim').value.trim();
+
+    if (!claim) {
+        showToast('Please paste a claim to analyze (or try an example above)', 'error');
+        return;
+    }
+
+    const resultsDiv = document.getElementById('results');
+    resultsDiv.innerHTML = '<div class="loading"><div class="spinner"></div>Analyzing...</div>';
+
+    const analyzeBtn = document.querySelector('.analyze-btn');
+    analyzeBtn.disabled = true;
+
+    try {
+        const response = await fetch('/api/analyze', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({ 
+                claim: claim,
+                validate_data: datasetLoaded,
+                dataset_id: datasetId
+            })
+        });
+
+        const data = await response.json();
+        displayResults(data);
+
+        if (!datasetLoaded) {
+            showToast('💡 Tip: Upload your CSV for data verification too!', 'info');
+        }
+    } catch (error) {
+        resultsDiv.innerHTML = `<div class="main-card"><p style="color: red;">Error: ${error.message}</p></div>`;
+        showToast('Analysis failed. Please try again.', 'error');
+    } finally {
+        analyzeBtn.disabled = false;
+    }
+}
+
+async function compareClaimsFn() {
+    const claimA = document.getElementById('claimA').value.trim();
+    const claimB = document.getElementById('claimB').value.trim();
+
+    if (!claimA || !claimB) {
+        showToast('Please enter both claims to compare', 'error');
+        return;
+    }
+
+    const resultsDiv = document.getElementById('results');
+    resultsDiv.innerHTML = '<div class="loading"><div class="spinner"></div>Comparing claims...</div>';
+
+    const analyzeBtn = document.querySelector('.analyze-btn');
+    analyzeBtn.disabled = true;
+
+    try {
+        const response = await fetch('/api/compare', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({ 
+                claim_a: claimA,
+                claim_b: claimB,
+                validate_data: datasetLoaded,
+                dataset_id: datasetId
+            })
+        });
+
+        const data = await response.json();
+        displayComparisonResults(data);
+    } catch (error) {
+        resultsDiv.innerHTML = `<div class="main-card"><p style="color: red;">Error: ${error.message}</p></div>`;
+        showToast('Comparison failed. Please try again.', 'error');
+    } finally {
+        analyzeBtn.disabled = false;
+    }
+}
+
+function displayResults(data) {
+    const resultsDiv = document.getElementById('results');
+    let html = '';
+
+    if (data.data_verification && data.data_verification.verified) {
+        html += '<div class="main-card"><div class="verification-badge">✅ DATA VERIFIED</div>';
+
+        for (const v of data.data_verification.verifications) {
+            if (v.type === 'metric_claim' && v.matching_platforms.length > 0) {
+                const match = v.matching_platforms[0];
+                html += `<p><strong>${v.metric.toUpperCase()}:</strong> You claimed ${v.claimed_value}. Found ${match.actual_value} ${match.match_type} for ${match.platform}. ✅</p>`;
+            }
+        }
+        html += '</div>';
+    }
+
+    if (data.status === 'no_issues') {
+        html += '<div class="main-card"><h2 style="color: #27ae60;">✅ No Obvious Issues</h2><p>' + data.message + '</p></div>';
+    } else {
+        html += '<div class="summary"><h2>📊 Analysis Summary</h2><p><strong>Issues Found:</strong> ' + data.fallacies_detected + '</p></div>';
+
+        data.challenges.forEach(challenge => {
+            html += `
+                <div class="challenge-card">
+                    <div class="challenge-header">
+                        <div class="challenge-title">🚨 ${challenge.fallacy_name}</div>
+                        <div class="confidence-badge confidence-${challenge.confidence.toLowerCase()}">${challenge.confidence}</div>
+                    </div>
+                    <div class="section">
+                        <div class="section-title">📝 What This Means</div>
+                        <p style="color: var(--text-secondary);">${challenge.description}</p>
+                    </div>
+                    <div class="section">
+                        <div class="section-title">🟡 Constructive Questions</div>
+                        <ul class="challenge-list">${challenge.constructive_questions.map(q => '<li>' + q + '</li>').join('')}</ul>
+                    </div>
+                    <div class="section">
+                        <div class="section-title">🔴 Direct Challenges</div>
+                        <ul class="challenge-list">${challenge.direct_challenges.map(c => '<li>' + c + '</li>').join('')}</ul>
+                    </div>
+                    <div class="section">
+                        <div class="section-title">📊 Missing Data</div>
+                        <ul class="challenge-list">${challenge.missing_data.map(m => '<li>' + m + '</li>').join('')}</ul>
+                    </div>
+                    <div class="section">
+                        <div class="section-title">💡 Alternative Explanations</div>
+                        <ul class="challenge-list">${challenge.alternative_explanations.map(a => '<li>' + a + '</li>').join('')}</ul>
+                    </div>
+                </div>
+            `;
+        });
+    }
+
+    resultsDiv.innerHTML = html;
+    resultsDiv.scrollIntoView({ behavior: 'smooth' });
+}
+
+function displayComparisonResults(data) {
+    const resultsDiv = document.getElementById('results');
+
+    const rec = data.recommendation;
+    let winnerText = rec.winner === 'claim_a' ? 'Claim A' : rec.winner === 'claim_b' ? 'Claim B' : 'Both Claims';
+
+    let html = `
+        <div class="recommendation-banner">
+            <h2>🏆 Recommendation: ${winnerText}</h2>
+            <p>${rec.message}</p>
+            <p style="font-size: 1em; margin-top: 10px; opacity: 0.9;">${rec.reasoning}</p>
+        </div>
+
+        <div class="risk-comparison">
+            <h3>⚖️ Risk Comparison</h3>
+            <div class="risk-grid">
+                <div class="risk-card ${rec.winner === 'claim_a' || rec.winner === 'both' ? 'winner' : 'loser'}">
+                    <h4>Claim A</h4>
+                    <div class="risk-score">${data.claim_a.risk_score.total}</div>
+                    <div class="risk-breakdown">
+                        Risk Level: <strong>${data.claim_a.risk_score.level}</strong><br>
+                        HIGH: ${data.claim_a.risk_score.high} | 
+                        MEDIUM: ${data.claim_a.risk_score.medium} | 
+                        LOW: ${data.claim_a.risk_score.low}
+                    </div>
+                </div>
+
+                <div class="risk-card ${rec.winner === 'claim_b' || rec.winner === 'both' ? 'winner' : 'loser'}">
+                    <h4>Claim B</h4>
+                    <div class="risk-score">${data.claim_b.risk_score.total}</div>
+                    <div class="risk-breakdown">
+                        Risk Level: <strong>${data.claim_b.risk_score.level}</strong><br>
+                        HIGH: ${data.claim_b.risk_score.high} | 
+                        MEDIUM: ${data.claim_b.risk_score.medium} | 
+                        LOW: ${data.claim_b.risk_score.low}
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <h2 style="color: white; margin: 30px 0 20px 0; text-align: center;">📋 Detailed Analysis</h2>
+
+        <div class="comparison-results">
+            <div>
+                <h3 style="color: white; text-align: center; margin-bottom: 15px;">Claim A Analysis</h3>
+    `;
+
+    if (data.claim_a.analysis.status === 'no_issues') {
+        html += '<div class="challenge-card"><h3 style="color: #27ae60;">✅ No Issues Detected</h3></div>';
+    } else {
+        data.claim_a.analysis.challenges.forEach(challenge => {
+            html += `
+                <div class="challenge-card">
+                    <div class="challenge-header">
+                        <div class="challenge-title">${challenge.fallacy_name}</div>
+                        <div class="confidence-badge confidence-${challenge.confidence.toLowerCase()}">${challenge.confidence}</div>
+                    </div>
+                    <div class="section">
+                        <p style="color: var(--text-secondary);">${challenge.description}</p>
+                    </div>
+                </div>
+            `;
+        });
+    }
+
+    html += '</div><div><h3 style="color: white; text-align: center; margin-bottom: 15px;">Claim B Analysis</h3>';
+
+    if (data.claim_b.analysis.status === 'no_issues') {
+        html += '<div class="challenge-card"><h3 style="color: #27ae60;">✅ No Issues Detected</h3></div>';
+    } else {
+        data.claim_b.analysis.challenges.forEach(challenge => {
+            html += `
+                <div class="challenge-card">
+                    <div class="challenge-header">
+                        <div class="challenge-title">${challenge.fallacy_name}</div>
+                        <div class="confidence-badge confidence-${challenge.confidence.toLowerCase()}">${challenge.confidence}</div>
+                    </div>
+                    <div class="section">
+                        <p style="color: var(--text-secondary);">${challenge.description}</p>
+                    </div>
+                </div>
+            `;
+        });
+    }
+
+    html += '</div></div>';
+
+    resultsDiv.innerHTML = html;
+    resultsDiv.scrollIntoView({ behavior: 'smooth' });
+}